@@ -32,6 +32,59 @@ ALLOWED_HOSTS = []
 
 IMPORT_EXPORT_USE_TRANSACTIONS = False
 
+# Admissions model loading
+# Directory holding rf_ucModel.pkl / the model registry (None: admissions/resources).
+ADMISSIONS_MODEL_DIR = None
+# Seconds between checks for a newly activated/replaced model artifact (None: never hot-reload).
+ADMISSIONS_MODEL_RELOAD_INTERVAL = 30
+# Load rf_ucModel.pkl in AppConfig.ready() instead of on the first registration per worker.
+ADMISSIONS_MODEL_WARMUP = False
+# joblib.load(..., mmap_mode='r'): forest arrays are memory-mapped and shared between workers.
+# Requires the artifact to be dumped uncompressed (joblib.dump(model, path), the default).
+ADMISSIONS_MODEL_MMAP = False
+# Score single registrations with the flattened NumPy forest (admissions/forest.py) when the
+# model structure is supported; otherwise sklearn's predict_proba is used.
+ADMISSIONS_FLAT_FOREST = True
+# Per-process LRU of predictions keyed by the aligned feature row + model version (0 disables).
+ADMISSIONS_PREDICTION_CACHE_SIZE = 4096
+# Registrations enqueue a ScoringJob instead of scoring inline; run
+# `python manage.py process_scoring_jobs` alongside the web server. False scores inline.
+ADMISSIONS_SCORING_QUEUE = True
+# Keep engineered features in the StudentFeatures table and reuse them while the student's
+# inputs are unchanged (`python manage.py backfill_student_features` fills it).
+ADMISSIONS_FEATURE_STORE = True
+# Record per-stage latencies of scoring and feature export (admissions/timing.py); served at
+# /adminDash/inference-timing/ and logged as JSON on the 'admissions.timing' logger.
+ADMISSIONS_STAGE_TIMING = False
+# Samples kept per stage for the rolling percentiles.
+ADMISSIONS_STAGE_TIMING_WINDOW = 1024
+# The adminDash summary (charts and cards) is cached per Student data version
+# (admissions/dashboard.py); the timeout only bounds staleness from writes that bypass it.
+ADMISSIONS_DASHBOARD_CACHE_TIMEOUT = 300
+# Page the adminDash student list with id cursors (?after=/?before=) instead of page
+# numbers; no COUNT(*) or OFFSET per page. False restores "Page X of N".
+ADMISSIONS_KEYSET_PAGINATION = True
+
+# Rows shown for an adminDash search box query (ranked best first, see admissions/search.py)
+ADMISSIONS_SEARCH_RESULTS = 20
+
+# Bulk applicant API (admissions/api.py): records accepted per request, and records
+# validated, scored and inserted per transaction.
+ADMISSIONS_INGEST_MAX_RECORDS = 10000
+ADMISSIONS_INGEST_CHUNK_SIZE = 1000
+
+# The dashboard data version lives in this cache, so it must be shared by every process
+# that writes students (web workers, process_scoring_jobs, the import and rescore
+# commands); a per-process cache (LocMemCache) would keep the other processes' summaries
+# stale. The database cache works out of the box (`python manage.py createcachetable`)
+# at 5 queries per student write; Redis or Memcached are faster where available.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'admissions_cache',
+    }
+}
+
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -41,9 +94,20 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'admissions',
-    'import_export'
+    'import_export',
+    'rest_framework',
 ]
 
+# The JSON API authenticates with simplejwt access tokens (POST /api/token/).
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ),
+    'DEFAULT_PERMISSION_CLASSES': (
+        'rest_framework.permissions.IsAuthenticated',
+    ),
+}
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -16,15 +16,22 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from admissions.views import index, loginAdmin, adminDash, register_student, student_detail
+from admissions.views import index, loginAdmin, adminDash, register_student, student_detail, scoring_queue_status, inference_timing, dashboard_chart, export_students, lazy_api_view
 
 urlpatterns = [
     path('super_admin/', admin.site.urls),
     path('loginAdmin/', loginAdmin, name='loginAdmin'),
     path('adminDash/', adminDash, name='landingAdmin'),
+    path('adminDash/scoring-queue/', scoring_queue_status, name='scoring_queue_status'),
+    path('adminDash/inference-timing/', inference_timing, name='inference_timing'),
+    path('adminDash/charts/<slug:name>/', dashboard_chart, name='dashboard_chart'),
+    path('adminDash/export/<slug:fmt>/', export_students, name='export_students'),
     # Registration endpoint handles GET (form) and POST (save) via register_student
     path('register/', register_student, name='register'),
     path('student/<int:pk>/', student_detail, name='student_detail'),
+    path('api/token/', lazy_api_view('obtain_token'), name='token_obtain_pair'),
+    path('api/token/refresh/', lazy_api_view('refresh_token'), name='token_refresh'),
+    path('api/applicants/bulk/', lazy_api_view('ingest_applicants'), name='ingest_applicants'),
     path('', index, name='index')
 
 ]
@@ -1,8 +1,29 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
-from .models import Student
-from .resources import StudentResource
+from .models import EnrollmentRollup, ScoringJob, Student, StudentFeatures
+from .resources import StudentBulkResource, StudentResource
 
 @admin.register(Student)
 class StudentAdmin(ImportExportModelAdmin):
-    resource_class = StudentResource
+    # The bulk resource is the faster choice for whole-term files (see StudentBulkResource)
+    resource_classes = [StudentResource, StudentBulkResource]
+
+
+@admin.register(ScoringJob)
+class ScoringJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'student', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    raw_id_fields = ('student',)
+
+
+@admin.register(StudentFeatures)
+class StudentFeaturesAdmin(admin.ModelAdmin):
+    list_display = ('student', 'schema_version', 'fingerprint', 'updated_at')
+    list_filter = ('schema_version',)
+    raw_id_fields = ('student',)
+
+
+@admin.register(EnrollmentRollup)
+class EnrollmentRollupAdmin(admin.ModelAdmin):
+    list_display = ('school_year', 'school_term', 'program_first_choice', 'gender', 'enrolled', 'count', 'chance_count')
+    list_filter = ('enrolled', 'school_year', 'school_term')
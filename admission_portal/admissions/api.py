@@ -0,0 +1,124 @@
+"""
+JSON API for partner schools and the CRM (Django REST framework + simplejwt).
+
+    POST /api/token/               {"username", "password"} -> {"access", "refresh"}
+    POST /api/token/refresh/       {"refresh"} -> {"access"}
+    POST /api/applicants/bulk/     [{applicant}, ...] with "Authorization: Bearer <access>"
+
+The URLconf reaches these views through views.lazy_api_view, so DRF is only
+imported once the API is used.
+
+Applicant records use the registration form's field names (see
+ApplicantSerializer). Each record is validated on its own; the valid ones are
+written and scored in chunks by registration.ingest(). The response has one
+result per record, in request order:
+
+    {"created": 2, "duplicates": 1, "invalid": 1, "results": [
+        {"index": 0, "status": "created", "id": 101, "enrollment_chance": 72.4},
+        {"index": 1, "status": "duplicate", "id": 87},
+        {"index": 2, "status": "invalid", "errors": {"emailAddress": ["Enter a valid email address."]}},
+        ...]}
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from . import registration
+
+INGEST_MAX_RECORDS = 10000
+
+obtain_token = TokenObtainPairView.as_view()
+refresh_token = TokenRefreshView.as_view()
+
+
+def _text(max_length, **kwargs):
+    kwargs.setdefault('required', False)
+    return serializers.CharField(max_length=max_length, allow_blank=True, allow_null=True, **kwargs)
+
+
+class ApplicantSerializer(serializers.Serializer):
+    """One applicant in the registration form's vocabulary; lengths follow the Student columns."""
+    schoolYear = _text(20)
+    schoolTerm = _text(10)
+    campus = _text(50)
+    firstChoice = _text(100, required=True)
+    secondChoice = _text(100)
+    entryLevel = _text(50)
+    firstName = _text(100, required=True)
+    middleName = _text(100)
+    lastName = _text(100, required=True)
+    suffix = _text(20)
+    gender = _text(20)
+    civilStatus = _text(50)
+    birthDate = serializers.DateField(required=False, allow_null=True)
+    birthCity = _text(100)
+    birthProvince = _text(100)
+    birthCountry = _text(100)
+    nationality = _text(100)
+    religion = _text(100)
+    presentAddress = _text(255)
+    currentRegion = _text(100)
+    presentProvince = _text(100)
+    presentCity = _text(100)
+    presentBarangay = _text(100)
+    presentZip = _text(10)
+    permanentCountry = _text(100)
+    permanentRegion = _text(100)
+    permanentProvince = _text(100)
+    permanentCity = _text(100)
+    permanentBarangay = _text(100)
+    permanentAddress = _text(255)
+    permanentZip = _text(10)
+    emailAddress = serializers.EmailField(required=False, allow_blank=True, allow_null=True)
+    mobileNumber = _text(20)
+    studentType = _text(50)
+    schoolType = _text(50)
+    lastSchoolAttended = _text(255)
+    truthfulInfo = serializers.BooleanField(required=False, default=False)
+    disability = _text(100)
+    indigenous = _text(100)
+    annualIncome = _text(50)
+
+
+class CanAddStudents(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.has_perm('admissions.add_student')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, CanAddStudents])
+def ingest_applicants(request):
+    records = request.data
+    if not isinstance(records, list) or not records:
+        return Response({'detail': 'Expected a non-empty JSON array of applicant records.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    limit = getattr(settings, 'ADMISSIONS_INGEST_MAX_RECORDS', INGEST_MAX_RECORDS)
+    if len(records) > limit:
+        return Response({'detail': f'At most {limit} records per request.'},
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    # One serializer instance validates every record (its fields are built once)
+    serializer = ApplicantSerializer()
+    results = [None] * len(records)
+    valid, positions = [], []
+    for index, record in enumerate(records):
+        try:
+            valid.append(serializer.run_validation(record))
+            positions.append(index)
+        except serializers.ValidationError as exc:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': exc.detail}
+    for index, result in zip(positions, registration.ingest(valid)):
+        results[index] = {'index': index, **result}
+
+    counts = Counter(result['status'] for result in results)
+    return Response(
+        {'created': counts['created'], 'duplicates': counts['duplicate'], 'invalid': counts['invalid'],
+         'results': results},
+        status=status.HTTP_201_CREATED if counts['created'] else status.HTTP_200_OK,
+    )
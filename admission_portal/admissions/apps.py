@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
 
 
 class AdmissionsConfig(AppConfig):
@@ -8,3 +10,10 @@ class AdmissionsConfig(AppConfig):
     def ready(self):
         # Import signals to ensure enrollment_chance auto-scales
         from . import signals  # noqa: F401
+        # Migrations that rebuild the Student table drop the search index triggers
+        from .search import ensure_search_index
+        post_migrate.connect(ensure_search_index, sender=self)
+        # Load the RF model at startup (e.g. before gunicorn forks with --preload)
+        if getattr(settings, 'ADMISSIONS_MODEL_WARMUP', False):
+            from .ml_utils import warm_up_model
+            warm_up_model()
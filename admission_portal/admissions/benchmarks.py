@@ -0,0 +1,683 @@
+"""
+Micro-benchmarks for the admissions scoring and data paths.
+
+Run through the management command:
+    python manage.py benchmark imports
+    python manage.py benchmark inference
+    python manage.py benchmark alignment
+    python manage.py benchmark preprocessing
+    python manage.py benchmark normalizers
+    python manage.py benchmark query_plans
+    python manage.py benchmark search
+    python manage.py benchmark export
+    python manage.py benchmark feature_log
+    python manage.py benchmark ingest
+    python manage.py benchmark import
+
+Synthetic students and a small model shaped like rf_ucModel.pkl (one-hot encoder
+plus a random forest) are generated here, so benchmarks (and tests) run without
+the real model artifact. Benchmarks that write students run against a scratch
+database (_scratch_database), never the configured one.
+"""
+
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from .models import Student
+
+PROGRAMS = ['BSN', 'BSCS', 'BSIT', 'BSA', 'BSPSY', 'BACHELOR OF SCIENCE IN TOURISM MANAGEMENT', 'BSARCH', '', None]
+CITIES = ['Lipa City', 'City of San Pablo', 'Tanauan', 'Malvar', 'Quezon City', 'Biñan', '', None]
+PROVINCES = ['Batangas', 'Laguna', 'Cavite', 'Cebu', 'Metro Manila', '', None]
+
+
+def random_student_kwargs(rng):
+    """Random Student field values covering the categories preprocessing cares about."""
+    return dict(
+        school_year=rng.choice(['2023', '2024', '2025', '2024-2025', None]),
+        school_term=rng.choice(['1st', '2nd', '3rd', None]),
+        program_first_choice=rng.choice(PROGRAMS[:-2]),
+        program_second_choice=rng.choice(PROGRAMS),
+        entry_level=rng.choice(['Freshman', 'TRANSFEREE', '2ND_DEGREE', 'CROSS_ENROLLEE', None]),
+        birth_date=rng.choice([None, '2006-03-14', '2007-11-02', '2001-01-30']),
+        gender=rng.choice(['Male', 'Female', None]),
+        civil_status=rng.choice(['Single', 'Married', 'Widowed', None]),
+        religion=rng.choice(['Roman Catholic', 'Iglesia ni Cristo', None]),
+        birth_city=rng.choice(CITIES),
+        birth_province=rng.choice(PROVINCES),
+        permanent_region=rng.choice(['Region IV-A', 'NCR', None]),
+        permanent_province=rng.choice(PROVINCES),
+        permanent_city=rng.choice(CITIES),
+        disability=rng.choice(['0', '1', None]),
+        indigenous=rng.choice(['0', '1', None]),
+        requirement_agreement=rng.choice(['1', '0', None]),
+        student_type=rng.choice(['Full-time Student', 'Working Student', None]),
+        school_type=rng.choice(['PUBLIC', 'PRIVATE', None]),
+        age_at_enrollment=rng.choice([17, 18, 19, 25, None]),
+    )
+
+
+def random_raw_profiles(n, seed=0):
+    """n raw preprocessing dicts built from unsaved random Students."""
+    from .ml_utils import _student_to_preprocessing_dict
+
+    rng = random.Random(seed)
+    return [_student_to_preprocessing_dict(Student(**random_student_kwargs(rng))) for _ in range(n)]
+
+
+_SYNTHETIC_MODELS = {}
+
+
+def synthetic_model(n_estimators=25, max_depth=8):
+    """Small fitted Pipeline shaped like rf_ucModel.pkl (one-hot encoder + 'rf' forest)."""
+    if (n_estimators, max_depth) in _SYNTHETIC_MODELS:
+        return _SYNTHETIC_MODELS[n_estimators, max_depth]
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+    from . import ml_utils
+    from .preprocessing import preprocess_student_data
+
+    rng = random.Random(1234)
+    rows = [preprocess_student_data(raw) for raw in random_raw_profiles(400, seed=1234)]
+    df = ml_utils._build_feature_frame(rows)
+    target = [int(r['gender_binary'] == 1 or rng.random() < 0.3) for r in rows]
+    categorical = [c for c in df.columns if c not in ml_utils.NUMERIC_COLUMNS]
+    model = Pipeline([
+        ('preprocess', ColumnTransformer(
+            [('cat', OneHotEncoder(handle_unknown='ignore'), categorical)],
+            remainder='passthrough', force_int_remainder_cols=False,
+        )),
+        ('rf', RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=0)),
+    ]).fit(df, target)
+    _SYNTHETIC_MODELS[n_estimators, max_depth] = model
+    return model
+
+
+def _benchmark_model(write):
+    from . import ml_utils
+
+    model = ml_utils._load_model()
+    if model is None:
+        write("rf_ucModel.pkl not available; using a synthetic 100-tree model.")
+        model = synthetic_model(n_estimators=100, max_depth=12)
+    return model
+
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        'p50': statistics.median(ordered),
+        'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        'mean': statistics.fmean(ordered),
+    }
+
+
+def _time_calls(fn, args_list):
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return percentiles(samples)
+
+
+def _report(write, label, stats):
+    write(f"  {label:<28} p50 {stats['p50']:8.3f} ms   p99 {stats['p99']:8.3f} ms   mean {stats['mean']:8.3f} ms")
+
+
+def bench_inference(write=print, iterations=1000):
+    """Single-row model latency: sklearn predict_proba vs the flattened forest."""
+    from . import ml_utils
+    from .forest import compile_forest
+    from .preprocessing import preprocess_student_data
+
+    model = _benchmark_model(write)
+    flat = compile_forest(model, ml_utils.NUMERIC_COLUMNS)
+    rows = [(preprocess_student_data(raw),) for raw in random_raw_profiles(iterations, seed=99)]
+
+    def sklearn_path(engineered):
+        model.predict_proba(ml_utils._align_to_model(ml_utils._build_feature_frame([engineered]), model))
+
+    write(f"Single-row inference, {iterations} rows:")
+    sklearn_stats = _time_calls(sklearn_path, rows)
+    _report(write, "sklearn predict_proba", sklearn_stats)
+    if flat is None:
+        write("  flat forest: model structure not supported")
+        return
+    write(f"  flat forest: {flat.describe()}")
+    flat_stats = _time_calls(lambda engineered: flat.predict_proba_records([engineered]), rows)
+    _report(write, "flat forest", flat_stats)
+    write(f"  speedup p50 x{sklearn_stats['p50'] / flat_stats['p50']:.1f}, "
+          f"p99 x{sklearn_stats['p99'] / flat_stats['p99']:.1f}")
+
+
+def bench_alignment(write=print, iterations=1000):
+    """Feature-frame construction: per-call replace/to_numeric/reindex vs the precompiled plan."""
+    from . import ml_utils
+    from .preprocessing import preprocess_student_data
+
+    model = _benchmark_model(write)
+    plan = ml_utils.AlignmentPlan(ml_utils._model_columns(model))
+    rows = [preprocess_student_data(raw) for raw in random_raw_profiles(iterations, seed=7)]
+
+    write(f"Feature-frame alignment, {len(plan.columns)} columns:")
+    _report(write, "reindex, 1 row",
+            _time_calls(lambda r: ml_utils._align_to_model(ml_utils._build_feature_frame([r]), model), [(r,) for r in rows]))
+    _report(write, "plan, 1 row", _time_calls(lambda r: plan.frame([r]), [(r,) for r in rows]))
+    batches = [(rows[i:i + 500],) for i in range(0, len(rows), 500)]
+    _report(write, "reindex, 500 rows",
+            _time_calls(lambda b: ml_utils._align_to_model(ml_utils._build_feature_frame(b), model), batches))
+    _report(write, "plan, 500 rows", _time_calls(plan.frame, batches))
+
+
+def bench_preprocessing(write=print, iterations=10000):
+    """Feature engineering for a bulk batch: scalar loop vs preprocess_student_data_batch."""
+    from .preprocessing import preprocess_student_data, preprocess_student_data_batch
+
+    profiles = random_raw_profiles(iterations, seed=13)
+    write(f"Preprocessing {len(profiles)} rows:")
+    for label, fn in [
+        ("scalar loop", lambda: [preprocess_student_data(raw) for raw in profiles]),
+        ("vectorized batch", lambda: preprocess_student_data_batch(profiles)),
+    ]:
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        write(f"  {label:<28} {elapsed * 1000.0:10.1f} ms   {len(profiles) / elapsed:12,.0f} rows/s")
+
+
+def _series_normalize_city(city_str):
+    """normalize_city_names as it was before memoization: one pd.Series per regex."""
+    import pandas as pd
+
+    if pd.isna(city_str) or city_str in ['N/A', 'NA', '', None]:
+        return 'N/A'
+    city_str = str(city_str).strip().lower()
+    city_str = pd.Series([city_str]).str.replace(r"^city of\s+", "", regex=True).iloc[0]
+    city_str = pd.Series([city_str]).str.replace(r"\s+city$", "", regex=True).iloc[0]
+    return pd.Series([city_str]).str.replace(r"\s+", " ", regex=True).iloc[0]
+
+
+def bench_normalizers(write=print, iterations=20000):
+    """Per-call cost of normalize_city_names: per-call pd.Series regexes vs precompiled + memo."""
+    from . import preprocessing
+
+    rng = random.Random(5)
+    names = [rng.choice(CITIES + PROVINCES) for _ in range(iterations)]
+    write(f"normalize_city_names, {iterations} calls over {len(set(names))} distinct inputs:")
+    for label, fn in [
+        ("pd.Series regexes", _series_normalize_city),
+        ("precompiled + memo", preprocessing.normalize_city_names),
+    ]:
+        started = time.perf_counter()
+        for name in names:
+            fn(name)
+        per_call_us = (time.perf_counter() - started) / iterations * 1e6
+        write(f"  {label:<28} {per_call_us:10.2f} us/call")
+    write(f"  cache: {preprocessing.normalizer_cache_stats()['city']}")
+
+
+# What a web worker imports at startup: settings, app registry (models, admin, signals) and URLconf
+STARTUP_IMPORT = (
+    "import django; django.setup(); import admission_portal.urls"
+)
+
+
+def import_time_profile(statement=STARTUP_IMPORT):
+    """Run `statement` in a fresh interpreter under -X importtime.
+
+    Returns {module: (self_us, cumulative_us)} for every module it imported.
+    """
+    from django.conf import settings
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'admission_portal.settings'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        profile[module.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def bench_imports(write=print, iterations=1):
+    """Cold-start import cost of the app: total and the heaviest admissions modules."""
+    profile = import_time_profile()
+    write(f"Cold import (django.setup() + URLconf): {len(profile)} modules, "
+          f"admission_portal.urls {profile['admission_portal.urls'][1] / 1000.0:.1f} ms cumulative")
+    ours = sorted(((cum, name) for name, (_, cum) in profile.items()
+                   if name.startswith(('admissions', 'admission_portal'))), reverse=True)
+    for cumulative_us, name in ours[:10]:
+        write(f"  {name:<40} {cumulative_us / 1000.0:8.1f} ms")
+    heavy = [m for m in ('pandas', 'sklearn', 'joblib', 'admissions.ml_utils') if m in profile]
+    write(f"  scientific stack loaded at startup: {', '.join(heavy) or 'none'}")
+
+
+@contextmanager
+def _scratch_database(write):
+    """Point the default connection at a throwaway, migrated database for the block.
+
+    Created the way the test runner creates its database (a temporary file on
+    SQLite, test_<NAME> on other backends) and destroyed afterwards, so bulk
+    inserts and DROP INDEX never touch, lock or rely on rolling back the
+    deployment database.
+    """
+    import tempfile
+    from django.db import connection
+
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    previous = test_settings.get('NAME')
+    with tempfile.TemporaryDirectory() as tmp:
+        if connection.vendor == 'sqlite':
+            # A file rather than the test runner's in-memory default, so timings match a real deployment
+            test_settings['NAME'] = os.path.join(tmp, 'benchmark.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        write(f"Scratch database {connection.settings_dict['NAME']} (dropped afterwards)")
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = previous
+
+
+def _dashboard_filters():
+    """The adminDash student-list filters, as querysets."""
+    from django.db.models import Value
+
+    return [
+        ("enrolled, year, term", Student.objects.filter(is_enrolled=Value(True), school_year='2024', school_term='1st')),
+        ("  same via student_id", Student.objects.exclude(student_id__isnull=True).exclude(student_id__exact='')
+                                 .filter(school_year='2024', school_term='1st')),
+        ("program", Student.objects.filter(program_first_choice='BSARCH')),
+        ("student_type, enrolled", Student.objects.filter(student_type='Working Student', is_enrolled=Value(True))),
+        ("chance 95-100", Student.objects.filter(enrollment_chance__gte=95, enrollment_chance__lte=100)),
+    ]
+
+
+def _plan(queryset, tag):
+    """EXPLAIN output of a queryset on one line.
+
+    `tag` goes into an SQL comment: the sqlite3 module caches prepared statements by
+    text and does not re-plan a cached EXPLAIN after indexes are dropped.
+    """
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} /* {tag} */", params)
+        return ' / '.join(str(row[-1]) for row in cursor.fetchall())
+
+
+def bench_query_plans(write=print, iterations=50000):
+    """adminDash filter queries on `iterations` synthetic students, with and without the Student indexes.
+
+    For each filter: the first keyset page (ORDER BY id DESC LIMIT 11) and the
+    COUNT(*) the numbered paginator runs. Rows are inserted (and the indexes dropped)
+    in a scratch database.
+    """
+    from django.db import connection
+
+    rng = random.Random(31)
+    students = []
+    for i in range(iterations):
+        kwargs = random_student_kwargs(rng)
+        kwargs.update(school_year=rng.choice(['2021', '2022', '2023', '2024', '2025']),
+                      student_id=rng.choice([None, '', f'B{i:07d}']),
+                      enrollment_chance=rng.random() * 100)
+        kwargs['is_enrolled'] = bool(kwargs['student_id'])
+        students.append(Student(**kwargs))
+
+    with _scratch_database(write):
+        Student.objects.bulk_create(students, batch_size=2000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for indexed in (True, False):
+            write(f"{'With' if indexed else 'Without'} Student indexes ({iterations} rows):")
+            for label, queryset in _dashboard_filters():
+                page = queryset.order_by('-pk')[:11]
+                _report(write, f"{label}: page", _time_calls(lambda: list(page.all()), [()] * 20))
+                _report(write, f"{label}: count", _time_calls(queryset.count, [()] * 20))
+                write(f"    count plan: {_plan(queryset.values('pk'), 'indexed' if indexed else 'no indexes')}")
+            if indexed:
+                with connection.cursor() as cursor:
+                    for index in Student._meta.indexes:
+                        cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+
+FIRST_NAMES = ['Juan', 'Maria', 'Jose', 'Ana', 'Mark', 'Angel', 'John Paul', 'Kristine', 'Miguel', 'Patricia',
+               'Carlo', 'Andrea', 'Paolo', 'Camille', 'Rafael', 'Bea', 'Joshua', 'Nicole', 'Gabriel', 'Jasmine']
+LAST_NAMES = ['Dela Cruz', 'Santos', 'Reyes', 'Garcia', 'Mendoza', 'Bautista', 'Villanueva', 'Ramos', 'Aquino', 'Castillo',
+              'Gonzales', 'Flores', 'Torres', 'Navarro', 'Domingo', 'Salazar', 'Mercado', 'Pascual', 'Aguilar', 'Tolentino',
+              'Manalo', 'Macaraeg', 'Panganiban', 'Dimaculangan', 'Katigbak', 'Magsino', 'Ilagan', 'Lontoc', 'Umali', 'Evangelista']
+
+
+def bench_search(write=print, iterations=200000):
+    """Search box lookups on `iterations` synthetic students, through the index and as an icontains scan.
+
+    Rows are inserted (and indexed by the FTS triggers) in a scratch database.
+    """
+    from django.db.models import Q
+    from . import search
+
+    rng = random.Random(47)
+    students = []
+    for i in range(iterations):
+        first, middle, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(LAST_NAMES)
+        students.append(Student(
+            first_name=first, middle_name=middle, last_name=last,
+            full_name=f'{last.upper()}, {first.upper()} {middle.upper()}',
+            student_id=rng.choice([None, f'2025-{i:06d}']),
+            email=f"{first.lower().replace(' ', '')}.{last.lower().replace(' ', '')}{i}@example.com",
+            mobile_number=f'09{rng.randrange(10 ** 9):09d}',
+        ))
+
+    with _scratch_database(write):
+        started = time.perf_counter()
+        Student.objects.bulk_create(students, batch_size=2000)
+        write(f"Inserted and indexed {iterations} rows in {time.perf_counter() - started:.1f} s")
+        sample = rng.sample(students, 200)
+        queries = [
+            ("last name prefix", [(s.last_name[:4],) for s in sample]),
+            ("first + last name", [(f'{s.first_name} {s.last_name}',) for s in sample]),
+            ("email", [(s.email,) for s in sample]),
+            ("mobile prefix", [(s.mobile_number[:7],) for s in sample]),
+            ("student id", [(f'2025-{rng.randrange(iterations):06d}',) for _ in sample]),
+        ]
+        write(f"Search on {iterations} rows ({len(sample)} queries each):")
+        for label, args in queries:
+            _report(write, f"{label}: ranked", _time_calls(lambda text: search.ranked(Student.objects.all(), text), args))
+            _report(write, f"{label}: first page", _time_calls(
+                lambda text: list(search.matching(Student.objects.all(), text).order_by('-pk')[:11]), args))
+
+        def scan(text):
+            condition = Q()
+            for name in search.SEARCH_FIELDS:
+                condition |= Q(**{f'{name}__icontains': text})
+            return list(Student.objects.filter(condition).order_by('-pk')[:11])
+
+        write("Unindexed, for comparison:")
+        _report(write, "email: icontains scan", _time_calls(scan, queries[2][1][:10]))
+        _report(write, "student id: icontains", _time_calls(
+            lambda text: list(Student.objects.filter(student_id__icontains=text)[:11]), queries[4][1][:10]))
+
+
+def bench_export(write=print, iterations=100000):
+    """Filtered-list export of `iterations` synthetic students: time to first bytes, total time, peak memory.
+
+    Compares the streaming CSV/XLSX writers with StudentResource().export() (the
+    admin's import-export path, which builds the whole dataset in memory). Peak
+    memory is traced on the first 10k and 20k rows only (tracing slows openpyxl
+    down tenfold): flat for the streaming writers, linear for import-export. Rows
+    are inserted in a scratch database.
+    """
+    import tracemalloc
+    from . import exports
+    from .resources import StudentResource
+
+    rng = random.Random(53)
+    students = []
+    for i in range(iterations):
+        kwargs = random_student_kwargs(rng)
+        kwargs.update(student_id=rng.choice([None, f'2025-{i:06d}']), first_name=rng.choice(FIRST_NAMES),
+                      last_name=rng.choice(LAST_NAMES), email=f'applicant{i}@example.com', enrollment_chance=rng.random() * 100)
+        students.append(Student(**kwargs))
+
+    def xlsx_chunks(queryset):
+        with exports.xlsx_file(queryset) as file:
+            while chunk := file.read(65536):
+                yield chunk
+
+    writers = [
+        ("csv (streamed)", lambda queryset: (chunk.encode() for chunk in exports.csv_chunks(queryset))),
+        ("xlsx (write-only)", xlsx_chunks),
+        ("import-export csv", lambda queryset: [StudentResource().export(queryset=queryset).csv.encode()]),
+    ]
+
+    def peak_mib(produce, queryset):
+        tracemalloc.start()
+        for _ in produce(queryset):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 2 ** 20
+
+    with _scratch_database(write):
+        Student.objects.bulk_create(students, batch_size=2000)
+        del students
+        queryset = Student.objects.order_by('-id')
+        write(f"Export of {iterations} rows:")
+        for label, produce in writers:
+            started = time.perf_counter()
+            first, size = None, 0
+            for piece in produce(queryset):
+                if first is None:
+                    first = time.perf_counter() - started
+                size += len(piece)
+            total = time.perf_counter() - started
+            peaks = [peak_mib(produce, queryset[:rows]) for rows in (10000, 20000)]
+            write(f"  {label:<18} first bytes {first * 1000:9.1f} ms   total {total:6.2f} s   size {size / 2 ** 20:5.1f} MiB"
+                  f"   peak {peaks[0]:6.1f} MiB @10k rows, {peaks[1]:6.1f} MiB @20k rows")
+
+
+def bench_feature_log(write=print, iterations=100000):
+    """write_feature_json throughput with 10k and `iterations` records already written.
+
+    Times the append-only feature log (appends, a full compaction, indexed reads)
+    and the old whole-file rewrite, which re-read and re-dumped every record on
+    each registration. Runs in a temporary directory.
+    """
+    import json
+    import tempfile
+    from pathlib import Path
+    from . import feature_log
+    from .utils import build_flat_record, write_feature_json
+
+    rng = random.Random(61)
+    appends = 2000
+
+    def student(pk):
+        return Student(pk=pk, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                       email=f'applicant{pk}@example.com', **random_student_kwargs(rng))
+
+    # One pool of records reused for seeding: building 100k records dominates otherwise
+    pool = [build_flat_record(student(pk)) for pk in range(1, 1001)]
+    new_students = [student(pk) for pk in range(10 ** 7, 10 ** 7 + appends)]
+
+    def rewrite(path, pk, record):
+        data = json.loads(path.read_text(encoding='utf-8'))
+        data[feature_log.record_key(pk)] = record
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    for size in sorted({10000, iterations}):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            with (directory / feature_log.LOG_BASENAME).open('w', encoding='utf-8') as log:
+                for pk in range(1, size + 1):
+                    record = dict(pool[pk % len(pool)], ID=pk)
+                    log.write(json.dumps({'key': feature_log.record_key(pk), 'record': record}, ensure_ascii=False) + '\n')
+            feature_log.compact(directory)
+            snapshot = directory / feature_log.SNAPSHOT_BASENAME
+            write(f"Feature log with {size} students ({snapshot.stat().st_size / 2 ** 20:.1f} MiB snapshot):")
+
+            started = time.perf_counter()
+            stats = _time_calls(lambda s: write_feature_json(s, directory), [(s,) for s in new_students])
+            elapsed = time.perf_counter() - started
+            _report(write, f"append x{appends}", stats)
+            write(f"  {'throughput':<28} {appends / elapsed:8.0f} registrations/s")
+
+            started = time.perf_counter()
+            feature_log.compact(directory)
+            compaction = time.perf_counter() - started
+            # Compaction runs once the log reaches half the snapshot: about size/2 appends apart
+            write(f"  {'compaction':<28} {compaction * 1000:8.1f} ms   amortized {compaction * 1000 / max(1, size // 2):.3f} ms/append")
+
+            reader = feature_log.FeatureLogReader(directory)
+            reader.get(1)
+            _report(write, "indexed read", _time_calls(reader.get, [(rng.randint(1, size),) for _ in range(2000)]))
+
+            samples = 20 if size <= 10000 else 3
+            _report(write, f"whole-file rewrite x{samples}",
+                    _time_calls(rewrite, [(snapshot, s.pk, pool[0]) for s in new_students[:samples]]))
+
+
+def random_registration(rng, i):
+    """Random applicant record in the registration form's vocabulary (api.ApplicantSerializer)."""
+    kwargs = random_student_kwargs(rng)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'schoolYear': kwargs['school_year'], 'schoolTerm': kwargs['school_term'], 'campus': 'NU-LIPA',
+        'firstChoice': kwargs['program_first_choice'], 'secondChoice': kwargs['program_second_choice'],
+        'entryLevel': kwargs['entry_level'], 'firstName': first, 'lastName': last,
+        'birthDate': kwargs['birth_date'], 'gender': kwargs['gender'], 'civilStatus': kwargs['civil_status'],
+        'religion': kwargs['religion'], 'birthCity': kwargs['birth_city'], 'birthProvince': kwargs['birth_province'],
+        'presentCity': kwargs['permanent_city'], 'presentProvince': kwargs['permanent_province'],
+        'emailAddress': f'applicant{i}@example.com', 'studentType': kwargs['student_type'],
+        'schoolType': kwargs['school_type'], 'truthfulInfo': True,
+    }
+
+
+def bench_ingest(write=print, iterations=10000):
+    """Bulk applicant API on `iterations` records (requests of 1000) vs one registration at a time.
+
+    Goes through api.ingest_applicants (JSON parsing, validation, chunked scoring
+    and bulk_create). The per-record path is the inline HTML registration: score
+    one student, save it, append its feature record. Rows are written to a scratch
+    database and the feature log to a temporary directory.
+    """
+    import tempfile
+    from pathlib import Path
+    from unittest import mock
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from . import api, feature_log, ml_utils
+    from .registration import student_from_registration
+    from .utils import write_feature_json
+
+    model = _benchmark_model(write)
+    rng = random.Random(67)
+    records = [random_registration(rng, i) for i in range(iterations)]
+    per_request = 1000
+    factory = APIRequestFactory()
+    user = User(username='benchmark', is_active=True, is_superuser=True)
+
+    def post(batch):
+        request = factory.post('/api/applicants/bulk/', batch, format='json')
+        force_authenticate(request, user=user)
+        response = api.ingest_applicants(request)
+        assert response.status_code == 201, response.data
+
+    def register(record):
+        student = student_from_registration(record)
+        ml_utils.score_student(student)
+        student.save()
+        write_feature_json(student)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(ml_utils, '_load_model', return_value=model), \
+            mock.patch.object(feature_log, 'default_directory', return_value=Path(tmp)), \
+            _scratch_database(write):
+        batches = [(records[start:start + per_request],) for start in range(0, iterations, per_request)]
+        started = time.perf_counter()
+        stats = _time_calls(post, batches)
+        elapsed = time.perf_counter() - started
+        write(f"Bulk ingestion of {iterations} applicants ({per_request} per request):")
+        _report(write, f"request of {per_request}", stats)
+        write(f"  {'throughput':<28} {iterations / elapsed:8.0f} applicants/s")
+
+        singles = [(dict(record, emailAddress=f'single{i}@example.com'),) for i, record in enumerate(records[:300])]
+        started = time.perf_counter()
+        stats = _time_calls(register, singles)
+        elapsed = time.perf_counter() - started
+        write(f"One registration at a time ({len(singles)} applicants):")
+        _report(write, "registration", stats)
+        write(f"  {'throughput':<28} {len(singles) / elapsed:8.0f} applicants/s")
+
+
+def bench_import(write=print, iterations=20000):
+    """Student file import of `iterations` rows, half updating stored students: bulk mode vs the admin default.
+
+    StudentBulkResource (preloaded keys, bulk_create / bulk_update) runs on the
+    whole file; StudentResource (one save per row) on its first 2000 rows. Birth
+    dates are MM/DD/YYYY, the second format clean_birth_date tries. The imports run in a
+    scratch database, each inside a transaction that is rolled back so it starts
+    from the same stored students.
+    """
+    import datetime
+    import tablib
+    from django.db import connection, transaction
+    from .resources import StudentBulkResource, StudentResource
+
+    rng = random.Random(71)
+    stored = []
+    for i in range(iterations // 2):
+        kwargs = random_student_kwargs(rng)
+        kwargs.update(student_id=rng.choice([None, f'2024-{i:06d}']), first_name=rng.choice(FIRST_NAMES),
+                      last_name=rng.choice(LAST_NAMES), email=f'stored{i}@example.com')
+        stored.append(Student(**kwargs))
+
+    import_fields = [field for field in StudentResource().get_import_fields() if field.column_name != 'ID']
+    dataset = tablib.Dataset(headers=[field.column_name for field in import_fields])
+    for i in range(iterations):
+        kwargs = random_student_kwargs(rng)
+        kwargs.update(first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                      enrollment_chance=f'{rng.random() * 100:.1f}%')
+        if i % 2:
+            # Update: matched by Student ID when the stored student has one, else by email
+            match = stored[i // 2]
+            kwargs.update(student_id=match.student_id, email=match.email)
+        else:
+            kwargs.update(student_id=rng.choice([None, f'2025-{i:06d}']), email=f'new{i}@example.com')
+        if kwargs['birth_date']:
+            kwargs['birth_date'] = datetime.date.fromisoformat(kwargs['birth_date']).strftime('%m/%d/%Y')
+        row = Student(**kwargs)
+        dataset.append([getattr(row, field.attribute, None) for field in import_fields])
+
+    def run(resource, rows):
+        executed = []
+        with transaction.atomic():
+            Student.objects.bulk_create(stored, batch_size=2000)
+            for student in stored:
+                student.pk = None
+            with connection.execute_wrapper(lambda execute, *args: executed.append(1) or execute(*args)):
+                started = time.perf_counter()
+                result = resource.import_data(rows, use_transactions=True)
+                elapsed = time.perf_counter() - started
+            assert not result.has_errors() and not result.has_validation_errors()
+            transaction.set_rollback(True)
+        totals = result.totals
+        write(f"  {resource.get_display_name():<28} {len(rows):6d} rows {elapsed:7.2f} s"
+              f" {len(rows) / elapsed:8.0f} rows/s {len(executed) / len(rows):6.2f} queries/row"
+              f"   ({totals['new']} new, {totals['update']} updated)")
+
+    head = tablib.Dataset(*dataset[:2000], headers=dataset.headers)
+    with _scratch_database(write):
+        write(f"Import into {len(stored)} stored students:")
+        run(StudentResource(), head)
+        run(StudentBulkResource(), head)
+        run(StudentBulkResource(), dataset)
+
+
+BENCHMARKS = {
+    'imports': bench_imports,
+    'inference': bench_inference,
+    'alignment': bench_alignment,
+    'preprocessing': bench_preprocessing,
+    'normalizers': bench_normalizers,
+    'query_plans': bench_query_plans,
+    'search': bench_search,
+    'export': bench_export,
+    'feature_log': bench_feature_log,
+    'ingest': bench_ingest,
+    'import': bench_import,
+}
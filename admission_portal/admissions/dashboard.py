@@ -0,0 +1,276 @@
+"""
+Admin dashboard summary statistics, cached per data version.
+
+compute_summary() builds the global part of the adminDash context (year
+distribution, gender split, top program, program popularity, admission split,
+enrollment chance histogram and the filter option lists) from the EnrollmentRollup
+table (admissions/rollups.py). summary_context() serves it from the cache under a
+key that embeds a data version; bump_data_version() is called whenever Student rows change (signals.py for
+saves/deletes, and the bulk update/import paths), so the next render recomputes.
+`manage.py warm_dashboard_cache` fills the cache after a deploy.
+
+The chart datasets are served separately as JSON (chart_payload(), views.dashboard_chart)
+with an ETag that is a digest of the payload, so the page itself carries no chart data
+and browsers revalidate charts with a 304 until the served data changes.
+
+The version lives in the default cache, which must be shared by the web workers,
+process_scoring_jobs and the import/rescore commands (settings.CACHES defaults to
+the database cache) so a bump in one process invalidates the summary for all.
+"""
+
+import hashlib
+import json
+import secrets
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import rollups
+
+DATA_VERSION_KEY = 'admissions:dashboard:data_version'
+SUMMARY_KEY = 'admissions:dashboard:summary:{version}'
+
+# Map full program names to abbreviations for summary card and graph labels
+PROGRAM_ABBREVIATIONS = {
+    'BACHELOR OF SCIENCE IN NURSING': 'BSN',
+    'BACHELOR OF SCIENCE IN CIVIL ENGINEERING': 'BSCE',
+    'BACHELOR OF SCIENCE IN MEDICAL TECHNOLOGY': 'BSMT',
+    'BACHELOR OF SCIENCE IN PSYCHOLOGY': 'BSPSY',
+    'BACHELOR OF SCIENCE IN ACCOUNTANCY': 'BSA',
+    'BACHELOR OF SCIENCE IN INFORMATION TECHNOLOGY': 'BSIT',
+    'BACHELOR OF SCIENCE IN TOURISM MANAGEMENT': 'BSTM',
+    'BACHELOR OF SCIENCE IN ARCHITECTURE': 'BSARCH',
+    'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN MARKETING MANAGEMENT': 'BSBA-MKTGMGT',
+    'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN FINANCIAL MANAGEMENT': 'BSBA-FINMGT',
+    'BACHELOR OF SCIENCE IN COMPUTER SCIENCE': 'BSCS',
+}
+
+
+def _new_version() -> int:
+    # Random rather than a counter: a version lost to eviction or a cache restart never
+    # comes back at a number that still has a (stale) summary stored under it
+    return secrets.randbits(63)
+
+
+def data_version() -> int:
+    """Current Student data version."""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def bump_data_version() -> None:
+    """Invalidate the cached summary; call after any write that changes Student rows.
+
+    The new version is set once the surrounding transaction commits (at once outside
+    one): set earlier, a concurrent reader could cache the pre-commit summary under it.
+    It is a fresh value rather than cache.incr(), which is a get and a set on the
+    database and local-memory caches (so concurrent bumps could collapse into one)
+    and gives the key the default timeout. A cache failure is logged, not raised,
+    so it never fails the write that is already committed.
+    """
+    transaction.on_commit(_set_new_version, robust=True)
+
+
+def _set_new_version() -> None:
+    cache.set(DATA_VERSION_KEY, _new_version(), timeout=None)
+
+
+def summary_context() -> dict:
+    """The dashboard summary for the current data version, computed on a cache miss."""
+    key = SUMMARY_KEY.format(version=data_version())
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary()
+        cache.set(key, summary, timeout=getattr(settings, 'ADMISSIONS_DASHBOARD_CACHE_TIMEOUT', 300))
+    return summary
+
+
+def _ordered(values):
+    # Stable option order for the filter lists (NULL last)
+    return sorted(values, key=lambda v: (v is None, v or ''))
+
+
+def compute_summary() -> dict:
+    # All breakdowns come from the EnrollmentRollup table (one query, size independent
+    # of the number of applicants); see admissions/rollups.py
+    summary = dict.fromkeys(
+        ('male_enrolled', 'female_enrolled', 'enrolled_all_years', 'not_enrolled_all_years',
+         'chance_below_40', 'chance_40_70', 'chance_70_90', 'chance_90_up'), 0)
+    enrolled_by_term = {}
+    enrolled_by_program = {}
+    program_options, school_year_options = set(), set()
+    for (year, term, program, gender, enrolled), counters in rollups.current_rollups().items():
+        program_options.add(program)
+        school_year_options.add(year)
+        for bucket in ('chance_below_40', 'chance_40_70', 'chance_70_90', 'chance_90_up'):
+            summary[bucket] += counters[bucket]
+        if not enrolled:
+            summary['not_enrolled_all_years'] += counters['count']
+            continue
+        summary['enrolled_all_years'] += counters['count']
+        gender_key = (gender or '').lower()
+        if gender_key in ('male', 'female'):
+            summary[f'{gender_key}_enrolled'] += counters['count']
+        enrolled_by_term[(year, term)] = enrolled_by_term.get((year, term), 0) + counters['count']
+        # Students without a program are listed but not counted (as COUNT(program_first_choice))
+        enrolled_by_program[program] = enrolled_by_program.get(program, 0) + (counters['count'] if program is not None else 0)
+
+    # Derive list of school years that have at least one enrolled student
+    # Filter out null/blank and coerce to ints where possible
+    years_with_enrollment: list[int] = []
+    for y, _ in enrolled_by_term:
+        if y is None:
+            continue
+        y_str = str(y).strip()
+        if not y_str:
+            continue
+        try:
+            years_with_enrollment.append(int(y_str))
+        except ValueError:
+            # Ignore non-numeric year values
+            continue
+    years_with_enrollment = sorted(set(years_with_enrollment))
+
+    # Guard: if no enrolled years yet, fall back to original broad logic
+    if years_with_enrollment:
+        min_year = years_with_enrollment[0]
+        max_year = years_with_enrollment[-1]
+    else:
+        min_year = max_year = None
+
+    # Latest enrolled (school_year, school_term) for current year/term context
+    # (string ordering, NULLs lowest - as ORDER BY -school_year, -school_term on SQLite)
+    latest = max(enrolled_by_term, key=lambda k: tuple((v is not None, v or '') for v in k), default=None)
+    current_year = latest[0] if latest else None
+    current_term = latest[1] if latest else None
+
+    # Male / Female counts restricted to currently enrolled population
+    male_enrolled_count = summary['male_enrolled']
+    female_enrolled_count = summary['female_enrolled']
+    total_enrolled = male_enrolled_count + female_enrolled_count
+    if total_enrolled > 0:
+        male_enrolled_percent = (male_enrolled_count / total_enrolled) * 100
+        female_enrolled_percent = (female_enrolled_count / total_enrolled) * 100
+    else:
+        male_enrolled_percent = female_enrolled_percent = 0
+
+    programs = _ordered(program_options)
+    school_years = _ordered(school_year_options)
+
+    # --- Dashboard summary & academic year distribution logic ---
+    enrolled_counts = OrderedDict()
+
+    if current_term is not None and min_year is not None and max_year is not None:
+        # Restrict to the contiguous numeric range from min_year to max_year
+        for y in range(min_year, max_year + 1):
+            enrolled_counts[str(y)] = enrolled_by_term.get((str(y), current_term), 0)
+    else:
+        # Fallback: no enrolled students yet. Provide empty counts keyed by distinct school_years.
+        for y in school_years:
+            enrolled_counts[str(y)] = 0
+
+    current_enrolled_count = enrolled_counts.get(str(current_year), 0) if current_year else 0
+    years_sorted = list(enrolled_counts.keys())
+    if current_year and str(current_year) in years_sorted:
+        idx = years_sorted.index(str(current_year))
+        if idx > 0:
+            prev_year_key = years_sorted[idx - 1]
+            prev_val = enrolled_counts.get(prev_year_key, 0)
+            percent_change = ((current_enrolled_count - prev_val) / prev_val * 100) if prev_val else 0
+        else:
+            percent_change = 0
+    else:
+        percent_change = 0
+
+    # --- Program popularity among enrolled students (pie chart + top program card) ---
+    program_popularity = [
+        {'program_first_choice': program, 'count': count}
+        for program, count in sorted(enrolled_by_program.items(), key=lambda item: -item[1])
+    ]
+    top_program_data = program_popularity[0] if program_popularity else None
+    top_program = top_program_data['program_first_choice'] if top_program_data else None
+    top_program_count = top_program_data['count'] if top_program_data else 0
+    # Abbreviation for top program (reuse mapping) for summary card display
+    top_program_abbrev = None
+    if top_program:
+        top_program_upper = (top_program or '').strip().upper()
+        top_program_abbrev = PROGRAM_ABBREVIATIONS.get(top_program_upper, top_program)
+
+    # Academic year distribution (already ordered)
+    academic_year_labels = list(enrolled_counts.keys())
+    academic_year_data = list(enrolled_counts.values())
+
+    program_labels = [
+        PROGRAM_ABBREVIATIONS.get((p['program_first_choice'] or '').strip().upper(), p['program_first_choice'])
+        for p in program_popularity
+    ]
+    program_data = [p['count'] for p in program_popularity]
+
+    # Admission success rate using entire database (all years)
+    total_enrolled_all_years = summary['enrolled_all_years']
+    total_not_enrolled_all_years = summary['not_enrolled_all_years']
+    admission_labels = ["Enrolled", "Not Enrolled"]
+    admission_data = [total_enrolled_all_years, total_not_enrolled_all_years]
+
+    return {
+        'programs': programs,
+        'school_years': school_years,
+        'current_enrolled_count': current_enrolled_count,
+        'current_year': current_year,
+        'current_term': current_term,
+        'percent_change': percent_change,
+        'male_enrolled_count': male_enrolled_count,
+        'female_enrolled_count': female_enrolled_count,
+        'male_enrolled_percent': male_enrolled_percent,
+        'female_enrolled_percent': female_enrolled_percent,
+        'top_program': top_program,
+        'top_program_count': top_program_count,
+        'top_program_abbrev': top_program_abbrev,
+        'academic_year_labels': academic_year_labels,
+        'academic_year_data': academic_year_data,
+        'program_labels': program_labels,
+        'program_data': program_data,
+        'admission_labels': admission_labels,
+        'admission_data': admission_data,
+        'enrollment_chance_counts': [
+            summary['chance_below_40'],
+            summary['chance_40_70'],
+            summary['chance_70_90'],
+            summary['chance_90_up'],
+        ],
+    }
+
+
+# Enrollment chance histogram buckets, in enrollment_chance_counts order
+CHANCE_BUCKET_LABELS = ["Below 40%", "40% and above", "70% and above", "90% and above"]
+
+# Chart name -> (labels key, data key) in the summary context
+CHARTS = {
+    'academic-years': ('academic_year_labels', 'academic_year_data'),
+    'programs': ('program_labels', 'program_data'),
+    'admission': ('admission_labels', 'admission_data'),
+    'enrollment-chance': (None, 'enrollment_chance_counts'),
+}
+
+
+def chart_etag(name: str) -> str:
+    """Entity tag of a chart dataset: a digest of the payload served.
+
+    Not the data version: a summary recomputed after its timeout, with a bump this
+    process never saw, must still reach browsers instead of answering 304 forever.
+    """
+    payload = json.dumps(chart_payload(name), sort_keys=True, separators=(',', ':'), default=str)
+    return f'{name}-{hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()}'
+
+
+def chart_payload(name: str) -> dict:
+    """{'labels': [...], 'data': [...]} of one chart, from the cached summary."""
+    labels_key, data_key = CHARTS[name]
+    summary = summary_context()
+    labels = summary[labels_key] if labels_key else CHANCE_BUCKET_LABELS
+    return {'labels': labels, 'data': summary[data_key]}
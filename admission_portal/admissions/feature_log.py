@@ -0,0 +1,221 @@
+"""
+Append-only log of the flattened registration records (utils.build_flat_record).
+
+Each write appends one JSON line, {"key": "dummy_Student<pk>", "record": {...}},
+to registration_features.jsonl while holding an exclusive file lock. Concurrent
+web processes and scoring workers therefore never lose each other's records,
+and a write costs the same whether 100 or 100k students came before.
+
+Once the log reaches half the size of the snapshot (and at least
+COMPACT_MIN_BYTES), the writer folds it into latest_registration_features.json
+and truncates the log. The snapshot keeps the latest record per student, in the
+format the old whole-file writer produced. Next to it goes an index of each
+record's byte range. Because the threshold grows with the snapshot, compaction
+stays amortized O(1) per write. FeatureLogReader reads one student's record
+through that index and the log tail, without parsing the whole snapshot.
+
+    append_record(record_key(student.pk), record)   # utils.write_feature_json
+    FeatureLogReader().get(student.pk)              # latest record, or None
+    compact()                                       # manage.py compact_feature_log
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOG_BASENAME = 'registration_features.jsonl'
+SNAPSHOT_BASENAME = 'latest_registration_features.json'
+INDEX_BASENAME = 'latest_registration_features.index.json'
+LOCK_BASENAME = 'registration_features.lock'
+COMPACT_MIN_BYTES = 4 * 2 ** 20
+
+
+def default_directory() -> Path:
+    return Path(__file__).resolve().parent / 'data'
+
+
+def record_key(pk) -> str:
+    return f"dummy_Student{pk}"
+
+
+def _directory(directory) -> Path:
+    directory = Path(directory) if directory is not None else default_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+@contextmanager
+def _locked(directory: Path, shared: bool = False):
+    """Hold the log lock: exclusive for writers, shared for readers (exclusive on Windows)."""
+    with open(directory / LOCK_BASENAME, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _log_entries(data: bytes, start: int = 0):
+    """(offset, length, key) of each complete line; a torn or corrupt line is skipped."""
+    offset = start
+    for line in data.splitlines(keepends=True):
+        if line.endswith(b'\n'):
+            try:
+                yield offset, len(line), json.loads(line)['key']
+            except (ValueError, KeyError, TypeError):
+                pass
+        offset += len(line)
+
+
+def append_record(key: str, record: dict, directory=None) -> Path:
+    """Append the latest record of one student to the log (compacting when due); returns the log path."""
+    return append_records([(key, record)], directory)
+
+
+def append_records(items, directory=None) -> Path:
+    """append_record for (key, record) pairs, with one lock and one write."""
+    directory = _directory(directory)
+    log_path = directory / LOG_BASENAME
+    lines = b''.join(
+        (json.dumps({'key': key, 'record': record}, ensure_ascii=False) + '\n').encode('utf-8')
+        for key, record in items
+    )
+    with _locked(directory):
+        with log_path.open('ab') as log:
+            log.write(lines)
+            size = log.tell()
+        snapshot_path = directory / SNAPSHOT_BASENAME
+        snapshot_size = snapshot_path.stat().st_size if snapshot_path.exists() else 0
+        if size >= max(COMPACT_MIN_BYTES, snapshot_size // 2):
+            _compact_locked(directory)
+    return log_path
+
+
+def compact(directory=None) -> int:
+    """Fold the log into the snapshot and its index now; returns the number of students."""
+    directory = _directory(directory)
+    with _locked(directory):
+        return _compact_locked(directory)
+
+
+def _compact_locked(directory: Path) -> int:
+    snapshot_path = directory / SNAPSHOT_BASENAME
+    log_path = directory / LOG_BASENAME
+    records = {}
+    if snapshot_path.exists():
+        try:
+            records = json.loads(snapshot_path.read_text(encoding='utf-8'))
+        except ValueError:
+            records = {}
+    if log_path.exists():
+        data = log_path.read_bytes()
+        for offset, length, key in _log_entries(data):
+            records[key] = json.loads(data[offset:offset + length])['record']
+    _write_snapshot(directory, records)
+    # A crash before this line only replays the log onto the new snapshot next time
+    log_path.open('wb').close()
+    return len(records)
+
+
+def _write_snapshot(directory: Path, records: dict) -> None:
+    """Snapshot (same bytes as json.dump(records, indent=2)) plus the byte range of each record."""
+    snapshot_tmp = directory / (SNAPSHOT_BASENAME + '.tmp')
+    index_tmp = directory / (INDEX_BASENAME + '.tmp')
+    ranges = {}
+    with snapshot_tmp.open('wb') as out:
+        out.write(b'{')
+        for n, (key, record) in enumerate(records.items()):
+            out.write(b',\n  ' if n else b'\n  ')
+            out.write(json.dumps(key, ensure_ascii=False).encode('utf-8') + b': ')
+            body = json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ').encode('utf-8')
+            ranges[key] = [out.tell(), len(body)]
+            out.write(body)
+        out.write(b'\n}' if records else b'}')
+        size = out.tell()
+    index_tmp.write_text(json.dumps({'snapshot_size': size, 'records': ranges}), encoding='utf-8')
+    os.replace(snapshot_tmp, directory / SNAPSHOT_BASENAME)
+    os.replace(index_tmp, directory / INDEX_BASENAME)
+
+
+class FeatureLogReader:
+    """Latest record per student from the snapshot index and the log tail.
+
+    The index is reloaded only after a compaction and only new log lines are
+    scanned, so a lookup reads one record's bytes.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = _directory(directory)
+        self._snapshot_stat = None
+        self._ranges = {}
+        self._records = None  # whole snapshot, when it has no usable index (written by the old writer)
+        self._log_offset = 0
+        self._tail = {}  # key -> (offset, length) in the log
+
+    def _refresh(self) -> None:
+        snapshot_path = self.directory / SNAPSHOT_BASENAME
+        try:
+            stat = snapshot_path.stat()
+            snapshot_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            snapshot_stat = None
+        if snapshot_stat != self._snapshot_stat:
+            # Compacted since the last lookup: new index, and the log starts over
+            self._snapshot_stat = snapshot_stat
+            self._ranges, self._records = {}, None
+            self._log_offset, self._tail = 0, {}
+            if snapshot_stat is not None:
+                try:
+                    index = json.loads((self.directory / INDEX_BASENAME).read_text(encoding='utf-8'))
+                    if index['snapshot_size'] != snapshot_stat[1]:
+                        raise ValueError('index does not match the snapshot')
+                    self._ranges = index['records']
+                except (OSError, ValueError, KeyError):
+                    self._records = json.loads(snapshot_path.read_text(encoding='utf-8'))
+        log_path = self.directory / LOG_BASENAME
+        if not log_path.exists():
+            return
+        with log_path.open('rb') as log:
+            log.seek(0, os.SEEK_END)
+            if log.tell() < self._log_offset:
+                self._log_offset, self._tail = 0, {}
+            log.seek(self._log_offset)
+            data = log.read()
+        complete = data.rfind(b'\n') + 1
+        for offset, length, key in _log_entries(data[:complete], self._log_offset):
+            self._tail[key] = (offset, length)
+        self._log_offset += complete
+
+    def get(self, pk):
+        """The latest flattened record of student `pk`, or None."""
+        key = record_key(pk)
+        with _locked(self.directory, shared=True):
+            self._refresh()
+            if key in self._tail:
+                offset, length = self._tail[key]
+                with (self.directory / LOG_BASENAME).open('rb') as log:
+                    log.seek(offset)
+                    return json.loads(log.read(length))['record']
+            if self._records is not None:
+                return self._records.get(key)
+            if key in self._ranges:
+                offset, length = self._ranges[key]
+                with (self.directory / SNAPSHOT_BASENAME).open('rb') as snapshot:
+                    snapshot.seek(offset)
+                    return json.loads(snapshot.read(length))
+        return None
@@ -0,0 +1,250 @@
+"""
+Flattened random-forest evaluator for single-row, low-latency scoring.
+
+sklearn's predict_proba on a one-row DataFrame spends milliseconds on input
+validation, dtype conversion and joblib dispatch; walking the trees takes
+microseconds. compile_forest() exports a fitted forest (optionally behind a
+ColumnTransformer of OneHotEncoder / passthrough steps) into packed NumPy
+arrays once, and FlatForest evaluates engineered feature dicts directly.
+
+Supported model shapes:
+    RandomForestClassifier / ExtraTreesClassifier
+    Pipeline([(..., ColumnTransformer(OneHotEncoder | 'passthrough' | 'drop')), (..., forest)])
+
+Anything else makes compile_forest() return None so callers keep using sklearn.
+"""
+
+import logging
+import math
+import warnings
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MISSING_MARKERS = ('N/A', 'NA', '')
+
+
+def _to_number(value, coerce: bool) -> float:
+    """Mirror ml_utils numeric coercion (coerce=True) or sklearn's float conversion."""
+    if value is None or (isinstance(value, str) and value in _MISSING_MARKERS and coerce):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        if coerce:
+            return math.nan
+        raise
+
+
+class _OneHotBlock:
+    """One OneHotEncoder input column -> a contiguous block of indicator columns."""
+
+    def __init__(self, column: str, categories, offset: int, ignore_unknown: bool):
+        self.column = column
+        self.offset = offset
+        self.width = len(categories)
+        self.ignore_unknown = ignore_unknown
+        self.lookup = {}
+        self.none_index = None
+        self.nan_index = None
+        for i, category in enumerate(categories):
+            if category is None:
+                self.none_index = i
+            elif isinstance(category, float) and math.isnan(category):
+                self.nan_index = i
+            else:
+                self.lookup[category] = i
+
+    def index_of(self, value):
+        if value is None:
+            index = self.none_index
+        elif isinstance(value, float) and math.isnan(value):
+            index = self.nan_index
+        else:
+            index = self.lookup.get(value)
+        if index is None and not self.ignore_unknown:
+            raise ValueError(f"Unknown category {value!r} for column {self.column!r}")
+        return index
+
+
+class FlatForest:
+    """Packed node arrays for every tree of a fitted forest plus its input encoding."""
+
+    def __init__(self, columns, numeric_columns, onehot_blocks, passthrough, forest):
+        self.columns = list(columns)
+        self.numeric_columns = frozenset(numeric_columns)
+        self.onehot_blocks = onehot_blocks
+        # (input column, output position) pairs copied through as numbers
+        self.passthrough = passthrough
+        self.n_features = forest.n_features_in_
+        self.classes_ = forest.classes_
+        self._pack(forest.estimators_)
+
+    def _pack(self, estimators):
+        features, thresholds, lefts, rights, missing_left, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            n = tree.node_count
+            node_ids = np.arange(offset, offset + n)
+            is_leaf = tree.children_left == -1
+            # Leaves point at themselves so every row can take max_depth steps unconditionally
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(n, dtype=bool) if missing is None else missing.astype(bool))
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max_depth
+
+    def encode(self, records) -> np.ndarray:
+        """Engineered feature dicts -> the float32 matrix the forest was fitted on."""
+        X = np.zeros((len(records), self.n_features), dtype=np.float32)
+        for r, record in enumerate(records):
+            row = X[r]
+            for column, position in self.passthrough:
+                row[position] = _to_number(record.get(column), column in self.numeric_columns)
+            for block in self.onehot_blocks:
+                value = record.get(block.column, math.nan)
+                if block.column in self.numeric_columns:
+                    value = _to_number(value, True)
+                index = block.index_of(value)
+                if index is not None:
+                    row[block.offset + index] = 1.0
+        return X
+
+    def predict_proba_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Vectorized traversal of all trees for all rows; returns (n_rows, n_classes)."""
+        n_rows = X.shape[0]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.roots.size)).copy()
+        row_index = np.arange(n_rows)[:, None]
+        for _ in range(self.max_depth):
+            x = X[row_index, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=1)
+
+    def predict_proba_records(self, records) -> np.ndarray:
+        return self.predict_proba_matrix(self.encode(records))
+
+    def describe(self) -> dict:
+        return {
+            'trees': int(self.roots.size),
+            'nodes': int(self.feature.size),
+            'max_depth': int(self.max_depth),
+            'input_columns': len(self.columns),
+            'encoded_features': int(self.n_features),
+            'bytes': int(sum(a.nbytes for a in (
+                self.feature, self.threshold, self.left, self.right, self.missing_left, self.value))),
+        }
+
+
+def _split_pipeline(model):
+    """Return (column_transformer_or_None, forest) or raise ValueError."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+    forests = (RandomForestClassifier, ExtraTreesClassifier)
+    if isinstance(model, forests):
+        return None, model
+    steps = getattr(model, 'steps', None)
+    if not steps or not isinstance(steps[-1][1], forests):
+        raise ValueError(f"unsupported estimator {type(model).__name__}")
+    head = [step for _, step in steps[:-1] if step not in (None, 'passthrough')]
+    if not head:
+        return None, steps[-1][1]
+    if len(head) == 1 and isinstance(head[0], ColumnTransformer):
+        return head[0], steps[-1][1]
+    raise ValueError("only a single ColumnTransformer is supported before the forest")
+
+
+def _column_names(selection, feature_names):
+    names = []
+    for column in selection:
+        if isinstance(column, (int, np.integer)):
+            names.append(feature_names[column])
+        elif isinstance(column, str):
+            names.append(column)
+        else:
+            raise ValueError(f"unsupported column selector {column!r}")
+    return names
+
+
+def _encoding_plan(transformer, columns):
+    """Walk a fitted ColumnTransformer; returns (onehot_blocks, passthrough, width)."""
+    from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+    blocks, passthrough = [], []
+    position = 0
+    with warnings.catch_warnings():
+        # sklearn 1.6 warns that remainder columns will switch from indices to names;
+        # _column_names accepts both, so the change does not affect us
+        warnings.simplefilter('ignore', FutureWarning)
+        fitted = list(transformer.transformers_)
+    for name, step, selection in fitted:
+        if step == 'drop':
+            continue
+        if isinstance(selection, slice) or np.ndim(selection) == 0 or getattr(selection, 'dtype', None) == bool:
+            raise ValueError(f"unsupported column selection for {name!r}")
+        names = _column_names(list(selection), columns)
+        if not names:
+            continue
+        is_identity = isinstance(step, FunctionTransformer) and step.func is None
+        if step == 'passthrough' or is_identity:
+            for column in names:
+                passthrough.append((column, position))
+                position += 1
+        elif isinstance(step, OneHotEncoder):
+            if step.drop is not None or getattr(step, '_infrequent_enabled', False):
+                raise ValueError("OneHotEncoder with drop/infrequent categories is not supported")
+            ignore_unknown = step.handle_unknown != 'error'
+            for column, categories in zip(names, step.categories_):
+                block = _OneHotBlock(column, categories.tolist(), position, ignore_unknown)
+                blocks.append(block)
+                position += block.width
+        else:
+            raise ValueError(f"unsupported transformer {type(step).__name__} ({name!r})")
+    return blocks, passthrough, position
+
+
+def compile_forest(model, numeric_columns=()):
+    """Export a fitted model into a FlatForest, or None when its structure is not supported.
+
+    numeric_columns are the engineered columns ml_utils coerces to numbers before
+    calling the model; the same coercion is applied while encoding rows.
+    """
+    try:
+        transformer, forest = _split_pipeline(model)
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("multi-output forests are not supported")
+        if transformer is None:
+            columns = list(getattr(forest, 'feature_names_in_', []))
+            if len(columns) != forest.n_features_in_:
+                raise ValueError("forest was fitted without column names")
+            blocks, passthrough, width = [], [(c, i) for i, c in enumerate(columns)], len(columns)
+        else:
+            columns = list(transformer.feature_names_in_)
+            blocks, passthrough, width = _encoding_plan(transformer, columns)
+        if width != forest.n_features_in_:
+            raise ValueError(f"encoded width {width} != forest inputs {forest.n_features_in_}")
+        return FlatForest(columns, numeric_columns, blocks, passthrough, forest)
+    except Exception as exc:
+        logger.info("Flat forest evaluator unavailable, using sklearn: %s", exc)
+        return None
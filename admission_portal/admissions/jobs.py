@@ -0,0 +1,143 @@
+"""
+Durable scoring queue: registration enqueues, a worker scores in batches.
+
+The registration view only inserts a ScoringJob (after its transaction commits);
+`manage.py process_scoring_jobs` claims pending jobs in batches, scores them through
+the batch model path and writes enrollment_chance back. Request latency therefore no
+longer depends on model speed. queue_stats() reports depth and job age for both sides.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from . import rollups
+from .dashboard import bump_data_version
+from .models import ScoringJob, Student
+
+logger = logging.getLogger(__name__)
+
+# A running job whose worker has not finished it within this window is claimable again
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+
+def scoring_queue_enabled() -> bool:
+    return getattr(settings, 'ADMISSIONS_SCORING_QUEUE', True)
+
+
+def enqueue_scoring(student: Student) -> None:
+    """Queue enrollment_chance computation once the surrounding transaction commits."""
+    transaction.on_commit(lambda: ScoringJob.objects.create(student_id=student.pk))
+
+
+def queue_stats() -> dict:
+    """Depth and age of the queue in one aggregate query."""
+    stats = ScoringJob.objects.aggregate(
+        pending=Count('pk', filter=Q(status=ScoringJob.STATUS_PENDING)),
+        running=Count('pk', filter=Q(status=ScoringJob.STATUS_RUNNING)),
+        failed=Count('pk', filter=Q(status=ScoringJob.STATUS_FAILED)),
+        oldest_pending=Min('created_at', filter=Q(status=ScoringJob.STATUS_PENDING)),
+    )
+    oldest = stats.pop('oldest_pending')
+    stats['depth'] = stats['pending'] + stats['running']
+    stats['oldest_pending_age_seconds'] = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return stats
+
+
+def claim_jobs(batch_size: int) -> list[ScoringJob]:
+    """Mark up to batch_size claimable jobs as running and return them (oldest first)."""
+    now = timezone.now()
+    claimable = Q(status=ScoringJob.STATUS_PENDING) | Q(
+        status=ScoringJob.STATUS_RUNNING, claimed_at__lt=now - timedelta(seconds=LEASE_SECONDS)
+    )
+    with transaction.atomic():
+        qs = ScoringJob.objects.filter(claimable).order_by('created_at', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent workers skip each other's rows instead of blocking on them
+            qs = qs.select_for_update(skip_locked=True)
+        ids = list(qs.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return []
+        # Without row locks (SQLite) another worker may claim some of these between the
+        # SELECT and here: the UPDATE re-checks claimable, and only rows it stamped with
+        # this claim's time are ours
+        ScoringJob.objects.filter(claimable, pk__in=ids).update(
+            status=ScoringJob.STATUS_RUNNING, claimed_at=now, attempts=F('attempts') + 1
+        )
+    return list(
+        ScoringJob.objects.filter(pk__in=ids, status=ScoringJob.STATUS_RUNNING, claimed_at=now)
+        .select_related('student').order_by('created_at', 'pk')
+    )
+
+
+def process_jobs(jobs: list[ScoringJob]) -> int:
+    """Score claimed jobs in one batch model call; returns the number completed.
+
+    When the model is missing or its call fails (ml_utils.ScoringError) the whole
+    batch is released; a student whose data fails preprocessing has only its own
+    job released. Released jobs are retried until MAX_ATTEMPTS, then marked failed,
+    and their students are not written.
+    """
+    if not jobs:
+        return 0
+    from .ml_utils import model_version_of, predict_students_rf_batch, require_model
+    from .utils import write_feature_json
+
+    try:
+        model = require_model()
+        probabilities = predict_students_rf_batch([job.student for job in jobs], chunk_size=len(jobs), model=model)
+    except Exception as exc:
+        logger.exception("Scoring batch of %s jobs failed: %s", len(jobs), exc)
+        _release(jobs, exc)
+        return 0
+    rejected = [job for job in jobs if probabilities[job.student_id] is None]
+    if rejected:
+        logger.warning("Preprocessing failed for %s of %s students; their jobs are released", len(rejected), len(jobs))
+        _release(rejected, ValueError("preprocessing rejected the student's data"))
+        jobs = [job for job in jobs if probabilities[job.student_id] is not None]
+        if not jobs:
+            return 0
+
+    students = [job.student for job in jobs]
+    try:
+        version = model_version_of(model)
+        for student in students:
+            student.enrollment_chance = probabilities[student.pk] * 100.0
+            student.model_version = version
+        with rollups.track([student.pk for student in students]):
+            Student.objects.bulk_update(students, ['enrollment_chance', 'model_version'])
+        bump_data_version()
+    except Exception as exc:
+        logger.exception("Scoring batch of %s jobs failed: %s", len(jobs), exc)
+        _release(jobs, exc)
+        return 0
+
+    for student in students:
+        try:
+            write_feature_json(student)
+        except Exception as exc:
+            logger.warning("Feature export failed for student %s: %s", student.pk, exc)
+
+    ScoringJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        status=ScoringJob.STATUS_DONE, finished_at=timezone.now(), last_error=''
+    )
+    return len(jobs)
+
+
+def _release(jobs: list[ScoringJob], exc: Exception) -> None:
+    """Put failed jobs back in the queue, or mark them failed after MAX_ATTEMPTS."""
+    retry = [job.pk for job in jobs if job.attempts < MAX_ATTEMPTS]
+    give_up = [job.pk for job in jobs if job.attempts >= MAX_ATTEMPTS]
+    if retry:
+        ScoringJob.objects.filter(pk__in=retry).update(
+            status=ScoringJob.STATUS_PENDING, claimed_at=None, last_error=str(exc)
+        )
+    if give_up:
+        ScoringJob.objects.filter(pk__in=give_up).update(
+            status=ScoringJob.STATUS_FAILED, finished_at=timezone.now(), last_error=str(exc)
+        )
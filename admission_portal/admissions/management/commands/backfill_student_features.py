@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from admissions.models import Student
+from admissions import ml_utils
+from admissions.preprocessing import FEATURE_SCHEMA_VERSION
+
+
+class Command(BaseCommand):
+    help = "Compute and store engineered features (StudentFeatures) for students whose stored features are missing or stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=ml_utils.BATCH_CHUNK_SIZE,
+                            help='Students per database fetch and per preprocessing batch.')
+        parser.add_argument('--force', action='store_true',
+                            help='Recompute every student, even when the stored features are current.')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        qs = Student.objects.order_by('pk').only(*ml_utils.PREPROCESSING_FIELDS)
+        totals = {'fresh': 0, 'refreshed': 0, 'failed': 0}
+        started = time.perf_counter()
+        for chunk in ml_utils._chunked(qs.iterator(chunk_size=chunk_size), chunk_size):
+            _, counts = ml_utils.student_features(chunk, force=options['force'])
+            for key, value in counts.items():
+                totals[key] += value
+            self.stdout.write(f"{sum(totals.values())} students checked, {totals['refreshed']} refreshed")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Feature schema v{FEATURE_SCHEMA_VERSION}: {totals['refreshed']} refreshed, "
+            f"{totals['fresh']} already current, {totals['failed']} failed preprocessing ({elapsed:.1f}s)."
+        ))
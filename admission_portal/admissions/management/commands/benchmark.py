@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from admissions.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run an admissions micro-benchmark and print latency/throughput figures."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(BENCHMARKS), help='Benchmark to run.')
+        parser.add_argument('--iterations', type=int, help='Override the benchmark\'s default size.')
+
+    def handle(self, *args, **options):
+        kwargs = {}
+        if options['iterations']:
+            kwargs['iterations'] = options['iterations']
+        BENCHMARKS[options['name']](write=self.stdout.write, **kwargs)
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+from admissions import feature_log
+
+
+class Command(BaseCommand):
+    help = "Fold the registration feature log into latest_registration_features.json and its index (writers also do this on their own as the log grows)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help="Feature log directory (default: admissions/data).")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = feature_log.compact(options['directory'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Feature log compacted: {count} students ({elapsed * 1000:.0f} ms)."))
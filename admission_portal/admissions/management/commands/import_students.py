@@ -0,0 +1,46 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from import_export.formats.base_formats import CSV, XLSX
+from admissions.resources import StudentBulkResource, StudentResource
+
+
+class Command(BaseCommand):
+    help = "Import students from a .csv or .xlsx file with the admin import's columns (bulk mode by default) and report rows/s."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import (.csv or .xlsx).')
+        parser.add_argument('--dry-run', action='store_true', help='Import inside a transaction that is rolled back.')
+        parser.add_argument('--row-by-row', action='store_true',
+                            help='Use StudentResource (one save per row, as in the admin default) instead of the bulk mode.')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'No such file: {path}')
+        if path.suffix.lower() == '.xlsx':
+            dataset = XLSX().create_dataset(path.read_bytes())
+        elif path.suffix.lower() == '.csv':
+            # utf-8-sig: exports from the dashboard start with a BOM
+            dataset = CSV().create_dataset(path.read_text(encoding='utf-8-sig'))
+        else:
+            raise CommandError(f'Unsupported file type: {path.suffix or path.name} (expected .csv or .xlsx).')
+
+        resource = StudentResource() if options['row_by_row'] else StudentBulkResource()
+        started = time.perf_counter()
+        result = resource.import_data(dataset, dry_run=options['dry_run'], use_transactions=True)
+        elapsed = time.perf_counter() - started
+        if result.has_errors():
+            raise CommandError(f'Import failed: {result.base_errors or result.row_errors()[0]}')
+        if result.has_validation_errors():
+            invalid = result.invalid_rows[0]
+            raise CommandError(f'Row {invalid.number} is invalid: {invalid.error_dict}; nothing was imported.')
+
+        totals = result.totals
+        rate = len(dataset) / elapsed if elapsed else 0.0
+        verb = 'Checked' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(dataset)} rows in {elapsed:.1f} s ({rate:.0f} rows/s): {totals['new']} new, "
+            f"{totals['update']} updated, {totals['skip']} skipped."
+        ))
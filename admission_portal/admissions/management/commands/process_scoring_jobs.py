@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from admissions import jobs
+
+
+class Command(BaseCommand):
+    help = "Score queued registrations (ScoringJob rows) in batches through the batch model path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Jobs claimed per model call.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of polling.')
+        parser.add_argument('--stats', action='store_true', help='Print queue depth and job age, then exit.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self._write_stats()
+            return
+        batch_size = max(1, options['batch_size'])
+        total = 0
+        while True:
+            claimed = jobs.claim_jobs(batch_size)
+            if not claimed:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+            started = time.perf_counter()
+            done = jobs.process_jobs(claimed)
+            elapsed = time.perf_counter() - started
+            total += done
+            rate = done / elapsed if elapsed > 0 else 0.0
+            self.stdout.write(f'Scored {done}/{len(claimed)} jobs in {elapsed * 1000:.0f} ms ({rate:.0f} rows/s).')
+            self._write_stats()
+        self.stdout.write(self.style.SUCCESS(f'Queue drained; scored {total} jobs.'))
+
+    def _write_stats(self):
+        stats = jobs.queue_stats()
+        self.stdout.write(
+            f"Queue depth {stats['depth']} (pending {stats['pending']}, running {stats['running']}, "
+            f"failed {stats['failed']}); oldest pending job {stats['oldest_pending_age_seconds']:.1f}s old."
+        )
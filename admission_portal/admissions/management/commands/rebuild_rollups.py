@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from admissions import rollups
+from admissions.dashboard import bump_data_version
+
+
+class Command(BaseCommand):
+    help = "Recompute the EnrollmentRollup table from Student, or with --check report where it has drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the stored rollups with Student; exit with an error on mismatch.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['check']:
+            mismatches = rollups.inconsistencies()
+            for key, expected, stored in mismatches:
+                self.stdout.write(f'{key}: expected {expected}, stored {stored}')
+            if mismatches:
+                raise CommandError(f'{len(mismatches)} rollup keys are inconsistent; run rebuild_rollups.')
+            self.stdout.write(self.style.SUCCESS(f'Rollups consistent ({time.perf_counter() - started:.1f}s).'))
+            return
+
+        count = rollups.rebuild()
+        bump_data_version()
+        mismatches = rollups.inconsistencies()
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} rollup keys changed during the rebuild; run it again.')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} rollup rows ({time.perf_counter() - started:.1f}s).'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from admissions import model_registry
+
+
+class Command(BaseCommand):
+    help = "Register a model artifact in the versioned registry, activate a version, or list versions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='Model file (joblib pickle) to register.')
+        parser.add_argument('--model-version', help='Version label (default: sha256 prefix).')
+        parser.add_argument('--no-activate', action='store_true', help='Register without making it active.')
+        parser.add_argument('--activate', metavar='VERSION', help='Make an already registered version active.')
+        parser.add_argument('--list', action='store_true', help='List registered versions.')
+
+    def handle(self, *args, **options):
+        try:
+            if options['path']:
+                version = model_registry.register(
+                    options['path'], version=options['model_version'], activate=not options['no_activate']
+                )
+                state = 'registered' if options['no_activate'] else 'registered and activated'
+                self.stdout.write(self.style.SUCCESS(f'Model version {version} {state}.'))
+            elif options['activate']:
+                model_registry.activate(options['activate'])
+                self.stdout.write(self.style.SUCCESS(f"Model version {options['activate']} activated."))
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if options['list'] or not (options['path'] or options['activate']):
+            manifest = model_registry.read_manifest()
+            if not manifest['versions']:
+                self.stdout.write(f'No registered versions; serving {model_registry.LEGACY_MODEL_NAME}.')
+            for version, entry in sorted(manifest['versions'].items(), key=lambda item: item[1]['registered_at']):
+                marker = '*' if version == manifest.get('active') else ' '
+                self.stdout.write(f"{marker} {version}  {entry['sha256'][:12]}  {entry['registered_at']}  {entry['file']}")
+        self.stdout.write('Running workers pick up the active version within ADMISSIONS_MODEL_RELOAD_INTERVAL seconds.')
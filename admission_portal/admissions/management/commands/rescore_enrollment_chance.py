@@ -0,0 +1,117 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from admissions.models import Student
+from admissions import ml_utils, rollups
+from admissions.dashboard import bump_data_version
+
+
+def _score_chunk(chunk):
+    """Worker entry point: [(pk, raw_dict), ...] -> (model version, [(pk, probability or None), ...]).
+
+    The version is that of the model which scored the chunk: a worker can hot-reload
+    a newer artifact mid-run. Raises ml_utils.ScoringError when the model call fails.
+    """
+    pks = [pk for pk, _ in chunk]
+    model = ml_utils.require_model()
+    probabilities = ml_utils.predict_profiles_rf_batch([raw for _, raw in chunk], model=model)
+    return ml_utils.model_version_of(model), list(zip(pks, probabilities))
+
+
+class Command(BaseCommand):
+    help = "Recompute enrollment_chance for existing students with the current model (chunked, parallel)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=ml_utils.BATCH_CHUNK_SIZE,
+                            help='Students per database fetch and per model call.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Scoring processes; 1 scores in this process.')
+        parser.add_argument('--since-id', type=int, help='Only rescore students with id greater than this.')
+        parser.add_argument('--school-year', help='Only rescore students of this school year.')
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only rescore students not scored by the active model version.')
+        parser.add_argument('--dry-run', action='store_true', help='Score but do not write results.')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        workers = max(1, options['workers'])
+        dry = options['dry_run']
+
+        qs = Student.objects.order_by('pk').only(*ml_utils.PREPROCESSING_FIELDS)
+        if options['since_id'] is not None:
+            qs = qs.filter(pk__gt=options['since_id'])
+        if options['school_year']:
+            qs = qs.filter(school_year=options['school_year'])
+
+        # Load once in the parent so forked workers inherit the model instead of each loading it
+        model = ml_utils._load_model()
+        if model is None:
+            raise CommandError('Model could not be loaded; nothing was rescored.')
+        self.version = ml_utils.model_version_of(model)
+        if options['stale_only']:
+            qs = qs.exclude(model_version=self.version)
+        self.stdout.write(f'Scoring with model version {self.version}.')
+
+        chunks = (
+            [(s.pk, ml_utils._student_to_preprocessing_dict(s)) for s in chunk]
+            for chunk in ml_utils._chunked(qs.iterator(chunk_size=chunk_size), chunk_size)
+        )
+        self.started = time.perf_counter()
+        self.scored = self.failed = 0
+        try:
+            if workers == 1:
+                for chunk in chunks:
+                    self._write(*_score_chunk(chunk), dry)
+            else:
+                self._score_in_pool(chunks, workers, dry)
+        except ml_utils.ScoringError as exc:
+            # Chunks already written keep their new scores; the rest keep their old ones
+            raise CommandError(f'{exc}; aborted after {self.scored} rows.') from exc
+
+        elapsed = time.perf_counter() - self.started
+        rate = self.scored / elapsed if elapsed > 0 else 0.0
+        summary = f'{self.scored} students in {elapsed:.1f}s ({rate:.0f} rows/s).'
+        if self.failed:
+            summary += f' {self.failed} students failed preprocessing and were left unchanged.'
+        if dry:
+            self.stdout.write(self.style.WARNING(f'Dry run: scored {summary} No changes written.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Rescored {summary}'))
+
+    def _score_in_pool(self, chunks, workers, dry):
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            pending = set()
+            try:
+                for chunk in chunks:
+                    pending.add(pool.submit(_score_chunk, chunk))
+                    # Keep a bounded number of chunks in flight so memory stays flat
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._write(*future.result(), dry)
+                for future in pending:
+                    self._write(*future.result(), dry)
+            except ml_utils.ScoringError:
+                pool.shutdown(cancel_futures=True)
+                raise
+
+    def _write(self, version, results, dry):
+        # Rows that failed preprocessing keep their score and version, so --stale-only retries them
+        scored = [(pk, probability) for pk, probability in results if probability is not None]
+        self.failed += len(results) - len(scored)
+        if not dry and scored:
+            with rollups.track([pk for pk, _ in scored]):
+                Student.objects.bulk_update(
+                    [Student(pk=pk, enrollment_chance=probability * 100.0, model_version=version)
+                     for pk, probability in scored],
+                    ['enrollment_chance', 'model_version'],
+                    batch_size=500,
+                )
+            bump_data_version()
+        self.scored += len(scored)
+        elapsed = time.perf_counter() - self.started
+        rate = self.scored / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(f'{self.scored} rows scored ({rate:.0f} rows/s)')
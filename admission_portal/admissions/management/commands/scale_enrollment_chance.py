@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
 from admissions.models import Student
+from admissions import rollups
+from admissions.dashboard import bump_data_version
 
 class Command(BaseCommand):
     help = "Scale enrollment_chance values stored as probabilities (<=1) to percentages (0..100)."
@@ -19,15 +21,17 @@ class Command(BaseCommand):
             return
         self.stdout.write(f'Found {count} enrollment_chance values <= 1.0 to scale.')
         changed = 0
-        for s in to_scale.iterator():
-            old = s.enrollment_chance
-            new = old * 100.0
-            if verbose or dry:
-                self.stdout.write(f'ID {s.id}: {old:.6f} -> {new:.2f}{" (dry-run)" if dry else ""}')
-            if not dry:
-                Student.objects.filter(pk=s.pk).update(enrollment_chance=new)
-                changed += 1
+        with rollups.track([] if dry else to_scale.values_list('pk', flat=True)):
+            for s in to_scale.iterator():
+                old = s.enrollment_chance
+                new = old * 100.0
+                if verbose or dry:
+                    self.stdout.write(f'ID {s.id}: {old:.6f} -> {new:.2f}{" (dry-run)" if dry else ""}')
+                if not dry:
+                    Student.objects.filter(pk=s.pk).update(enrollment_chance=new)
+                    changed += 1
         if not dry:
+            bump_data_version()
             self.stdout.write(self.style.SUCCESS(f'Scaled {changed} rows.'))
         else:
             self.stdout.write(self.style.WARNING('Dry run complete; no changes written.'))
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+from admissions import dashboard
+
+
+class Command(BaseCommand):
+    help = "Compute the adminDash summary for the current data version and store it in the cache (run after deploys)."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        version = dashboard.data_version()
+        dashboard.summary_context()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Dashboard summary cached for data version {version} ({elapsed * 1000:.0f} ms)."))
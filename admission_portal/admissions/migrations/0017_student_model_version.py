@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0016_scoringjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='model_version',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
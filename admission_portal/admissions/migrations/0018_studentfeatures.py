@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0017_student_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentFeatures',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='admissions.student')),
+                ('schema_version', models.PositiveSmallIntegerField()),
+                ('fingerprint', models.CharField(max_length=32)),
+                ('features', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'student features',
+            },
+        ),
+    ]
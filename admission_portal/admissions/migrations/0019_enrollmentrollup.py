@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:54
+
+from django.db import migrations, models
+from django.db.models import BooleanField, Case, Count, Q, Sum, Value, When
+
+
+def populate_rollups(apps, schema_editor):
+    # Same GROUP BY as admissions.rollups.expected_rollups(), on the historical models
+    Student = apps.get_model('admissions', 'Student')
+    EnrollmentRollup = apps.get_model('admissions', 'EnrollmentRollup')
+    enrolled_q = Q(student_id__isnull=False) & ~Q(student_id__exact='')
+    rows = (
+        Student.objects.annotate(
+            enrolled=Case(When(enrolled_q, then=Value(True)), default=Value(False), output_field=BooleanField())
+        )
+        .values('school_year', 'school_term', 'program_first_choice', 'gender', 'enrolled')
+        .annotate(
+            count=Count('pk'),
+            chance_count=Count('enrollment_chance'),
+            chance_sum=Sum('enrollment_chance', default=0.0),
+            chance_below_40=Count('pk', filter=Q(enrollment_chance__lt=40)),
+            chance_40_70=Count('pk', filter=Q(enrollment_chance__gte=40, enrollment_chance__lt=70)),
+            chance_70_90=Count('pk', filter=Q(enrollment_chance__gte=70, enrollment_chance__lt=90)),
+            chance_90_up=Count('pk', filter=Q(enrollment_chance__gte=90)),
+        )
+        .order_by()
+    )
+    EnrollmentRollup.objects.bulk_create([EnrollmentRollup(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0018_studentfeatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_year', models.CharField(blank=True, max_length=10, null=True)),
+                ('school_term', models.CharField(blank=True, max_length=10, null=True)),
+                ('program_first_choice', models.CharField(blank=True, max_length=100, null=True)),
+                ('gender', models.CharField(blank=True, max_length=20, null=True)),
+                ('enrolled', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+                ('chance_count', models.IntegerField(default=0)),
+                ('chance_sum', models.FloatField(default=0.0)),
+                ('chance_below_40', models.IntegerField(default=0)),
+                ('chance_40_70', models.IntegerField(default=0)),
+                ('chance_70_90', models.IntegerField(default=0)),
+                ('chance_90_up', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school_year', 'school_term', 'program_first_choice', 'gender', 'enrolled'], name='admissions__school__db55af_idx')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
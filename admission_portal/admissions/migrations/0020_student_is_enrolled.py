@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+BACKFILL_BATCH = 2000
+
+
+def backfill_is_enrolled(apps, schema_editor):
+    # One UPDATE per id range, each committed on its own (atomic = False), so a large
+    # Student table is not locked for the whole backfill
+    Student = apps.get_model('admissions', 'Student')
+    last = Student.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    for start in range(0, last + 1, BACKFILL_BATCH):
+        (Student.objects.filter(pk__gte=start, pk__lt=start + BACKFILL_BATCH)
+         .exclude(student_id__isnull=True).exclude(student_id__exact='')
+         .update(is_enrolled=True))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('admissions', '0019_enrollmentrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='is_enrolled',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_is_enrolled, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['is_enrolled', 'school_year', 'school_term'], name='admissions__is_enro_a6762e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['program_first_choice'], name='admissions__program_201801_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['student_type'], name='admissions__student_88e205_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['enrollment_chance'], name='admissions__enrollm_a34e6e_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# The DDL is spelled out rather than imported from admissions.search: this migration must
+# keep doing what it did for databases that already ran it. search.ensure_search_index()
+# has its own copy (sqlite_index_statements) for re-creating the index after later migrations.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS admissions_student_search USING fts5("
+    "first_name, middle_name, last_name, full_name, student_id, email, mobile_number, "
+    "content='admissions_student', content_rowid='id', tokenize=\"unicode61 remove_diacritics 2 tokenchars '-_'\", "
+    "prefix='2 3 4 5 6', detail=column, columnsize=0)",
+    "CREATE TRIGGER IF NOT EXISTS admissions_student_search_ai AFTER INSERT ON admissions_student BEGIN "
+    "INSERT INTO admissions_student_search(rowid, first_name, middle_name, last_name, full_name, student_id, email, mobile_number) "
+    "VALUES (new.id, new.first_name, new.middle_name, new.last_name, new.full_name, new.student_id, new.email, new.mobile_number); END",
+    "CREATE TRIGGER IF NOT EXISTS admissions_student_search_ad AFTER DELETE ON admissions_student BEGIN "
+    "INSERT INTO admissions_student_search(admissions_student_search, rowid, first_name, middle_name, last_name, full_name, student_id, email, mobile_number) "
+    "VALUES ('delete', old.id, old.first_name, old.middle_name, old.last_name, old.full_name, old.student_id, old.email, old.mobile_number); END",
+    "CREATE TRIGGER IF NOT EXISTS admissions_student_search_au AFTER UPDATE OF "
+    "first_name, middle_name, last_name, full_name, student_id, email, mobile_number ON admissions_student BEGIN "
+    "INSERT INTO admissions_student_search(admissions_student_search, rowid, first_name, middle_name, last_name, full_name, student_id, email, mobile_number) "
+    "VALUES ('delete', old.id, old.first_name, old.middle_name, old.last_name, old.full_name, old.student_id, old.email, old.mobile_number); "
+    "INSERT INTO admissions_student_search(rowid, first_name, middle_name, last_name, full_name, student_id, email, mobile_number) "
+    "VALUES (new.id, new.first_name, new.middle_name, new.last_name, new.full_name, new.student_id, new.email, new.mobile_number); END",
+    "INSERT INTO admissions_student_search(admissions_student_search) VALUES ('rebuild')",
+]
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX admissions_student_search_trgm ON admissions_student USING gin ((UPPER("
+    "COALESCE(\"admissions_student\".\"first_name\", '') || ' ' || COALESCE(\"admissions_student\".\"middle_name\", '') || ' ' || "
+    "COALESCE(\"admissions_student\".\"last_name\", '') || ' ' || COALESCE(\"admissions_student\".\"full_name\", '') || ' ' || "
+    "COALESCE(\"admissions_student\".\"student_id\", '') || ' ' || COALESCE(\"admissions_student\".\"email\", '') || ' ' || "
+    "COALESCE(\"admissions_student\".\"mobile_number\", ''))) gin_trgm_ops)",
+    "CREATE INDEX admissions_student_id_trgm ON admissions_student "
+    "USING gin ((UPPER(COALESCE(student_id, ''))) gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS admissions_student_id_trgm",
+    "DROP INDEX IF EXISTS admissions_student_search_trgm",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS admissions_student_search_au",
+    "DROP TRIGGER IF EXISTS admissions_student_search_ad",
+    "DROP TRIGGER IF EXISTS admissions_student_search_ai",
+    "DROP TABLE IF EXISTS admissions_student_search",
+]
+
+
+def forward(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        statements = SQLITE_FORWARD
+    elif vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def backward(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('admissions', '0020_student_is_enrolled'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, backward),
+    ]
@@ -1,17 +1,38 @@
 import pandas as pd
 import joblib
 import os
+import hashlib
 import logging
+import math
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from django.conf import settings
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, Iterable, List
 from .models import Student
-from .preprocessing import preprocess_student_data
+from .preprocessing import preprocess_student_data, preprocess_student_data_batch
+from .forest import compile_forest
+from .feature_store import sync_features
+from . import model_registry, timing
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 _model = None
 _model_load_error = None
+_model_version: str | None = None  # registry version (or sha256 prefix) of the loaded artifact
+_model_stamp: tuple | None = None  # (path, mtime_ns, size) of the loaded artifact
+_model_versions = weakref.WeakKeyDictionary()  # loaded model object -> its version
+_model_lock = threading.Lock()
+_next_check_at = 0.0  # monotonic time of the next hot-reload check
+_next_retry_at = 0.0  # monotonic time before which a failed load is not retried
+_retry_delay = 0.0
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 300.0
+_flat_forest = None  # (model, FlatForest | None) compiled for the loaded model
+_alignment_plan = None  # (model, AlignmentPlan) computed for the loaded model
 _last_prediction_error: Exception | None = None
 
 """NOTE: Old REQUIRED_FEATURE_ORDER kept for reference; superseded by training model columns.
@@ -21,6 +42,28 @@ We will align to whatever columns the loaded model expects (if it has feature_na
 
 REQUIRED_FEATURE_ORDER = []  # Deprecated path; kept to avoid breaking imports elsewhere
 
+# Engineered columns that must reach the model as numbers (avoid strings like 'N/A' or '2nd')
+NUMERIC_COLUMNS = [
+    'School Year','School Term','Age at Enrollment','Requirement Agreement','Disability','Indigenous',
+    'second_choice_missing','same_faculty','valid_second_choice','second_choice_other','diff_faculty',
+    'is_transferee','is_other_entry','entry_level_freq','gender_binary','student_type_binary','school_type_binary'
+]
+
+# Default number of students scored per predict_proba call on the batch path
+BATCH_CHUNK_SIZE = 2000
+
+
+class ScoringError(RuntimeError):
+    """A prediction could not be made: no model, rejected data or a failed model call."""
+
+# Student fields read by _student_to_preprocessing_dict (use with .only() on bulk paths)
+PREPROCESSING_FIELDS = (
+    'school_year', 'school_term', 'program_first_choice', 'program_second_choice', 'entry_level',
+    'age_at_enrollment', 'birth_date', 'gender', 'civil_status', 'religion', 'permanent_province',
+    'permanent_city', 'birth_province', 'birth_place', 'birth_city', 'disability', 'indigenous',
+    'requirement_agreement', 'student_type', 'school_type', 'permanent_region', 'permanent_country',
+)
+
 
 def _student_to_preprocessing_dict(student: Student) -> dict:
     """Map a Student instance into the raw dict expected by preprocess_student_data.
@@ -76,20 +119,124 @@ def _student_to_preprocessing_dict(student: Student) -> dict:
         "Permanent Country": student.permanent_country or "N/A",
     }
 
+def _resident_set_bytes() -> int | None:
+    """Current resident set size of this process, when the platform exposes it."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, KB on Linux
+    except Exception:
+        return None
+
+
 def _load_model():
-    global _model, _model_load_error
-    if _model is not None or _model_load_error is not None:
+    """The active model, loaded lazily and hot-swapped when the registry artifact changes.
+
+    Every ADMISSIONS_MODEL_RELOAD_INTERVAL seconds one caller stats the active artifact;
+    a changed path/mtime/size triggers a reload while other threads keep serving the
+    current model. Failed loads are retried with exponential backoff instead of being
+    cached for the life of the process.
+    """
+    now = time.monotonic()
+    if _model is not None and now < _next_check_at:
         return _model
+    if _model is None and _model_load_error is not None and now < _next_retry_at:
+        return None
+    # Double-checked: threads racing on a cold worker must not each load their own copy
+    with _model_lock:
+        return _refresh_model_locked(force=False)
+
+
+def reload_model():
+    """Check the registry now and swap in the active artifact if it changed."""
+    with _model_lock:
+        return _refresh_model_locked(force=True)
+
+
+def _refresh_model_locked(force: bool):
+    global _model, _model_load_error, _model_version, _model_stamp
+    global _next_check_at, _next_retry_at, _retry_delay
+    now = time.monotonic()
+    if not force:
+        if _model is not None and now < _next_check_at:
+            return _model
+        if _model is None and _model_load_error is not None and now < _next_retry_at:
+            return None
+    interval = getattr(settings, 'ADMISSIONS_MODEL_RELOAD_INTERVAL', 30)
+    _next_check_at = float('inf') if interval is None else now + interval
     try:
-        path = os.path.join(settings.BASE_DIR, 'admissions', 'resources', 'rf_ucModel.pkl')
-        _model = joblib.load(path)
-        logger.info("Loaded RF model from %s", path)
+        artifact = model_registry.active_artifact()
+        stamp = artifact.stamp()
+        if _model is not None and stamp == _model_stamp:
+            return _model
+        # mmap_mode='r' maps the forest's node arrays from the page cache, so workers
+        # loading the same (uncompressed) artifact share one physical copy
+        mmap_mode = 'r' if getattr(settings, 'ADMISSIONS_MODEL_MMAP', False) else None
+        rss_before = _resident_set_bytes()
+        started = time.perf_counter()
+        checksum = model_registry.file_checksum(artifact.path)
+        if artifact.sha256 and checksum != artifact.sha256:
+            raise ValueError(f"Checksum mismatch for {artifact.path} (registry {artifact.sha256[:12]}, file {checksum[:12]})")
+        model = joblib.load(artifact.path, mmap_mode=mmap_mode)
     except Exception as exc:
         _model_load_error = exc
-        _model = None
-        logger.error("Failed to load RF model: %s", exc)
+        _retry_delay = min(max(_retry_delay * 2, RETRY_BASE_SECONDS), RETRY_MAX_SECONDS)
+        _next_retry_at = now + _retry_delay
+        if _model is not None:
+            logger.error("Failed to reload RF model, keeping version %s; retry in %.0fs: %s", _model_version, _retry_delay, exc)
+            _next_check_at = _next_retry_at
+        else:
+            logger.error("Failed to load RF model; retry in %.0fs: %s", _retry_delay, exc)
+        return _model
+
+    previous_version = _model_version
+    _model_versions[model] = artifact.version or checksum[:12]
+    _model, _model_version, _model_stamp = model, _model_versions[model], stamp
+    _model_load_error = None
+    _retry_delay = 0.0
+    _prediction_cache.clear()
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    rss_after = _resident_set_bytes()
+    swapped = f" (replacing {previous_version})" if previous_version and previous_version != _model_version else ""
+    if rss_before is not None and rss_after is not None:
+        logger.info(
+            "Loaded RF model %s%s from %s in %.1f ms (mmap=%s); resident %.1f MB (+%.1f MB)",
+            _model_version, swapped, artifact.path, elapsed_ms, mmap_mode or 'off',
+            rss_after / 2**20, (rss_after - rss_before) / 2**20,
+        )
+    else:
+        logger.info("Loaded RF model %s%s from %s in %.1f ms (mmap=%s)",
+                    _model_version, swapped, artifact.path, elapsed_ms, mmap_mode or 'off')
     return _model
 
+
+def warm_up_model():
+    """Load the model eagerly (AppConfig.ready) instead of on the first registration."""
+    return _load_model()
+
+
+def current_model_version() -> str | None:
+    """Version of the model currently serving predictions."""
+    return model_version_of(_load_model())
+
+
+def model_version_of(model) -> str | None:
+    """Version of a model object returned by _load_model (stamped onto the rows it scored).
+
+    Scorers stamp this rather than current_model_version(), which may already
+    name an artifact hot-swapped in after their prediction.
+    """
+    if model is None:
+        return None
+    try:
+        return _model_versions.get(model)
+    except TypeError:  # not weak-referenceable, so not loaded from the registry
+        return None
+
 def capitalize_contents(data: Any) -> Any:
     """Recursively uppercase all string leaves in dict/list structures."""
     if isinstance(data, dict):
@@ -100,6 +247,256 @@ def capitalize_contents(data: Any) -> Any:
         return data.upper()
     return data
 
+class PredictionCache:
+    """Bounded LRU of positive-class probabilities keyed by feature fingerprint.
+
+    Bound to one model object: handing it a different model (reload / hot swap)
+    empties it, so entries never outlive the model that produced them.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.model = None
+        self._data: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def bind(self, model) -> None:
+        if self.model is not model:
+            with self._lock:
+                self._data.clear()
+                self.model = model
+
+    def get(self, key: str) -> float | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: float) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'model_version': _model_version,
+            }
+
+
+_prediction_cache = PredictionCache(maxsize=0)
+
+
+def _get_prediction_cache(model) -> PredictionCache | None:
+    """The shared cache bound to `model`, or None when ADMISSIONS_PREDICTION_CACHE_SIZE is 0."""
+    maxsize = getattr(settings, 'ADMISSIONS_PREDICTION_CACHE_SIZE', 0)
+    if maxsize <= 0:
+        return None
+    _prediction_cache.maxsize = maxsize
+    _prediction_cache.bind(model)
+    return _prediction_cache
+
+
+def prediction_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of the prediction cache (for logs and debugging)."""
+    return _prediction_cache.stats()
+
+
+def _model_columns(model) -> List[str] | None:
+    """Training column order: feature_names_in_ of the model or of its 'rf' step."""
+    if hasattr(model, 'feature_names_in_'):
+        return list(model.feature_names_in_)
+    inner = getattr(model, 'named_steps', {}).get('rf') if hasattr(model, 'named_steps') else None
+    if inner is not None and hasattr(inner, 'feature_names_in_'):
+        return list(inner.feature_names_in_)
+    return None
+
+
+def _cache_value(column: str, value):
+    """Canonical form of one aligned cell: numeric columns as floats, missing as None."""
+    if column in NUMERIC_COLUMNS:
+        if value is None or value in ('N/A', 'NA', ''):
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if math.isnan(value) else value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _feature_fingerprint(engineered: Dict[str, Any], columns: List[str] | None) -> str:
+    """Stable hash of the model-aligned feature row plus the model version."""
+    if columns is None:
+        columns = sorted(engineered)
+    row = tuple(_cache_value(c, engineered.get(c)) for c in columns)
+    digest = hashlib.blake2b(repr(row).encode('utf-8'), digest_size=16).hexdigest()
+    return f"{_model_version}:{digest}"
+
+
+def _coerce_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce NUMERIC_COLUMNS in place, one vectorized pass per column."""
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col].replace(['N/A','NA','', None], np.nan), errors='coerce')
+    return df
+
+
+def _build_feature_frame(engineered_rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Engineered dicts -> numeric-coerced DataFrame.
+
+    dtype=object keeps a missing categorical as None whether the frame has one row or
+    many (pandas would otherwise turn None into NaN in multi-row string columns, which
+    the encoders treat as a different category).
+    """
+    return _coerce_numeric_columns(pd.DataFrame(engineered_rows, dtype=object))
+
+
+def _align_to_model(df: pd.DataFrame, model) -> pd.DataFrame:
+    """Reindex to the model's training columns (feature_names_in_), filling missing with NaN."""
+    try:
+        needed_cols = _model_columns(model)
+        if needed_cols is not None:
+            df = df.reindex(columns=needed_cols, fill_value=np.nan)
+    except Exception as exc:
+        logger.warning("Could not align columns to model schema: %s", exc)
+    return df
+
+
+def _to_float(value) -> float:
+    """Scalar twin of _coerce_numeric_columns: 'N/A'/''/None and unparsable values -> NaN."""
+    if value is None or (isinstance(value, str) and value in ('N/A', 'NA', '')):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class AlignmentPlan:
+    """How engineered rows map onto one model's input, computed once per loaded model.
+
+    Holds the training column order, the dtype of every column (float64 for
+    NUMERIC_COLUMNS, object for categoricals) and the fill value for columns a row
+    does not provide. frame() writes rows straight into preallocated typed arrays,
+    replacing the DataFrame-from-dicts + replace/to_numeric + reindex sequence; the
+    result equals _align_to_model(_build_feature_frame(rows), model).
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        self.dtypes = {c: (np.float64 if c in NUMERIC_COLUMNS else object) for c in self.columns}
+        self.fill_values = {c: np.nan for c in self.columns}
+        self._numeric = [(c, self.dtypes[c] is np.float64) for c in self.columns]
+
+    def frame(self, engineered_rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        n = len(engineered_rows)
+        data = {}
+        for column, numeric in self._numeric:
+            fill = self.fill_values[column]
+            if numeric:
+                data[column] = np.fromiter(
+                    (_to_float(row.get(column, fill)) for row in engineered_rows), dtype=np.float64, count=n
+                )
+            else:
+                values = np.empty(n, dtype=object)
+                values[:] = [row.get(column, fill) for row in engineered_rows]
+                # Explicit object Series: pandas would otherwise infer str and turn None into NaN
+                data[column] = pd.Series(values, dtype=object, copy=False)
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'columns': [
+                {'name': c, 'dtype': np.dtype(self.dtypes[c]).name, 'fill': None if self.fill_values[c] is np.nan else self.fill_values[c]}
+                for c in self.columns
+            ],
+            'numeric': [c for c, numeric in self._numeric if numeric],
+        }
+
+
+def _get_alignment_plan(model) -> AlignmentPlan | None:
+    """AlignmentPlan for this model (computed once), or None if it exposes no column names."""
+    global _alignment_plan
+    cached = _alignment_plan
+    if cached is None or cached[0] is not model:
+        columns = _model_columns(model)
+        cached = (model, AlignmentPlan(columns) if columns is not None else None)
+        _alignment_plan = cached
+    return cached[1]
+
+
+def get_alignment_plan() -> Dict[str, Any] | None:
+    """The active model's alignment plan as plain data (for debugging)."""
+    model = _load_model()
+    plan = _get_alignment_plan(model) if model is not None else None
+    return plan.describe() if plan is not None else None
+
+
+def _feature_frame_for(model, engineered_rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Model-aligned, typed feature frame; planned when the model exposes its columns."""
+    plan = _get_alignment_plan(model)
+    if plan is not None:
+        return plan.frame(engineered_rows)
+    return _align_to_model(_build_feature_frame(engineered_rows), model)
+
+
+def _positive_class_index(model, n_columns: int) -> int:
+    """Column of predict_proba holding the positive ('enrolled') class."""
+    if hasattr(model, 'classes_'):
+        classes = list(model.classes_)
+        # Attempt to find index of class 1 or 'ENROLLED'
+        for candidate in [1, 'ENROLLED', 'Yes', 'TRUE', True]:
+            if candidate in classes:
+                return classes.index(candidate)
+        # fallback: last column
+        return len(classes) - 1
+    return 1 if n_columns > 1 else 0
+
+
+def _predict_positive_proba(model, df: pd.DataFrame) -> np.ndarray:
+    """Positive-class probability for every row of an aligned feature frame."""
+    if hasattr(model, 'predict_proba'):
+        proba_arr = model.predict_proba(df)
+        return proba_arr[:, _positive_class_index(model, proba_arr.shape[1])].astype(float)
+    pred = np.asarray(model.predict(df)).astype(int)
+    # Fallback probability heuristic
+    return np.where(pred == 1, 0.7, 0.3)
+
+
+def _get_flat_forest(model):
+    """FlatForest for this model (compiled once), or None if unsupported or disabled."""
+    global _flat_forest
+    if not getattr(settings, 'ADMISSIONS_FLAT_FOREST', True):
+        return None
+    cached = _flat_forest
+    if cached is None or cached[0] is not model:
+        cached = (model, compile_forest(model, NUMERIC_COLUMNS))
+        _flat_forest = cached
+    return cached[1]
+
+
 def predict_student_rf(student_or_profile: Dict[str, Any] | Student) -> Dict[str, Any]:
     """Predict class and probability for either:
     1. A Django Student instance (preferred path), or
@@ -109,94 +506,244 @@ def predict_student_rf(student_or_profile: Dict[str, Any] | Student) -> Dict[str
       * Build raw student dictionary -> preprocess_student_data -> engineered feature dict
       * Align columns to model expectations (feature_names_in_ if present) filling missing with NaN
       * Predict probability of positive class (assumed class '1' or second column index)
+
+    "ModelVersion" is the version of the model that made the prediction. There is no
+    fallback probability: ScoringError is raised when the model is missing, the data
+    fails preprocessing or the model call fails.
+
+    Stage latencies are recorded by admissions.timing when ADMISSIONS_STAGE_TIMING is on.
     """
-    model = _load_model()
-    if model is None:
-        return {"Prediction": 0, "Probability": 0.5}
+    clock = timing.clock('predict_student_rf')
+    try:
+        model, pos_proba = _predict_student_rf(student_or_profile, clock)
+    finally:
+        clock.finish()
+    return {"Prediction": int(pos_proba >= 0.5), "Probability": pos_proba, "ModelVersion": model_version_of(model)}
+
+
+def _predict_student_rf(student_or_profile: Dict[str, Any] | Student, clock) -> tuple:
+    """(model, positive-class probability); raises ScoringError."""
+    model = require_model()
+    clock.lap('load_model')
 
     # Step 1: derive raw student dict appropriate for preprocessing
     if isinstance(student_or_profile, Student):
         raw_dict = _student_to_preprocessing_dict(student_or_profile)
     else:
         raw_dict = student_or_profile
+    clock.lap('raw_dict')
 
-    # Step 2: preprocess to engineered features
+    # Step 2: preprocess to engineered features (stored ones for saved students)
     try:
-        engineered = preprocess_student_data(raw_dict)
+        if isinstance(student_or_profile, Student) and student_or_profile.pk is not None and feature_store_enabled():
+            engineered = sync_features([student_or_profile], [raw_dict])[0][0]
+            if engineered is None:
+                raise ValueError("preprocessing rejected the student's data")
+        else:
+            engineered = preprocess_student_data(raw_dict)
     except Exception as exc:
-        logger.exception("Preprocessing failed; fallback: %s", exc)
-        return {"Prediction": 0, "Probability": 0.5}
-
-    # Step 3: Build DataFrame
-    df = pd.DataFrame([engineered])
-
-    # Step 3b: Coerce numeric columns (avoid strings like 'N/A' or '2nd')
-    numeric_cols = [
-        'School Year','School Term','Age at Enrollment','Requirement Agreement','Disability','Indigenous',
-        'second_choice_missing','same_faculty','valid_second_choice','second_choice_other','diff_faculty',
-        'is_transferee','is_other_entry','entry_level_freq','gender_binary','student_type_binary','school_type_binary'
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = (
-                df[col]
-                .replace(['N/A','NA','', None], np.nan)
-                .apply(lambda v: pd.to_numeric(v, errors='coerce'))
-            )
+        raise ScoringError(f"Preprocessing failed: {exc}") from exc
+    clock.lap('preprocess')
+
+    # Step 3: Identical engineered rows (after grouping/binning) share one cached result
+    cache = _get_prediction_cache(model)
+    cache_key = None
+    if cache is not None:
+        plan = _get_alignment_plan(model)
+        cache_key = _feature_fingerprint(engineered, plan.columns if plan is not None else None)
+        cached = cache.get(cache_key)
+        clock.lap('cache_lookup')
+        if cached is not None:
+            return model, cached
+
+    # Step 3b: Fast path - evaluate the packed forest arrays directly, no DataFrame
+    flat = _get_flat_forest(model)
+    if flat is not None:
+        try:
+            proba_arr = flat.predict_proba_records([engineered])
+            pos_proba = float(proba_arr[0, _positive_class_index(model, proba_arr.shape[1])])
+            if cache_key is not None:
+                cache.put(cache_key, pos_proba)
+            clock.lap('flat_forest')
+            return model, pos_proba
+        except Exception as exc:
+            logger.debug("Flat forest could not score row, using sklearn: %s", exc)
+
+    # Step 4: Build the typed, model-aligned DataFrame
+    df = _feature_frame_for(model, [engineered])
+    clock.lap('build_frame')
 
-    # Step 4: Align to model columns if available
+    # Step 5: Predict
+    global _last_prediction_error
     try:
-        if hasattr(model, 'feature_names_in_'):
-            needed_cols = list(model.feature_names_in_)
-            df = df.reindex(columns=needed_cols, fill_value=np.nan)
-        else:
-            # If model is a pipeline, attempt to access underlying estimator
-            inner = getattr(model, 'named_steps', {}).get('rf') if hasattr(model, 'named_steps') else None
-            if inner is not None and hasattr(inner, 'feature_names_in_'):
-                needed_cols = list(inner.feature_names_in_)
-                df = df.reindex(columns=needed_cols, fill_value=np.nan)
+        pos_proba = float(_predict_positive_proba(model, df)[0])
     except Exception as exc:
-        logger.warning("Could not align columns to model schema: %s", exc)
+        _last_prediction_error = exc
+        raise ScoringError(f"Prediction failed: {exc}") from exc
+    clock.lap('predict_proba')
+    if cache_key is not None:
+        cache.put(cache_key, pos_proba)
+    return model, pos_proba
+
+
+def _chunked(iterable: Iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def predict_profiles_rf_batch(raw_dicts: List[Dict[str, Any]], model=None) -> List[float | None]:
+    """Positive-class probabilities for a list of raw preprocessing dicts, in input order.
+
+    Same pipeline as predict_student_rf, but the whole list becomes one feature matrix:
+    preprocessing runs column-wise (preprocess_student_data_batch), column alignment
+    runs once and the model is called once.
+    There is no fallback probability, so callers never store 0.5 as a score: rows
+    that fail preprocessing are None, and ScoringError is raised when the model is
+    missing or its call fails. `model` (from require_model) pins the model used.
+    """
+    if not raw_dicts:
+        return []
+    if model is None:
+        model = require_model()
+    features, errors = preprocess_student_data_batch(raw_dicts)
+    return _predict_engineered_batch(
+        model, [None if failed else row for row, failed in zip(features.to_dict('records'), errors)]
+    )
+
+
+def require_model():
+    """The active model, or ScoringError; pass it on so model_version_of() names what scored."""
+    model = _load_model()
+    if model is None:
+        raise ScoringError("Model could not be loaded")
+    return model
+
+
+def _predict_engineered_batch(model, engineered_list: List[Dict[str, Any] | None]) -> List[float | None]:
+    """Batch probabilities for engineered rows (None: preprocessing failed -> None)."""
+    probabilities = [None] * len(engineered_list)
+    cache = _get_prediction_cache(model)
+    plan = _get_alignment_plan(model)
+    columns = plan.columns if plan is not None else None
+    engineered_rows = []
+    positions = []
+    keys = []
+    for i, engineered in enumerate(engineered_list):
+        if engineered is None:
+            logger.warning("Preprocessing failed for batch row %s; not scored", i)
+            continue
+        if cache is not None:
+            key = _feature_fingerprint(engineered, columns)
+            cached = cache.get(key)
+            if cached is not None:
+                probabilities[i] = cached
+                continue
+            keys.append(key)
+        engineered_rows.append(engineered)
+        positions.append(i)
+    if not engineered_rows:
+        return probabilities
+
+    df = _feature_frame_for(model, engineered_rows)
 
-    # Step 5: Predict
     global _last_prediction_error
     try:
-        if hasattr(model, 'predict_proba'):
-            proba_arr = model.predict_proba(df)
-            # Assume positive class is the one with greater label value (common for 0/1)
-            if hasattr(model, 'classes_'):
-                classes = list(model.classes_)
-                # Attempt to find index of class 1 or 'ENROLLED'
-                pos_idx = None
-                for candidate in [1, 'ENROLLED', 'Yes', 'TRUE', True]:
-                    if candidate in classes:
-                        pos_idx = classes.index(candidate)
-                        break
-                if pos_idx is None:
-                    # fallback: last column
-                    pos_idx = len(classes) - 1
-            else:
-                pos_idx = 1 if proba_arr.shape[1] > 1 else 0
-            pos_proba = float(proba_arr[0][pos_idx])
-            pred_class = int(pos_proba >= 0.5)
-            return {"Prediction": pred_class, "Probability": pos_proba}
-        else:
-            pred = model.predict(df)[0]
-            # Fallback probability heuristic
-            prob = 0.7 if int(pred) == 1 else 0.3
-            return {"Prediction": int(pred), "Probability": prob}
+        pos_proba = _predict_positive_proba(model, df)
     except Exception as exc:
         _last_prediction_error = exc
-        logger.exception("Prediction failed; returning fallback: %s", exc)
-        return {"Prediction": 0, "Probability": 0.5}
+        raise ScoringError(f"Batch prediction failed for {len(df)} rows: {exc}") from exc
+    for i, proba in zip(positions, pos_proba):
+        probabilities[i] = float(proba)
+    if cache is not None:
+        for key, proba in zip(keys, pos_proba):
+            cache.put(key, float(proba))
+    return probabilities
+
+
+def predict_students_rf_batch(students: Iterable[Student], chunk_size: int = BATCH_CHUNK_SIZE,
+                              model=None) -> Dict[int, float | None]:
+    """Score a queryset (or any iterable) of Students; returns {pk: probability}.
 
-def compute_and_save_enrollment_chance(student: Student) -> float:
-    """Compute enrollment probability using new preprocessing pipeline and persist percentage."""
+    Querysets are streamed with iterator(chunk_size=...) and each chunk is scored
+    with a single predict_proba call through predict_profiles_rf_batch. Probabilities
+    are 0..1, identical to predict_student_rf(student)["Probability"]; a student whose
+    data fails preprocessing maps to None, and ScoringError is raised as in
+    predict_profiles_rf_batch. All chunks are scored by one model (`model`, or the
+    active one when the first chunk is scored) even if a reload happens meanwhile.
+    """
+    if hasattr(students, 'iterator'):
+        students = students.iterator(chunk_size=chunk_size)
+    results: Dict[int, float] = {}
+    for chunk in _chunked(students, chunk_size):
+        if model is None:
+            model = require_model()
+        raw_dicts = [_student_to_preprocessing_dict(s) for s in chunk]
+        if feature_store_enabled() and all(s.pk is not None for s in chunk):
+            probabilities = _predict_engineered_batch(model, sync_features(chunk, raw_dicts)[0])
+        else:
+            probabilities = predict_profiles_rf_batch(raw_dicts, model=model)
+        results.update(zip((s.pk for s in chunk), probabilities))
+    return results
+
+
+def feature_store_enabled() -> bool:
+    return getattr(settings, 'ADMISSIONS_FEATURE_STORE', True)
+
+
+def student_features(students: List[Student], force: bool = False):
+    """(features, counts) for saved students via the StudentFeatures store (see feature_store)."""
+    return sync_features(students, [_student_to_preprocessing_dict(s) for s in students], force=force)
+
+
+def score_student(student: Student) -> float | None:
+    """Set student.enrollment_chance (percentage) and model_version without saving; returns the chance.
+    Works on unsaved students, so a registration can be inserted with its score.
+    A student that cannot be scored is left as it was and None is returned, so
+    `rescore_enrollment_chance --stale-only` picks it up later.
+    """
+    try:
+        result = predict_student_rf(student)
+    except ScoringError as exc:
+        logger.warning("Student %s left unscored: %s", student.pk, exc)
+        return None
+    student.enrollment_chance, student.model_version = result["Probability"] * 100.0, result["ModelVersion"]
+    return student.enrollment_chance
+
+
+def score_students(students: List[Student]) -> None:
+    """score_student for a list of (unsaved) students with one predict_proba call.
+
+    Students that cannot be scored keep enrollment_chance and model_version None
+    (so `rescore_enrollment_chance --stale-only` picks them up) instead of getting
+    the fallback probability.
+    """
+    try:
+        model = require_model()
+        probabilities = predict_profiles_rf_batch([_student_to_preprocessing_dict(s) for s in students], model=model)
+    except ScoringError as exc:
+        logger.warning("%s students left unscored: %s", len(students), exc)
+        return
+    version = model_version_of(model)
+    for student, probability in zip(students, probabilities):
+        if probability is not None:
+            student.enrollment_chance, student.model_version = float(probability) * 100.0, version
+
+
+def compute_and_save_enrollment_chance(student: Student) -> float | None:
+    """Compute enrollment probability using new preprocessing pipeline and persist percentage.
+    Returns None (and saves nothing) when the student could not be scored.
+    """
+    clock = timing.clock('compute_and_save_enrollment_chance')
     try:
-        pred_dict = predict_student_rf(student)
-        student.enrollment_chance = float(pred_dict["Probability"]) * 100.0
-        student.save(update_fields=["enrollment_chance"])
+        if score_student(student) is None:
+            return None
+        clock.lap('predict')
+        student.save(update_fields=["enrollment_chance", "model_version"])
+        clock.lap('save')
         return student.enrollment_chance
     except Exception as exc:
         logger.exception("Failed to compute enrollment chance for student %s: %s", student.id, exc)
-        return student.enrollment_chance if student.enrollment_chance is not None else 50.0
+        return None
+    finally:
+        clock.finish()
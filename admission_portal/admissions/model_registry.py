@@ -0,0 +1,110 @@
+"""
+Versioned model artifacts for enrollment scoring.
+
+Artifacts live under ADMISSIONS_MODEL_DIR (default admissions/resources) as
+models/rf_ucModel-<version>.pkl, described by registry.json:
+
+    {"active": "2025-t1",
+     "versions": {"2025-t1": {"file": "models/rf_ucModel-2025-t1.pkl",
+                              "sha256": "...", "registered_at": "..."}}}
+
+Without a registry.json the legacy rf_ucModel.pkl is used and its version is the
+first 12 hex digits of its sha256. ml_utils polls the active artifact's mtime and
+hot-swaps the in-memory model when it changes (see `manage.py register_model`).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+MANIFEST_NAME = 'registry.json'
+LEGACY_MODEL_NAME = 'rf_ucModel.pkl'
+
+
+@dataclass(frozen=True)
+class Artifact:
+    path: Path
+    version: str | None  # None for the legacy file: derived from its checksum at load
+    sha256: str | None
+
+    def stamp(self) -> tuple:
+        """Cheap change detector (no file read): path, mtime and size."""
+        st = self.path.stat()
+        return (str(self.path), st.st_mtime_ns, st.st_size)
+
+
+def model_dir() -> Path:
+    return Path(getattr(settings, 'ADMISSIONS_MODEL_DIR', None)
+                or Path(settings.BASE_DIR) / 'admissions' / 'resources')
+
+
+def file_checksum(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest() -> dict:
+    path = model_dir() / MANIFEST_NAME
+    if not path.exists():
+        return {'active': None, 'versions': {}}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _write_manifest(manifest: dict) -> None:
+    path = model_dir() / MANIFEST_NAME
+    tmp = path.with_suffix('.json.tmp')
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    # Atomic swap: workers polling the manifest never see a half-written file
+    os.replace(tmp, path)
+
+
+def active_artifact() -> Artifact:
+    """The artifact workers should serve right now."""
+    manifest = read_manifest()
+    active = manifest.get('active')
+    if active:
+        entry = manifest['versions'][active]
+        return Artifact(model_dir() / entry['file'], active, entry['sha256'])
+    return Artifact(model_dir() / LEGACY_MODEL_NAME, None, None)
+
+
+def register(source, version: str | None = None, activate: bool = True) -> str:
+    """Copy a model file into the registry under `version` (default: checksum prefix)."""
+    source = Path(source)
+    checksum = file_checksum(source)
+    version = version or checksum[:12]
+    manifest = read_manifest()
+    if version in manifest['versions'] and manifest['versions'][version]['sha256'] != checksum:
+        raise ValueError(f"Version {version!r} is already registered with a different checksum")
+    relative = Path('models') / f"rf_ucModel-{version}.pkl"
+    target = model_dir() / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix('.pkl.tmp')
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+    manifest['versions'][version] = {
+        'file': relative.as_posix(),
+        'sha256': checksum,
+        'registered_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    if activate:
+        manifest['active'] = version
+    _write_manifest(manifest)
+    return version
+
+
+def activate(version: str) -> None:
+    manifest = read_manifest()
+    if version not in manifest['versions']:
+        raise ValueError(f"Unknown model version {version!r}")
+    manifest['active'] = version
+    _write_manifest(manifest)
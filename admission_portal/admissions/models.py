@@ -53,6 +53,8 @@ class Student(models.Model):
 
     # Student Info
     student_id = models.CharField(max_length=20, blank=True, null=True)
+    # bool(student_id), stored so enrollment filters can use an index; maintained by save()
+    is_enrolled = models.BooleanField(default=False)
     disability = models.CharField(max_length=100, blank=True, null=True)
     indigenous = models.CharField(max_length=100, blank=True, null=True)
     requirement_agreement = models.CharField(default=False, null=True)
@@ -64,6 +66,8 @@ class Student(models.Model):
     # Additional Fields
     annual_income = models.CharField(max_length=50, blank=True, null=True)
     enrollment_chance = models.FloatField(blank=True, null=True)
+    # Registry version of the model that produced enrollment_chance
+    model_version = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     # Computed once at registration time
     age_at_enrollment = models.IntegerField(blank=True, null=True)
     
@@ -78,10 +82,21 @@ class Student(models.Model):
             return "Enrollment chance: N/A"
         return f"Enrollment chance: {self.enrollment_chance:.2f}%"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_enrolled', 'school_year', 'school_term']),
+            models.Index(fields=['program_first_choice']),
+            models.Index(fields=['student_type']),
+            models.Index(fields=['enrollment_chance']),
+        ]
+
     def save(self, *args, **kwargs):
-        """Automatically update status based on student_id if not manually set."""
-        if not self.status:
-            self.status = "Enrolled" if self.student_id else "Not Enrolled"
+        """Keep is_enrolled in step with student_id (status is derived from it on read)."""
+        if 'student_id' not in self.get_deferred_fields():
+            self.is_enrolled = bool(self.student_id)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'student_id' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'is_enrolled'}
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -111,4 +126,73 @@ class Student(models.Model):
             return self.full_name.strip()
         # At least return something non-empty if available
         return (first or last or middle or suffix or "").strip()
-    
\ No newline at end of file
+    
+
+class ScoringJob(models.Model):
+    """Queued enrollment_chance computation for one student (see admissions/jobs.py)."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='scoring_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"ScoringJob {self.pk} ({self.status}) for student {self.student_id}"
+
+
+class StudentFeatures(models.Model):
+    """Engineered features (preprocess_student_data output) of one student (see admissions/feature_store.py)."""
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, primary_key=True, related_name='features')
+    # preprocessing.FEATURE_SCHEMA_VERSION the features were computed with
+    schema_version = models.PositiveSmallIntegerField()
+    # Digest of the raw preprocessing inputs; a mismatch means the Student changed
+    fingerprint = models.CharField(max_length=32)
+    features = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'student features'
+
+    def __str__(self):
+        return f"Features v{self.schema_version} for student {self.student_id}"
+
+
+class EnrollmentRollup(models.Model):
+    """Student counts per dashboard breakdown, maintained incrementally (see admissions/rollups.py)."""
+    school_year = models.CharField(max_length=10, blank=True, null=True)
+    school_term = models.CharField(max_length=10, blank=True, null=True)
+    program_first_choice = models.CharField(max_length=100, blank=True, null=True)
+    gender = models.CharField(max_length=20, blank=True, null=True)
+    # student_id present and non-empty
+    enrolled = models.BooleanField()
+    count = models.IntegerField(default=0)
+    # Students with an enrollment_chance, its running sum and the dashboard histogram buckets
+    chance_count = models.IntegerField(default=0)
+    chance_sum = models.FloatField(default=0.0)
+    chance_below_40 = models.IntegerField(default=0)
+    chance_40_70 = models.IntegerField(default=0)
+    chance_70_90 = models.IntegerField(default=0)
+    chance_90_up = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['school_year', 'school_term', 'program_first_choice', 'gender', 'enrolled'])]
+
+    def __str__(self):
+        status = 'enrolled' if self.enrolled else 'not enrolled'
+        return f"{self.school_year} {self.school_term} {self.program_first_choice} {self.gender} ({status}): {self.count}"
@@ -0,0 +1,70 @@
+"""
+Keyset (cursor) pagination for the admin student list.
+
+Pages are addressed by the id of a boundary row instead of a page number: the
+next page is "id < last id shown", the previous page "id > first id shown". Each
+page is a single indexed range scan of per_page + 1 rows (the extra row tells
+whether there is a further page), so neither a COUNT(*) nor an OFFSET scan is
+needed and deep pages cost the same as the first one. Any filters already on the
+queryset are kept.
+"""
+
+
+class KeysetPage:
+    """One page of a queryset in descending id order."""
+
+    def __init__(self, object_list, has_next: bool, has_previous: bool, after=None):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self._after = after
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        """`after` value of the next page (None without one)."""
+        return self.object_list[-1].pk if self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        """`before` value of the previous page (None without one)."""
+        if not self._has_previous:
+            return None
+        # Past the last row (e.g. rows were deleted): step back to the cursor itself
+        return self.object_list[0].pk if self.object_list else self._after - 1
+
+
+def parse_cursor(value):
+    """Cursor query parameter -> int id, or None when absent or malformed."""
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_page(queryset, per_page: int, after=None, before=None) -> KeysetPage:
+    """The page of `queryset` (newest first) right after id `after` or right before id `before`."""
+    if before is not None:
+        rows = list(queryset.filter(pk__gt=before).order_by('pk')[:per_page + 1])
+        if rows:
+            has_previous = len(rows) > per_page
+            return KeysetPage(rows[:per_page][::-1], has_next=True, has_previous=has_previous)
+        # Nothing newer than the cursor any more: show the first page
+    if after is not None:
+        queryset = queryset.filter(pk__lt=after)
+    rows = list(queryset.order_by('-pk')[:per_page + 1])
+    return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_previous=after is not None, after=after)
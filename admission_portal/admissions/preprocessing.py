@@ -11,14 +11,19 @@ Usage:
     # For single student
     processed_data = preprocess_student_data(student_dict)
     
-    # For batch processing
-    processed_df = preprocess_student_data_batch(students_list)
+    # For batch processing (errors: bool mask of rows that could not be processed)
+    processed_df, errors = preprocess_student_data_batch(students_list)
 """
 
+import re
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
-import warnings
-warnings.filterwarnings('ignore')
+
+# Version of the engineered feature set below; bump it whenever preprocess_student_data
+# changes its output so stored features (models.StudentFeatures) are recomputed
+FEATURE_SCHEMA_VERSION = 1
 
 # Faculty mapping for program classification
 FACULTY_MAP = {
@@ -65,54 +70,86 @@ TOP20_CITIES = [
 ]
 
 
+# Program abbreviations used on the registration form -> full training-data names
+PROGRAM_ABBREVIATIONS = {
+    'BSN': 'BACHELOR OF SCIENCE IN NURSING',
+    'BSCE': 'BACHELOR OF SCIENCE IN CIVIL ENGINEERING',
+    'BSMT': 'BACHELOR OF SCIENCE IN MEDICAL TECHNOLOGY',
+    'BSPSY': 'BACHELOR OF SCIENCE IN PSYCHOLOGY',
+    'BSA': 'BACHELOR OF SCIENCE IN ACCOUNTANCY',
+    'BSACCOUNTANCY': 'BACHELOR OF SCIENCE IN ACCOUNTANCY',
+    'BSIT': 'BACHELOR OF SCIENCE IN INFORMATION TECHNOLOGY',
+    'BSTM': 'BACHELOR OF SCIENCE IN TOURISM MANAGEMENT',
+    'BSARCH': 'BACHELOR OF SCIENCE IN ARCHITECTURE',
+    'BSBA-MKTGMGT': 'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN MARKETING MANAGEMENT',
+    'BSBA-FINMGT': 'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN FINANCIAL MANAGEMENT',
+    'BSCS': 'BACHELOR OF SCIENCE IN COMPUTER SCIENCE'
+}
+
+
+# Distinct raw strings remembered per normalizer (city/province and program names
+# come from a small vocabulary, so nearly every call after warm-up is a cache hit)
+NORMALIZER_CACHE_SIZE = 4096
+
+_CITY_OF_PREFIX = re.compile(r"^city of\s+")
+_CITY_SUFFIX = re.compile(r"\s+city$")
+_WHITESPACE_RUN = re.compile(r"\s+")
+_MLA_SUFFIX = re.compile(r"\s*-\s*MLA$")
+_MWA_SUFFIX = re.compile(r"\s*-\s*MWA$")
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _canonical_city(text):
+    """Canonical form of a non-missing city/province string (see normalize_city_names)."""
+    text = text.strip().lower()
+    # Remove "city of " at start
+    text = _CITY_OF_PREFIX.sub("", text)
+    # Remove " city" at end
+    text = _CITY_SUFFIX.sub("", text)
+    # Replace multiple spaces with single space
+    return _WHITESPACE_RUN.sub(" ", text)
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _canonical_program(text):
+    """Canonical form of a non-missing program string (see normalize_program_name)."""
+    # Convert to uppercase and strip
+    text = text.strip().upper()
+    # Remove MLA and MWA suffixes
+    text = _MLA_SUFFIX.sub("", text)
+    text = _MWA_SUFFIX.sub("", text)
+    # Handle abbreviation replacements
+    return PROGRAM_ABBREVIATIONS.get(text, text)
+
+
+def normalizer_cache_stats():
+    """Hit/miss counters of the memoized normalizers (shared by scalar and batch paths)."""
+    stats = {}
+    for name, fn in (('city', _canonical_city), ('program', _canonical_program)):
+        info = fn.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'maxsize': info.maxsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
 def normalize_city_names(city_str):
     """Normalize city names by removing 'city of' and 'city' suffixes/prefixes"""
     if pd.isna(city_str) or city_str in ['N/A', 'NA', '', None]:
         return 'N/A'
-    
-    city_str = str(city_str).strip().lower()
-    # Remove "city of " at start
-    city_str = pd.Series([city_str]).str.replace(r"^city of\s+", "", regex=True).iloc[0]
-    # Remove " city" at end
-    city_str = pd.Series([city_str]).str.replace(r"\s+city$", "", regex=True).iloc[0]
-    # Replace multiple spaces with single space
-    city_str = pd.Series([city_str]).str.replace(r"\s+", " ", regex=True).iloc[0]
-    
-    return city_str
+    return _canonical_city(str(city_str))
 
 
 def normalize_program_name(program_str):
     """Normalize program names to match training data format"""
     if pd.isna(program_str) or program_str in ['N/A', 'NA', '', None]:
         return 'N/A'
-    
-    # Convert to uppercase and strip
-    program_str = str(program_str).strip().upper()
-    
-    # Remove MLA and MWA suffixes
-    program_str = pd.Series([program_str]).str.replace(r"\s*-\s*MLA$", "", regex=True).iloc[0]
-    program_str = pd.Series([program_str]).str.replace(r"\s*-\s*MWA$", "", regex=True).iloc[0]
-    
-    # Handle abbreviation replacements
-    abbreviations = {
-        'BSN': 'BACHELOR OF SCIENCE IN NURSING',
-        'BSCE': 'BACHELOR OF SCIENCE IN CIVIL ENGINEERING',
-        'BSMT': 'BACHELOR OF SCIENCE IN MEDICAL TECHNOLOGY',
-        'BSPSY': 'BACHELOR OF SCIENCE IN PSYCHOLOGY',
-        'BSA': 'BACHELOR OF SCIENCE IN ACCOUNTANCY',
-        'BSACCOUNTANCY': 'BACHELOR OF SCIENCE IN ACCOUNTANCY',
-        'BSIT': 'BACHELOR OF SCIENCE IN INFORMATION TECHNOLOGY',
-        'BSTM': 'BACHELOR OF SCIENCE IN TOURISM MANAGEMENT',
-        'BSARCH': 'BACHELOR OF SCIENCE IN ARCHITECTURE',
-        'BSBA-MKTGMGT': 'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN MARKETING MANAGEMENT',
-        'BSBA-FINMGT': 'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN FINANCIAL MANAGEMENT',
-        'BSCS': 'BACHELOR OF SCIENCE IN COMPUTER SCIENCE'
-    }
-    
-    if program_str in abbreviations:
-        program_str = abbreviations[program_str]
-    
-    return program_str
+    return _canonical_program(str(program_str))
 
 
 def simplify_civil_status(x):
@@ -348,30 +385,236 @@ def preprocess_student_data(student_dict):
     return final_features
 
 
+# Output columns of preprocess_student_data, in order; the rest are categorical (object)
+INT_FEATURES = [
+    'Requirement Agreement', 'Disability', 'Indigenous', 'second_choice_missing', 'same_faculty',
+    'valid_second_choice', 'second_choice_other', 'diff_faculty', 'is_transferee', 'is_other_entry',
+    'entry_level_freq', 'gender_binary', 'student_type_binary', 'school_type_binary',
+]
+FEATURE_COLUMNS = [
+    'School Year', 'School Term', 'Program (First Choice)', 'Program (Second Choice)',
+    'Place of Birth (Province)', 'Permanent Region', 'Age at Enrollment', 'Requirement Agreement',
+    'Disability', 'Indigenous', 'first_faculty', 'second_faculty', 'second_choice_missing',
+    'same_faculty', 'valid_second_choice', 'second_choice_other', 'diff_faculty',
+    'Entry Level Grouped', 'is_transferee', 'is_other_entry', 'entry_level_freq',
+    'Permanent Province Grouped', 'Permanent City Grouped', 'civil_status_grouped',
+    'religion_grouped', 'gender_binary', 'student_type_binary', 'school_type_binary',
+]
+
+
+def _raw_column(students_list, key):
+    """(values, present) for one input key; values get STEP 1 null handling ('N/A')."""
+    n = len(students_list)
+    present = np.fromiter((key in student for student in students_list), dtype=bool, count=n)
+    values = np.empty(n, dtype=object)
+    values[:] = [student.get(key) for student in students_list]
+    values[pd.isna(values) | (values == '')] = 'N/A'
+    return values, present
+
+
+def _str_mask(values):
+    return np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+
+
+def _upper_strings(values):
+    """STEP 4 capitalization: upper-case the str entries, leave everything else as is."""
+    out = values.copy()
+    is_str = _str_mask(values)
+    if is_str.any():
+        out[is_str] = pd.Series(values[is_str], dtype=object).str.upper().to_numpy(dtype=object)
+    return out
+
+
+def _stripped_upper(values):
+    """str(x).strip().upper() for every entry."""
+    return pd.Series([str(v) for v in values], dtype=object).str.strip().str.upper().to_numpy(dtype=object)
+
+
+def _map_distinct(texts, canonical):
+    """Apply a memoized normalizer once per distinct string and broadcast the results."""
+    texts = pd.Series(texts, dtype=object)
+    distinct = texts.unique()
+    return texts.map(dict(zip(distinct, map(canonical, distinct)))).to_numpy(dtype=object)
+
+
+def _normalize_cities(values):
+    """Vectorized normalize_city_names followed by STEP 4 capitalization."""
+    out = np.full(len(values), 'N/A', dtype=object)
+    keep = ~pd.Series(values, dtype=object).isin(['N/A', 'NA', '']).to_numpy()
+    if keep.any():
+        names = _map_distinct([str(v) for v in values[keep]], _canonical_city)
+        out[keep] = pd.Series(names, dtype=object).str.upper().to_numpy(dtype=object)
+    return out
+
+
+def _normalize_programs(values):
+    """Vectorized normalize_program_name (values already STEP 4 capitalized)."""
+    out = np.full(len(values), 'N/A', dtype=object)
+    keep = ~pd.Series(values, dtype=object).isin(['N/A', 'NA', '']).to_numpy()
+    if keep.any():
+        out[keep] = _map_distinct([str(v) for v in values[keep]], _canonical_program)
+    return out
+
+
+def _binary_flag(values, present):
+    """STEP 3 flags: 1 unless missing/'N/A'/'NA'/''/0 (or the key is absent)."""
+    falsy = pd.Series(values, dtype=object).isin(['N/A', 'NA', '', 0]).to_numpy()
+    return np.where(present & ~falsy, 1, 0)
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except Exception:
+        return None
+
+
+def _scalar_age(birth_date, school_year):
+    try:
+        return int(school_year) - pd.to_datetime(birth_date).year
+    except Exception:
+        return 'N/A'
+
+
+def _ages(birth_dates, school_years):
+    """STEP 2 for rows with both keys present: int(School Year) - birth year, else 'N/A'."""
+    n = len(birth_dates)
+    ages = np.full(n, 'N/A', dtype=object)
+    uniques = pd.unique(school_years)
+    years_int = pd.Series(school_years, dtype=object).map(dict(zip(uniques, map(_as_int, uniques)))).to_numpy(dtype=object)
+    known = birth_dates != 'N/A'
+    is_str = _str_mask(birth_dates) & known
+    parsed = np.full(n, np.nan)
+    if is_str.any():
+        stamps = pd.to_datetime(pd.Series(birth_dates[is_str], dtype=object), format='ISO8601', errors='coerce')
+        parsed[is_str] = stamps.dt.year.to_numpy(dtype=float)
+    fast = known & ~np.isnan(parsed) & pd.notna(years_int)
+    if fast.any():
+        ages[fast] = (years_int[fast].astype(np.int64) - parsed[fast].astype(np.int64)).tolist()
+    # Non-ISO strings, date objects and unparsable values take the scalar route
+    for i in np.flatnonzero(known & ~fast):
+        ages[i] = _scalar_age(birth_dates[i], school_years[i])
+    return ages
+
+
+def _vectorized_features(students_list):
+    n = len(students_list)
+    raw = {key: _raw_column(students_list, key) for key in (
+        'School Year', 'School Term', 'Program (First Choice)', 'Program (Second Choice)',
+        'Place of Birth (Province)', 'Permanent Region', 'Age at Enrollment', 'Birth Date',
+        'Requirement Agreement', 'Disability', 'Indigenous', 'Entry Level', 'Permanent Province',
+        'Permanent City', 'Civil Status', 'Religion', 'Gender', 'Student Type', 'School Type',
+    )}
+
+    def present_or(key, transform, default):
+        values, present = raw[key]
+        out = np.full(n, default, dtype=object)
+        if present.any():
+            out[present] = transform(values[present])
+        return out
+
+    # STEP 2: age from birth date, only when both keys are given
+    age = present_or('Age at Enrollment', lambda v: v, 'N/A')
+    dated = raw['Birth Date'][1] & raw['School Year'][1]
+    if dated.any():
+        age[dated] = _ages(raw['Birth Date'][0][dated], raw['School Year'][0][dated])
+
+    # STEP 5: programs
+    first_choice = present_or('Program (First Choice)', lambda v: _normalize_programs(_upper_strings(v)), 'N/A')
+    second_choice = present_or('Program (Second Choice)', lambda v: _normalize_programs(_upper_strings(v)), None)
+    second_choice[pd.Series(second_choice, dtype=object).isin(['N/A', 'NA', 'NAN', '']).to_numpy()] = None
+    errors = raw['Program (First Choice)'][1] & np.fromiter(('PROGRAM' in str(v) for v in first_choice), dtype=bool, count=n)
+
+    # STEP 6: engineered features
+    first_faculty = pd.Series(first_choice, dtype=object).map(FACULTY_MAP).fillna('OTHER').to_numpy(dtype=object)
+    has_second = pd.notna(second_choice)
+    second_faculty = np.where(
+        has_second, pd.Series(second_choice, dtype=object).map(FACULTY_MAP).fillna('OTHER').to_numpy(dtype=object), 'OTHER'
+    ).astype(object)
+    second_other = second_faculty == 'OTHER'
+
+    entry_level = present_or('Entry Level', _upper_strings, 'FRESHMAN')
+    entry_series = pd.Series(entry_level, dtype=object)
+    is_other_entry = entry_series.isin(['2ND_DEGREE', 'CROSS_ENROLLEE', 'GRADUATE_STUDIES']).to_numpy()
+
+    province = present_or('Permanent Province', _normalize_cities, 'N/A')
+    city = present_or('Permanent City', _normalize_cities, 'N/A')
+    civil = _stripped_upper(present_or('Civil Status', _upper_strings, 'N/A'))
+    student_type = _stripped_upper(present_or('Student Type', _upper_strings, 'N/A'))
+    school_type = _stripped_upper(present_or('School Type', _upper_strings, 'N/A'))
+
+    columns = {
+        'School Year': present_or('School Year', lambda v: v, 2025),
+        'School Term': present_or('School Term', lambda v: v, 1),
+        'Program (First Choice)': first_choice,
+        'Program (Second Choice)': second_choice,
+        'Place of Birth (Province)': present_or('Place of Birth (Province)', _normalize_cities, 'N/A'),
+        'Permanent Region': present_or('Permanent Region', _upper_strings, 'N/A'),
+        'Age at Enrollment': age,
+        'Requirement Agreement': _binary_flag(*raw['Requirement Agreement']),
+        'Disability': _binary_flag(*raw['Disability']),
+        'Indigenous': _binary_flag(*raw['Indigenous']),
+        'first_faculty': first_faculty,
+        'second_faculty': second_faculty,
+        'second_choice_missing': np.where(has_second, 0, 1),
+        'same_faculty': np.where((first_faculty == second_faculty) & ~second_other, 1, 0),
+        'valid_second_choice': pd.Series(second_choice, dtype=object).isin(list(FACULTY_MAP)).to_numpy().astype(int),
+        'second_choice_other': np.where(second_other, 1, 0),
+        'diff_faculty': np.where((first_faculty != second_faculty) & ~second_other, 1, 0),
+        'Entry Level Grouped': np.where(is_other_entry, 'OTHER', entry_level).astype(object),
+        'is_transferee': np.where(entry_level == 'TRANSFEREE', 1, 0),
+        'is_other_entry': is_other_entry.astype(int),
+        'entry_level_freq': entry_series.map(ENTRY_LEVEL_FREQ).fillna(0).to_numpy().astype(int),
+        'Permanent Province Grouped': np.where(pd.Series(province, dtype=object).isin(TOP20_PROVINCES), province, 'OTHER').astype(object),
+        'Permanent City Grouped': np.where(pd.Series(city, dtype=object).isin(TOP20_CITIES), city, 'OTHER').astype(object),
+        'civil_status_grouped': np.where(civil == 'MARRIED', 'MARRIED', np.where(civil == 'SINGLE', 'SINGLE', 'OTHER')).astype(object),
+        'religion_grouped': np.where(_stripped_upper(present_or('Religion', _upper_strings, 'N/A')) == 'ROMAN CATHOLIC', 'MAJORITY', 'MINORITY').astype(object),
+        'gender_binary': np.where(_stripped_upper(present_or('Gender', _upper_strings, 'N/A')) == 'FEMALE', 1, 0),
+        'student_type_binary': np.where(student_type == 'N/A', -1, np.where(student_type == 'FULL-TIME STUDENT', 1, 0)),
+        'school_type_binary': np.where(school_type == 'N/A', -1, np.where(school_type == 'PRIVATE', 1, 0)),
+    }
+    return columns, errors
+
+
 def preprocess_student_data_batch(students_list):
     """
     Preprocess a batch of students' data for model prediction.
+
+    Same features as preprocess_student_data, computed a column at a time
+    (vectorized string normalization, dict maps, isin and np.where) instead
+    of once per student. Missing keys get the same defaults as the scalar path.
     
     Args:
         students_list (list): List of dictionaries containing student information
         
     Returns:
-        pd.DataFrame: Processed features ready for model prediction
+        tuple: (pd.DataFrame with one row per input student, in input order,
+                np.ndarray bool error mask - True where the row is invalid and
+                its features must not be used)
     """
-    processed_students = []
-    
-    for i, student in enumerate(students_list):
-        try:
-            processed = preprocess_student_data(student)
-            processed_students.append(processed)
-        except Exception as e:
-            print(f"Error processing student {i}: {e}")
-            continue
-    
-    if not processed_students:
-        raise ValueError("No students were successfully processed")
-    
-    return pd.DataFrame(processed_students)
+    students_list = list(students_list)
+    try:
+        columns, errors = _vectorized_features(students_list)
+    except Exception:
+        # A value the column operations cannot handle: fall back to the scalar
+        # function so one malformed row does not fail the whole batch
+        rows = []
+        errors = np.zeros(len(students_list), dtype=bool)
+        for i, student in enumerate(students_list):
+            try:
+                rows.append(preprocess_student_data(student))
+            except Exception:
+                rows.append({})
+                errors[i] = True
+        columns = {c: [row.get(c) for row in rows] for c in FEATURE_COLUMNS}
+
+    # Explicit object dtype keeps None/str/int categories exactly as the scalar path returns them
+    frame = pd.DataFrame(
+        {c: pd.Series(columns[c], dtype=(np.int64 if c in INT_FEATURES and isinstance(columns[c], np.ndarray) else object))
+         for c in FEATURE_COLUMNS},
+        columns=FEATURE_COLUMNS,
+    )
+    return frame, errors
 
 
 # Example usage and testing function
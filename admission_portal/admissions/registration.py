@@ -0,0 +1,179 @@
+"""
+Applicant records in the registration form's field vocabulary (firstName,
+presentCity, emailAddress, ...) -> Student rows.
+
+student_from_registration() is shared by the HTML form (views.register_student)
+and the bulk ingestion API (api.ingest_applicants). ingest() writes validated
+records INGEST_CHUNK_SIZE at a time:
+
+- emails already stored, or repeated earlier in the batch, are reported as
+  duplicates (one query per chunk);
+- new students are scored with one predict_proba call (ml_utils.score_students)
+  before they are inserted, so each chunk is a single bulk_create plus the
+  rollup update, in one transaction;
+- bulk_create sends no signals, so is_enrolled, the rollups, the dashboard data
+  version and the feature log are updated here.
+"""
+
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+
+from . import feature_log, rollups
+from .dashboard import bump_data_version
+from .models import Student
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK_SIZE = 1000
+
+
+def _text(form, name) -> str:
+    return form.get(name) or ""
+
+
+def age_at_enrollment(birth_date) -> int | None:
+    """Age today for a 'YYYY-MM-DD' string or date; None when it does not parse."""
+    if not birth_date:
+        return None
+    try:
+        year, month, day = map(int, str(birth_date).split('-'))
+        bdt = date(year, month, day)
+        today = date.today()
+        return today.year - bdt.year - ((today.month, today.day) < (bdt.month, bdt.day))
+    except Exception:
+        return None
+
+
+def recent_school_year(school_year) -> int | None:
+    """The latest year of a range like "2024-2025" (2025), or the single year given."""
+    if not school_year:
+        return None
+    try:
+        parts = str(school_year).split('-')
+        if len(parts) >= 2:
+            return int(parts[-1])
+        return int(parts[0])
+    except Exception:
+        return None
+
+
+def student_from_registration(form) -> Student:
+    """An unsaved Student from registration form fields (a QueryDict or a plain dict)."""
+    current_region = _text(form, "currentRegion")
+    current_province = _text(form, "presentProvince")
+    current_city = _text(form, "presentCity")
+    current_brgy = _text(form, "presentBarangay")
+    birth_province = _text(form, "birthProvince")
+    birth_date = form.get("birthDate")
+    if isinstance(birth_date, date):
+        birth_date = birth_date.isoformat()
+    school_year = form.get("schoolYear")
+    derived_recent_year = recent_school_year(school_year)
+
+    return Student(
+        # Store only the latest year (e.g., 2025) in school_year
+        school_year=str(derived_recent_year) if derived_recent_year is not None else school_year,
+        # Keep the submitted term (1st/2nd/3rd)
+        school_term=form.get("schoolTerm"),
+        campus_code=form.get("campus"),
+        program_first_choice=_text(form, "firstChoice"),
+        program_second_choice=_text(form, "secondChoice"),
+        entry_level=_text(form, "entryLevel"),
+        full_name=f"{_text(form, 'lastName').upper()}, {_text(form, 'firstName').upper()} {_text(form, 'middleName').upper()}".strip(),
+        first_name=form.get("firstName"),
+        middle_name=form.get("middleName"),
+        last_name=form.get("lastName"),
+        suffix=form.get("suffix"),
+        gender=_text(form, "gender"),
+        civil_status=_text(form, "civilStatus"),
+        birth_date=birth_date,
+        # Form doesn't have distinct birthPlace text input; use province label as birth_place
+        birth_place=birth_province,
+        birth_city=_text(form, "birthCity"),
+        birth_province=birth_province,
+        birth_country=_text(form, "birthCountry"),
+        citizen_of=_text(form, "nationality"),
+        religion=_text(form, "religion"),
+        complete_present_address=form.get("presentAddress"),
+        current_street=form.get("presentAddress"),
+        current_region=current_region,
+        current_province=current_province,
+        current_city=current_city,
+        current_brgy=current_brgy,
+        current_postal_code=form.get("presentZip"),
+        # Fallback: if permanent address fields empty, copy from current
+        permanent_country=_text(form, "permanentCountry"),
+        permanent_region=_text(form, "permanentRegion") or current_region,
+        permanent_province=_text(form, "permanentProvince") or current_province,
+        permanent_city=_text(form, "permanentCity") or current_city,
+        permanent_brgy=_text(form, "permanentBarangay") or current_brgy,
+        permanent_street=form.get("permanentAddress") or form.get("presentAddress"),
+        permanent_postal_code=form.get("permanentZip"),
+        email=form.get("emailAddress"),
+        mobile_number=form.get("mobileNumber"),
+        student_type=_text(form, "studentType"),
+        school_type=_text(form, "schoolType"),
+        last_school_attended=_text(form, "lastSchoolAttended"),
+        requirement_agreement=1 if form.get("truthfulInfo") else 0,
+        disability=1 if _text(form, "disability").strip() else 0,
+        indigenous=1 if _text(form, "indigenous").strip() else 0,
+        annual_income=form.get("annualIncome"),
+        enrollment_chance=None,
+        age_at_enrollment=age_at_enrollment(birth_date),
+    )
+
+
+def ingest(records, chunk_size: int | None = None) -> list[dict]:
+    """Create students from validated registration records; one result dict per record, in order.
+
+    {'status': 'created', 'id': pk, 'enrollment_chance': ...} or
+    {'status': 'duplicate', 'id': pk of the student with that email}.
+    """
+    from .ml_utils import score_students
+    from .utils import build_flat_record
+
+    chunk_size = chunk_size or getattr(settings, 'ADMISSIONS_INGEST_CHUNK_SIZE', INGEST_CHUNK_SIZE)
+    results = []
+    seen = {}  # email -> pk (or the position of the earlier record in this batch)
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        emails = {record.get('emailAddress') for record in chunk} - {None, ''} - seen.keys()
+        seen.update(Student.objects.filter(email__in=emails).values_list('email', 'pk'))
+
+        chunk_results, students = [], []
+        for record in chunk:
+            email = record.get('emailAddress')
+            if email and email in seen:
+                chunk_results.append({'status': 'duplicate', 'id': seen[email]})
+                continue
+            student = student_from_registration(record)
+            student.is_enrolled = bool(student.student_id)
+            if email:
+                seen[email] = student
+            students.append(student)
+            chunk_results.append({'status': 'created', 'student': student})
+        if students:
+            score_students(students)
+            with transaction.atomic():
+                Student.objects.bulk_create(students)
+                rollups.apply(rollups.changes([], (rollups.contribution(rollups.student_values(s)) for s in students)))
+            try:
+                feature_log.append_records(
+                    (feature_log.record_key(s.pk), build_flat_record(s)) for s in students
+                )
+            except Exception as exc:
+                logger.warning("Feature export failed for %s ingested students: %s", len(students), exc)
+
+        for result in chunk_results:
+            if result['status'] == 'created':
+                student = result.pop('student')
+                result.update(id=student.pk, enrollment_chance=student.enrollment_chance)
+            elif isinstance(result['id'], Student):
+                result['id'] = result['id'].pk
+        results.extend(chunk_results)
+    if any(result['status'] == 'created' for result in results):
+        bump_data_version()
+    return results
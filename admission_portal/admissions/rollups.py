@@ -0,0 +1,225 @@
+"""
+Incrementally maintained enrollment rollups for the admin dashboard.
+
+EnrollmentRollup holds one row per (school_year, school_term, program_first_choice,
+gender, enrolled) with the number of students, how many have an enrollment_chance,
+its running sum and the dashboard's chance histogram buckets. Every Student write
+applies a delta instead of recounting:
+
+- Student.save()/delete(): pre/post signals in signals.py compare the row before
+  and after the write;
+- bulk writes that bypass signals (bulk_update, queryset.update) run inside
+  track(pks), which reads the affected rows before and after.
+
+Several rollup rows may exist for one key (concurrent first inserts); readers sum
+them. `manage.py rebuild_rollups` recomputes the table from Student and
+`manage.py rebuild_rollups --check` reports drift without writing.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from .models import EnrollmentRollup, Student
+
+KEY_FIELDS = ('school_year', 'school_term', 'program_first_choice', 'gender', 'enrolled')
+COUNTER_FIELDS = ('count', 'chance_count', 'chance_sum', 'chance_below_40', 'chance_40_70', 'chance_70_90', 'chance_90_up')
+# Student fields a rollup row depends on
+SOURCE_FIELDS = ('school_year', 'school_term', 'program_first_choice', 'gender', 'is_enrolled', 'enrollment_chance')
+
+# pk__in chunk for before/after snapshots (stays under SQLite's variable limit)
+SNAPSHOT_CHUNK = 900
+# Keys per lookup query in apply() (one OR branch each; SQLite limits expression depth)
+APPLY_CHUNK = 100
+
+
+# pre_save marker: the save does not touch SOURCE_FIELDS
+UNCHANGED = object()
+
+
+def _bucket(chance: float) -> str:
+    if chance < 40:
+        return 'chance_below_40'
+    if chance < 70:
+        return 'chance_40_70'
+    if chance < 90:
+        return 'chance_70_90'
+    return 'chance_90_up'
+
+
+def contribution(values):
+    """(key, counters) one Student adds to the rollups; values maps SOURCE_FIELDS. None -> None."""
+    if values is None:
+        return None
+    key = (values['school_year'], values['school_term'], values['program_first_choice'],
+           values['gender'], values['is_enrolled'])
+    counters = {'count': 1}
+    chance = values['enrollment_chance']
+    if chance is not None:
+        counters['chance_count'] = 1
+        counters['chance_sum'] = chance
+        counters[_bucket(chance)] = 1
+    return key, counters
+
+
+def student_values(student: Student):
+    """SOURCE_FIELDS of an instance (read from the database if any are deferred)."""
+    if student.get_deferred_fields() & set(SOURCE_FIELDS):
+        return Student.objects.filter(pk=student.pk).values(*SOURCE_FIELDS).first()
+    return {name: getattr(student, name) for name in SOURCE_FIELDS}
+
+
+def snapshot(pks) -> dict:
+    """{pk: SOURCE_FIELDS values} for the given students (missing rows are absent)."""
+    pks = list(pks)
+    rows = {}
+    for start in range(0, len(pks), SNAPSHOT_CHUNK):
+        for row in Student.objects.filter(pk__in=pks[start:start + SNAPSHOT_CHUNK]).values('pk', *SOURCE_FIELDS):
+            rows[row.pop('pk')] = row
+    return rows
+
+
+def changes(before, after) -> dict:
+    """{key: counter deltas} turning the `before` contributions into the `after` ones.
+
+    before/after are iterables of contribution() results (None entries skipped).
+    """
+    deltas = {}
+    for sign, contributions in ((-1, before), (1, after)):
+        for item in contributions:
+            if item is None:
+                continue
+            key, counters = item
+            delta = deltas.setdefault(key, {})
+            for name, value in counters.items():
+                delta[name] = delta.get(name, 0) + sign * value
+    return {
+        key: {name: value for name, value in delta.items() if value}
+        for key, delta in deltas.items()
+        if any(delta.values())
+    }
+
+
+@lru_cache(maxsize=1)
+def _increment_sql() -> str:
+    """UPDATE adding one parameter to each counter of the row with the last parameter's pk."""
+    qn = connection.ops.quote_name
+    counters = ', '.join(f'{qn(name)} = {qn(name)} + %s' for name in COUNTER_FIELDS)
+    return f'UPDATE {qn(EnrollmentRollup._meta.db_table)} SET {counters} WHERE {qn(EnrollmentRollup._meta.pk.column)} = %s'
+
+
+def apply(deltas: dict) -> None:
+    """Add counter deltas ({key: {counter: delta}}) to the rollup rows.
+
+    Per APPLY_CHUNK keys: one query finds the existing rows, one executemany
+    increments them in place (so concurrent writers do not lose counts) and one
+    bulk_create inserts the missing keys.
+    """
+    if not deltas:
+        return
+    keys = list(deltas)
+    # No savepoint: inside a caller's transaction (a registration) a failure rolls it all back anyway
+    with transaction.atomic(savepoint=False):
+        for start in range(0, len(keys), APPLY_CHUNK):
+            chunk = keys[start:start + APPLY_CHUNK]
+            condition = Q()
+            for key in chunk:
+                condition |= Q(**dict(zip(KEY_FIELDS, key)))
+            existing = {}
+            # Descending, so the lowest pk of a key with several rows wins
+            for pk, *key in EnrollmentRollup.objects.filter(condition).values_list('pk', *KEY_FIELDS).order_by('-pk'):
+                existing[tuple(key)] = pk
+            updates, creates = [], []
+            for key in chunk:
+                delta = deltas[key]
+                if key in existing:
+                    updates.append((existing[key], delta))
+                else:
+                    creates.append(EnrollmentRollup(**dict(zip(KEY_FIELDS, key)), **delta))
+            if updates:
+                with connection.cursor() as cursor:
+                    cursor.executemany(_increment_sql(), [
+                        [delta.get(name, 0) for name in COUNTER_FIELDS] + [pk] for pk, delta in updates
+                    ])
+            if creates:
+                EnrollmentRollup.objects.bulk_create(creates)
+
+
+@contextmanager
+def track(pks):
+    """Apply the rollup changes of bulk writes to these students made inside the block."""
+    pks = list(pks)
+    before = snapshot(pks)
+    yield
+    after = snapshot(pks)
+    apply(changes(
+        (contribution(before.get(pk)) for pk in pks),
+        (contribution(after.get(pk)) for pk in pks),
+    ))
+
+
+def expected_rollups() -> dict:
+    """{key: counters} recomputed from Student with one GROUP BY."""
+    rows = (
+        Student.objects
+        .values('school_year', 'school_term', 'program_first_choice', 'gender', 'is_enrolled')
+        .annotate(
+            count=Count('pk'),
+            chance_count=Count('enrollment_chance'),
+            chance_sum=Sum('enrollment_chance', default=0.0),
+            chance_below_40=Count('pk', filter=Q(enrollment_chance__lt=40)),
+            chance_40_70=Count('pk', filter=Q(enrollment_chance__gte=40, enrollment_chance__lt=70)),
+            chance_70_90=Count('pk', filter=Q(enrollment_chance__gte=70, enrollment_chance__lt=90)),
+            chance_90_up=Count('pk', filter=Q(enrollment_chance__gte=90)),
+        )
+        .order_by()
+    )
+    return {
+        (row['school_year'], row['school_term'], row['program_first_choice'], row['gender'], row['is_enrolled']):
+            {name: row[name] for name in COUNTER_FIELDS}
+        for row in rows
+    }
+
+
+def current_rollups() -> dict:
+    """{key: counters} from the rollup table, duplicate and empty rows folded away."""
+    result = {}
+    for row in EnrollmentRollup.objects.values(*KEY_FIELDS, *COUNTER_FIELDS).order_by():
+        key = tuple(row[name] for name in KEY_FIELDS)
+        counters = result.setdefault(key, dict.fromkeys(COUNTER_FIELDS, 0))
+        for name in COUNTER_FIELDS:
+            counters[name] += row[name]
+    return {key: counters for key, counters in result.items() if counters['count']}
+
+
+def _same(expected: dict, actual: dict) -> bool:
+    for name in COUNTER_FIELDS:
+        a, b = expected.get(name, 0), actual.get(name, 0)
+        if abs(a - b) > 1e-6 * max(1.0, abs(a), abs(b)):
+            return False
+    return True
+
+
+def inconsistencies() -> list:
+    """[(key, expected counters or None, stored counters or None)] where the table drifted from Student."""
+    expected = expected_rollups()
+    actual = current_rollups()
+    return [
+        (key, expected.get(key), actual.get(key))
+        for key in sorted(set(expected) | set(actual), key=repr)
+        if not _same(expected.get(key, {}), actual.get(key, {}))
+    ]
+
+
+def rebuild() -> int:
+    """Replace the rollup table with counts recomputed from Student; returns the row count."""
+    expected = expected_rollups()
+    with transaction.atomic():
+        EnrollmentRollup.objects.all().delete()
+        EnrollmentRollup.objects.bulk_create(
+            [EnrollmentRollup(**dict(zip(KEY_FIELDS, key)), **counters) for key, counters in expected.items()],
+            batch_size=500,
+        )
+    return len(expected)
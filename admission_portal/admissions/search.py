@@ -0,0 +1,208 @@
+"""
+Indexed applicant search over names, student ID, email and mobile number.
+
+SQLite: an FTS5 table, admissions_student_search, indexes SEARCH_FIELDS with
+Student as its external content. Triggers keep it in sync on every
+INSERT/UPDATE/DELETE, including bulk_create, bulk_update and queryset.update().
+They are created by migration 0021; Django rebuilds the SQLite table (dropping
+its triggers) when a later migration alters Student, so ensure_search_index()
+re-creates them after every migrate (post_migrate, see apps.py). The last word
+of a query matches as a prefix and the others as whole words ("dela cru" finds
+"DELA CRUZ"); results are ranked by the columns they match in, weighted towards
+student ID and names.
+
+PostgreSQL: a pg_trgm GIN index on SEARCH_EXPRESSION serves per-word substring
+matching (LIKE '%word%'), and results are ranked by trigram similarity.
+Other backends fall back to icontains (unindexed).
+
+    students = search.matching(Student.objects.all(), 'juan 0917')      # filtered queryset
+    top = search.ranked(qs, 'juan dela cruz', limit=20)                  # best matches first
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.migrations.recorder import MigrationRecorder
+
+SEARCH_FIELDS = ('first_name', 'middle_name', 'last_name', 'full_name', 'student_id', 'email', 'mobile_number')
+FTS_TABLE = 'admissions_student_search'
+INDEX_MIGRATION = '0021_student_search_index'
+# Student IDs stay single tokens ("2025-00117"); emails split into words ("juan", "delacruz", "example", "com")
+FTS_TOKENIZER = "unicode61 remove_diacritics 2 tokenchars '-_'"
+# Ranking weight of a match in each column, in SEARCH_FIELDS order
+RANK_WEIGHTS = (5.0, 2.0, 5.0, 3.0, 10.0, 4.0, 4.0)
+# Matches scored per query on SQLite (the newest ones)
+RANK_CANDIDATES = 100
+# Indexed expression on PostgreSQL (must match the index created in migration 0021)
+SEARCH_EXPRESSION = "UPPER(" + " || ' ' || ".join(
+    f'COALESCE("admissions_student"."{name}", \'\')' for name in SEARCH_FIELDS
+) + ")"
+
+# Words of a query, split like FTS_TOKENIZER splits the indexed text
+_WORD_RE = re.compile(r'[\w-]+')
+# "0917 123 4567" is one mobile number
+_DIGIT_GAP_RE = re.compile(r'(?<=\d)[\s()]+(?=\d)')
+
+
+def sqlite_index_statements() -> list:
+    """DDL of the FTS5 table and its sync triggers (idempotent).
+
+    Migration 0021 keeps its own frozen copy; a change here reaches existing
+    databases only through ensure_search_index() or a new migration.
+    """
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{name}' for name in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{name}' for name in SEARCH_FIELDS)
+    delete_old = (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+    insert_new = f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});"
+    return [
+        # Prefix indexes: "manal"* is one lookup instead of a merge over every token starting
+        # with it (there is one per email). Only column-level detail and no column sizes are
+        # kept, as no phrase query or bm25() is used; that more than pays for the prefixes.
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({columns}, content='admissions_student', "
+        f"content_rowid='id', tokenize=\"{FTS_TOKENIZER}\", prefix='2 3 4 5 6', detail=column, columnsize=0)",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON admissions_student BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON admissions_student BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON admissions_student "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def ensure_search_index(using: str = 'default', **kwargs) -> bool:
+    """(Re)create the SQLite FTS table and triggers if any is missing; True when it had to.
+
+    Does nothing until migration 0021 is applied (or after it is unapplied).
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    if ('admissions', INDEX_MIGRATION) not in MigrationRecorder(connection).applied_migrations():
+        return False
+    expected = {FTS_TABLE, f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au'}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)", sorted(expected))
+        if {row[0] for row in cursor.fetchall()} == expected:
+            return False
+        for statement in sqlite_index_statements():
+            cursor.execute(statement)
+        cursor.execute(SQLITE_REBUILD)
+    return True
+
+
+def _fold(text: str) -> str:
+    """Lowercase without diacritics, as the FTS tokenizer indexes it."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+
+
+def search_terms(text: str) -> list:
+    """Lowercased words of a search box value, split like the indexed text.
+
+    The domain of an email address is dropped: nearly every row matches it.
+    """
+    text = _DIGIT_GAP_RE.sub('', _fold(text or ''))
+    text = re.sub(r'@\S*', ' ', text)
+    return [word for word in (w.strip('-') for w in _WORD_RE.findall(text)) if word]
+
+
+def fts_query(terms) -> str:
+    """FTS5 MATCH expression.
+
+    Only the last term is a prefix ("juan dela cru"): the words before it have been
+    typed out, and a short prefix of every word would expand to thousands of terms.
+    """
+    return ' '.join([*(f'"{term}"' for term in terms[:-1]), f'"{terms[-1]}"*'])
+
+
+def matching(queryset, text: str):
+    """`queryset` narrowed to students matching every word of `text`."""
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [fts_query(terms)]
+        ))
+    if vendor == 'postgresql':
+        for term in terms:
+            queryset = queryset.filter(RawSQL(f'{SEARCH_EXPRESSION} LIKE UPPER(%s)', [f'%{term}%'], output_field=BooleanField()))
+        return queryset
+    for term in terms:
+        condition = Q()
+        for name in SEARCH_FIELDS:
+            condition |= Q(**{f'{name}__icontains': term})
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+@lru_cache(maxsize=64)
+def _term_patterns(terms: tuple) -> list:
+    """(whole word, word prefix) regexes of each term."""
+    patterns = []
+    for term in terms:
+        start = rf'(?<![\w-]){re.escape(term)}'
+        patterns.append((re.compile(start + r'(?![\w-])'), re.compile(start)))
+    return patterns
+
+
+def score(terms, values) -> float:
+    """Relevance of one student (values in SEARCH_FIELDS order) to the query terms.
+
+    Each term counts the weight of its best column: in full for a whole word,
+    half for a word it is only a prefix of.
+    """
+    columns = [(weight, _fold(value)) for weight, value in zip(RANK_WEIGHTS, values) if value]
+    total = 0.0
+    for word, prefix in _term_patterns(tuple(terms)):
+        best = 0.0
+        for weight, text in columns:
+            if weight > best and prefix.search(text):
+                best = weight if word.search(text) else max(best, weight / 2)
+        total += best
+    return total
+
+
+def ranked(queryset, text: str, limit: int = 20) -> list:
+    """The `limit` best matches of `text` within `queryset`, best first.
+
+    On SQLite the index is walked newest first and only the first RANK_CANDIDATES
+    matches that pass the queryset's filters are scored (see score()); a query as
+    broad as "dela" has no single best answer anyway.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return list(queryset.order_by('-pk')[:limit])
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # External content: the columns are read from admissions_student by rowid
+        sql = f'SELECT rowid, {", ".join(SEARCH_FIELDS)} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        params = [fts_query(terms)]
+        if queryset.query.where:
+            # Checked row by row as the index is walked, so the walk stops after RANK_CANDIDATES
+            filtered = queryset.filter(pk=RawSQL(f'{FTS_TABLE}.rowid', [])).order_by().values('pk')
+            filtered_sql, filtered_params = filtered.query.sql_with_params()
+            sql += f' AND EXISTS ({filtered_sql})'
+            params += filtered_params
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'{sql} ORDER BY rowid DESC LIMIT %s', [*params, RANK_CANDIDATES])
+            candidates = cursor.fetchall()
+        # sorted() is stable: equal scores stay newest first
+        pks = [row[0] for row in sorted(candidates, key=lambda row: -score(terms, row[1:]))[:limit]]
+        students = queryset.in_bulk(pks)
+        return [students[pk] for pk in pks if pk in students]
+    matches = matching(queryset, text)
+    if vendor == 'postgresql':
+        similarity = RawSQL(f'similarity({SEARCH_EXPRESSION}, UPPER(%s))', [' '.join(terms)], output_field=FloatField())
+        return list(matches.annotate(search_rank=similarity).order_by('-search_rank', '-pk')[:limit])
+    return list(matches.order_by('-pk')[:limit])
@@ -1,18 +1,64 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from .models import Student
+from . import rollups
+from .dashboard import bump_data_version
 
-@receiver(post_save, sender=Student)
-def ensure_enrollment_chance_percentage(sender, instance: Student, created, **kwargs):
+@receiver(pre_save, sender=Student)
+def ensure_enrollment_chance_percentage(sender, instance: Student, update_fields=None, **kwargs):
     """Ensure enrollment_chance is stored as percentage (0..100).
-    If value looks like a probability (<=1), scale it x100.
-    Runs after every save; uses update_fields to avoid recursion.
+    If value looks like a probability (<=1), scale it x100 before the row is
+    written, so no extra UPDATE is needed.
     """
+    if update_fields is not None and 'enrollment_chance' not in update_fields:
+        return
     val = instance.enrollment_chance
     if val is None:
         return
     # If it's clearly a probability (<=1.0), scale
     if val <= 1.0000001:
         instance.enrollment_chance = float(val) * 100.0
-        # Avoid triggering infinite loop by saving only that field
-        Student.objects.filter(pk=instance.pk).update(enrollment_chance=instance.enrollment_chance)
+
+
+@receiver(pre_save, sender=Student)
+def remember_rollup_contribution(sender, instance: Student, update_fields=None, **kwargs):
+    """Read the stored row before it is overwritten, so post_save can move the
+    student between EnrollmentRollup rows (admissions/rollups.py).
+    """
+    if update_fields is not None and not set(update_fields) & set(rollups.SOURCE_FIELDS):
+        instance._rollup_previous = rollups.UNCHANGED
+    elif instance.pk is None:
+        instance._rollup_previous = None
+    else:
+        instance._rollup_previous = rollups.snapshot([instance.pk]).get(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+def update_rollups_on_save(sender, instance: Student, **kwargs):
+    # ensure_enrollment_chance_percentage ran in pre_save, so the chance is already scaled
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is rollups.UNCHANGED:
+        return
+    rollups.apply(rollups.changes(
+        [rollups.contribution(previous)], [rollups.contribution(rollups.student_values(instance))]
+    ))
+
+
+@receiver(pre_delete, sender=Student)
+def remember_rollup_on_delete(sender, instance: Student, **kwargs):
+    instance._rollup_previous = rollups.student_values(instance)
+
+
+@receiver(post_delete, sender=Student)
+def update_rollups_on_delete(sender, instance: Student, **kwargs):
+    rollups.apply(rollups.changes([rollups.contribution(getattr(instance, '_rollup_previous', None))], []))
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_dashboard_summary(sender, instance: Student, **kwargs):
+    """Any saved or deleted Student invalidates the cached adminDash summary.
+    Bulk paths (bulk_update, queryset.update, imports) do not send these signals
+    and call bump_data_version() themselves.
+    """
+    bump_data_version()
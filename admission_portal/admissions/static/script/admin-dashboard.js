@@ -15,6 +15,8 @@ document.addEventListener("DOMContentLoaded", function () {
   const chartTitle = document.getElementById("programChartTitle");
   if (chartDropdown) {
     chartDropdown.addEventListener("change", function () {
+      // Charts are drawn once their data has been fetched
+      if (!window.programChartInstance) return;
       if (chartTitle) {
         if (this.value === "popularity") chartTitle.textContent = "Program Popularity";
         else if (this.value === "enrollment") chartTitle.textContent = "Enrollment Chance";
@@ -25,11 +27,9 @@ document.addEventListener("DOMContentLoaded", function () {
         document.getElementById('topCoursesBtnGroup').style.display = 'none';
       } else if (this.value === "enrollment") {
         // Show Enrollment Chance pie chart with backend data
-        const bucketLabels = ["Below 40%", "40% and above", "70% and above", "90% and above"];
-        const bucketCounts = JSON.parse(document.getElementById("enrollment-chance-counts").textContent);
-        window.programChartInstance.data.labels = bucketLabels;
-        window.programChartInstance.data.datasets[0].data = bucketCounts;
-        window.programChartInstance.data.datasets[0].backgroundColor = pieColors.slice(0, bucketLabels.length);
+        window.programChartInstance.data.labels = chanceChart.labels;
+        window.programChartInstance.data.datasets[0].data = chanceChart.data;
+        window.programChartInstance.data.datasets[0].backgroundColor = programColors.slice(0, chanceChart.labels.length);
         window.programChartInstance.update();
         document.getElementById('topCoursesBtnGroup').style.display = 'none';
       } else if (this.value === "topcourses") {
@@ -48,16 +48,52 @@ document.addEventListener("DOMContentLoaded", function () {
     showSection("search");
   }
 
+  // ==========================
+  // Chart data: fetched lazily from the /adminDash/charts/<name>/ JSON endpoints
+  // ==========================
+  // Each canvas carries its endpoint in data-src. Requests start (in parallel) the
+  // first time the charts grid becomes visible; the browser revalidates them with
+  // If-None-Match, so unchanged data comes back as a 304 without a body.
+  function fetchChart(url) {
+    return fetch(url, { credentials: "same-origin" }).then((response) => {
+      if (!response.ok) throw new Error("Chart data request failed: " + response.status);
+      return response.json();
+    });
+  }
+  let chanceChart = { labels: [], data: [] };
+  let chartsRequested = false;
+  function loadCharts() {
+    if (chartsRequested) return;
+    chartsRequested = true;
+    const sources = [
+      ["yearChart", drawYearChart],
+      ["programChart", drawProgramChart],
+      ["admissionChart", drawAdmissionChart],
+    ];
+    sources.forEach(([id, draw]) => {
+      const canvas = document.getElementById(id);
+      if (canvas && canvas.dataset.src) fetchChart(canvas.dataset.src).then(draw).catch(console.error);
+    });
+    if (chartDropdown && chartDropdown.dataset.src) {
+      fetchChart(chartDropdown.dataset.src).then((chart) => { chanceChart = chart; }).catch(console.error);
+    }
+  }
+  const chartsGrid = document.querySelector(".charts-grid");
+  if (chartsGrid && "IntersectionObserver" in window) {
+    const chartsObserver = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        chartsObserver.disconnect();
+        loadCharts();
+      }
+    });
+    chartsObserver.observe(chartsGrid);
+  } else {
+    loadCharts();
+  }
+
   // ==========================
   // Academic Year Distribution (actual data)
   // ==========================
-  // Use json_script data for academic year chart
-  let academicYearLabels = JSON.parse(
-    document.getElementById("academic-year-labels").textContent
-  );
-  let academicYearData = JSON.parse(
-    document.getElementById("academic-year-data").textContent
-  );
   // Generate a color for each year
   function getColorPalette(n) {
     const palette = [
@@ -78,37 +114,34 @@ document.addEventListener("DOMContentLoaded", function () {
     }
     return colors;
   }
-  new Chart(document.getElementById("yearChart").getContext("2d"), {
-    type: "bar",
-    data: {
-      labels: academicYearLabels,
-      datasets: [
-        {
-          label: "No. of Students",
-          data: academicYearData,
-          backgroundColor: getColorPalette(academicYearLabels.length),
-        },
-      ],
-    },
-    options: {
-      responsive: true,
-      maintainAspectRatio: false,
-      scales: { y: { beginAtZero: true } },
-    },
-  });
+  function drawYearChart(chart) {
+    new Chart(document.getElementById("yearChart").getContext("2d"), {
+      type: "bar",
+      data: {
+        labels: chart.labels,
+        datasets: [
+          {
+            label: "No. of Students",
+            data: chart.data,
+            backgroundColor: getColorPalette(chart.labels.length),
+          },
+        ],
+      },
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: { y: { beginAtZero: true } },
+      },
+    });
+  }
 
   // ==========================
   // Program Popularity (Pie Chart)
   // ==========================
-  // Program Popularity Pie Chart (actual data)
-  let programLabelsRaw = JSON.parse(
-    document.getElementById("program-labels").textContent
-  );
-  let programData = JSON.parse(
-    document.getElementById("program-data").textContent
-  );
+  // Program Popularity Pie Chart (actual data, set by drawProgramChart)
   // Labels already abbreviated server-side
-  let programLabels = programLabelsRaw;
+  let programLabels = [];
+  let programData = [];
   let programColors = [
     "#1e40af",
     "#FFD700",
@@ -122,9 +155,6 @@ document.addEventListener("DOMContentLoaded", function () {
     "#f43f5e",
   ];
   let pieColors = [];
-  for (let i = 0; i < programLabels.length; i++) {
-    pieColors.push(programColors[i % programColors.length]);
-  }
   // Small helper to draw rounded rectangles
   function roundRect(ctx, x, y, w, h, r) {
     const minSize = Math.min(w, h);
@@ -193,36 +223,43 @@ document.addEventListener("DOMContentLoaded", function () {
   if (window.Chart && Chart.register) {
     try { Chart.register(sliceBadgePlugin); } catch(e) { /* ignore if already registered */ }
   }
-  // Set chart width larger and keep instance for updates
-  const programChartCanvas = document.getElementById("programChart");
-  programChartCanvas.width = 600;
-  programChartCanvas.height = 400;
-  window.programChartInstance = new Chart(programChartCanvas.getContext("2d"), {
-    type: "pie",
-    data: {
-      labels: programLabels,
-      datasets: [
-        {
-          data: programData,
-          backgroundColor: pieColors,
-        },
-      ],
-    },
-    options: {
-      responsive: true,
-      maintainAspectRatio: false,
-      plugins: {
-        legend: {
-          position: "bottom",
-          labels: {
-            font: {
-              size: 14,
+  function drawProgramChart(chart) {
+    programLabels = chart.labels;
+    programData = chart.data;
+    pieColors = programLabels.map((_, i) => programColors[i % programColors.length]);
+    // Set chart width larger and keep instance for updates
+    const programChartCanvas = document.getElementById("programChart");
+    programChartCanvas.width = 600;
+    programChartCanvas.height = 400;
+    window.programChartInstance = new Chart(programChartCanvas.getContext("2d"), {
+      type: "pie",
+      data: {
+        labels: programLabels,
+        datasets: [
+          {
+            data: programData,
+            backgroundColor: pieColors,
+          },
+        ],
+      },
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+          legend: {
+            position: "bottom",
+            labels: {
+              font: {
+                size: 14,
+              },
             },
           },
         },
       },
-    },
-  });
+    });
+    // Populate dropdown list on first paint (so it has content)
+    populateTopCourses(5);
+  }
 
   // Helper to compute top N entries from labels+data
   function getTopN(labels, data, n) {
@@ -339,9 +376,6 @@ document.addEventListener("DOMContentLoaded", function () {
       });
     }
 
-    // Populate dropdown list on first paint (so it has content)
-    populateTopCourses(5);
-
     // Dropdown toggle behavior (if dropdown exists)
     const topCoursesToggle = document.getElementById('topCoursesToggle');
     const topCoursesDropdown = document.getElementById('topCoursesDropdown');
@@ -369,31 +403,27 @@ document.addEventListener("DOMContentLoaded", function () {
   // Admission Success Rate
   // ==========================
   // Admission Success Rate Chart (actual data)
-  let admissionLabels = JSON.parse(
-    document.getElementById("admission-labels").textContent
-  );
-  let admissionData = JSON.parse(
-    document.getElementById("admission-data").textContent
-  );
   let admissionColors = ["#059669", "#e65959"];
-  new Chart(document.getElementById("admissionChart").getContext("2d"), {
-    type: "bar",
-    data: {
-      labels: admissionLabels,
-      datasets: [
-        {
-          label: "Applicants",
-          data: admissionData,
-          backgroundColor: admissionColors,
-        },
-      ],
-    },
-    options: {
-      responsive: true,
-      maintainAspectRatio: false,
-      scales: { y: { beginAtZero: true } },
-    },
-  });
+  function drawAdmissionChart(chart) {
+    new Chart(document.getElementById("admissionChart").getContext("2d"), {
+      type: "bar",
+      data: {
+        labels: chart.labels,
+        datasets: [
+          {
+            label: "Applicants",
+            data: chart.data,
+            backgroundColor: admissionColors,
+          },
+        ],
+      },
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: { y: { beginAtZero: true } },
+      },
+    });
+  }
 });
 
 // Chart toggle buttons
@@ -1,7 +1,18 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from .models import Student
 from .utils import write_feature_json
+from . import feature_log, ml_utils
+from .benchmarks import random_raw_profiles, random_student_kwargs, synthetic_model
+import copy
 import json
+import random
+import shutil
+import tempfile
 
 class FeatureExportTests(TestCase):
     def test_feature_json_creation(self):
@@ -32,14 +43,1230 @@ class FeatureExportTests(TestCase):
             disability=0,
             indigenous=0,
         )
-        path = write_feature_json(student)
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        path = write_feature_json(student, directory)
         self.assertTrue(path.exists())
-        data = json.loads(path.read_text())
-        # Expect a single dummy_Student{pk} key
-        key = f'dummy_Student{student.pk}'
-        self.assertIn(key, data)
-        record = data[key]
+        record = feature_log.FeatureLogReader(directory).get(student.pk)
+        self.assertIsNotNone(record)
         # Spot check required fields
         for field in ['ID','Program (First Choice)','Entry Level','Birth City','Disability','Indigenous','Requirement Agreement']:
             self.assertIn(field, record)
         self.assertEqual(record['ID'], student.pk)
+
+
+class FeatureLogTests(TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_snapshot_matches_the_old_whole_file_format(self):
+        records = {feature_log.record_key(pk): {'ID': pk, 'Birth City': 'Biñan', 'Nested': [1, {'a': None}]} for pk in (3, 1, 2)}
+        records[feature_log.record_key(1)] = {'ID': 1, 'Birth City': 'Lipa City'}
+        for key in (feature_log.record_key(pk) for pk in (3, 1, 2)):
+            feature_log.append_record(key, {'ID': 0}, self.directory)
+        for key, record in records.items():
+            feature_log.append_record(key, record, self.directory)
+        self.assertEqual(feature_log.compact(self.directory), 3)
+
+        snapshot = (self.directory / feature_log.SNAPSHOT_BASENAME).read_text(encoding='utf-8')
+        self.assertEqual(snapshot, json.dumps(records, ensure_ascii=False, indent=2))
+        self.assertEqual((self.directory / feature_log.LOG_BASENAME).stat().st_size, 0)
+        reader = feature_log.FeatureLogReader(self.directory)
+        for pk in (1, 2, 3):
+            self.assertEqual(reader.get(pk), records[feature_log.record_key(pk)])
+        self.assertIsNone(reader.get(4))
+
+    def test_reader_sees_appends_after_the_snapshot(self):
+        for pk in range(1, 6):
+            feature_log.append_record(feature_log.record_key(pk), {'ID': pk, 'v': 0}, self.directory)
+        feature_log.compact(self.directory)
+        reader = feature_log.FeatureLogReader(self.directory)
+        self.assertEqual(reader.get(2), {'ID': 2, 'v': 0})
+
+        feature_log.append_record(feature_log.record_key(2), {'ID': 2, 'v': 1}, self.directory)
+        feature_log.append_record(feature_log.record_key(6), {'ID': 6, 'v': 0}, self.directory)
+        # A torn last line (writer killed mid-append) is ignored by readers and compaction
+        with (self.directory / feature_log.LOG_BASENAME).open('ab') as log:
+            log.write(b'{"key": "dummy_Student3", "rec')
+        self.assertEqual(reader.get(2), {'ID': 2, 'v': 1})
+        self.assertEqual(reader.get(6), {'ID': 6, 'v': 0})
+        self.assertEqual(reader.get(3), {'ID': 3, 'v': 0})
+
+        (self.directory / feature_log.LOG_BASENAME).write_bytes(b'')
+        feature_log.compact(self.directory)
+        self.assertEqual(reader.get(2), {'ID': 2, 'v': 0})
+
+    def test_concurrent_appends_are_not_lost(self):
+        with mock.patch.object(feature_log, 'COMPACT_MIN_BYTES', 2048):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(
+                    lambda pk: feature_log.append_record(feature_log.record_key(pk), {'ID': pk}, self.directory),
+                    range(400),
+                ))
+        self.assertEqual(feature_log.compact(self.directory), 400)
+        reader = feature_log.FeatureLogReader(self.directory)
+        self.assertEqual([reader.get(pk) for pk in range(400)], [{'ID': pk} for pk in range(400)])
+
+
+class BatchPreprocessingTests(TestCase):
+    VALUES = {
+        'School Year': [2025, '2024', ' 2023 ', '2024-2025', None, '', 'abc', 2025.0],
+        'School Term': [1, 2, '1st', None, ''],
+        'Program (First Choice)': ['BSN', 'bscs', ' BSIT - MLA', 'na', ' na ', None, 'PROGRAM', 5],
+        'Program (Second Choice)': ['BSPSY', 'nan', '', None, '-MLA', 'bsarch', 'Unknown', 0],
+        'Place of Birth (Province)': ['Batangas', ' City of  Lipa ', 'cavite city', None, 3],
+        'Permanent Region': ['Region IV-A', 'ncr', None, 7],
+        'Age at Enrollment': [18, '19', None, ''],
+        'Birth Date': ['2007-06-12', '12/06/2007', None, '', 'garbage', '2006'],
+        'Requirement Agreement': ['1', '0', 0, 1, True, False, None, 'NA', 'na', 0.0],
+        'Disability': ['1', '0', 0, None, 'N/A'],
+        'Indigenous': [0, 1, None, 'yes'],
+        'Entry Level': ['freshman', 'TRANSFEREE', '2nd_degree', 'CROSS_ENROLLEE', None, 9],
+        'Permanent Province': ['Batangas', 'laguna ', 'Metro Manila', None, 'city of quezon'],
+        'Permanent City': ['Lipa City', 'City of San Pablo', 'biñan', 'Batangas City', None],
+        'Civil Status': ['Single', ' married ', 'Widowed', None, 'na'],
+        'Religion': ['Roman Catholic', ' roman catholic ', 'INC', None],
+        'Gender': ['Female', 'male', ' female', None],
+        'Student Type': ['Full-time Student', 'Working Student', 'n/a', 'NA', None],
+        'School Type': ['PUBLIC', 'private', None, 'N/A'],
+    }
+
+    def test_matches_scalar_preprocessing_on_random_rows(self):
+        from .preprocessing import preprocess_student_data, preprocess_student_data_batch
+
+        rng = random.Random(17)
+        # Keys are dropped at random: absent keys take the scalar path's defaults
+        rows = [{k: rng.choice(v) for k, v in self.VALUES.items() if rng.random() < 0.85} for _ in range(800)]
+        rows += random_raw_profiles(200, seed=17)
+        features, errors = preprocess_student_data_batch(rows)
+        self.assertEqual(len(features), len(rows))
+        records = features.to_dict('records')
+        for i, raw in enumerate(rows):
+            try:
+                expected = preprocess_student_data(raw)
+            except ValueError:
+                self.assertTrue(errors[i])
+                continue
+            self.assertFalse(errors[i])
+            self.assertEqual(list(records[i]), list(expected))
+            for key, value in expected.items():
+                self.assertEqual((type(records[i][key]), records[i][key]), (type(value), value), (raw, key))
+        self.assertTrue(errors.any())
+
+
+class NormalizerCacheTests(TestCase):
+    def test_memoized_normalizers_and_stats(self):
+        from . import preprocessing
+
+        preprocessing._canonical_city.cache_clear()
+        self.assertEqual(preprocessing.normalize_city_names('  City of  San   Pablo '), 'san pablo')
+        self.assertEqual(preprocessing.normalize_city_names('Batangas City'), 'batangas')
+        self.assertEqual(preprocessing.normalize_city_names('  City of  San   Pablo '), 'san pablo')
+        self.assertEqual(preprocessing.normalize_city_names(None), 'N/A')
+        self.assertEqual(preprocessing.normalize_program_name(' bsba-finmgt - MLA'),
+                         'BACHELOR OF SCIENCE IN BUSINESS ADMINISTRATION MAJOR IN FINANCIAL MANAGEMENT')
+        stats = preprocessing.normalizer_cache_stats()['city']
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+        # The batch path goes through the same cache
+        preprocessing.preprocess_student_data_batch([{'Permanent City': 'Batangas City'}] * 3)
+        self.assertEqual(preprocessing.normalizer_cache_stats()['city']['hits'], 2)
+
+
+class StartupImportTests(TestCase):
+    # Cold import of settings + app registry + URLconf; the scientific stack alone costs
+    # several hundred ms, so this catches it creeping back into module-level imports
+    IMPORT_BUDGET_MS = 150
+
+    def test_cold_import_stays_lazy_and_within_budget(self):
+        from .benchmarks import import_time_profile
+
+        profile = import_time_profile()
+        for module in ('pandas', 'sklearn', 'joblib', 'admissions.ml_utils', 'admissions.preprocessing'):
+            self.assertNotIn(module, profile)
+        self.assertLess(profile['admission_portal.urls'][1] / 1000.0, self.IMPORT_BUDGET_MS)
+
+
+class BatchScoringTests(TestCase):
+    def setUp(self):
+        rng = random.Random(42)
+        self.students = [Student.objects.create(**random_student_kwargs(rng)) for _ in range(60)]
+
+    def test_batch_matches_single_row_path(self):
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=0):
+            batch = ml_utils.predict_students_rf_batch(Student.objects.all(), chunk_size=16)
+            single = {s.pk: ml_utils.predict_student_rf(s)['Probability'] for s in self.students}
+        self.assertEqual(set(batch), set(single))
+        for pk, proba in single.items():
+            self.assertAlmostEqual(batch[pk], proba, places=12)
+
+    def test_batch_reports_failures_instead_of_fallback(self):
+        with mock.patch.object(ml_utils, '_load_model', return_value=None), self.assertRaises(ml_utils.ScoringError):
+            ml_utils.predict_students_rf_batch(self.students[:5])
+
+        broken = copy.copy(synthetic_model())  # the synthetic model is shared between tests
+        broken.predict_proba = mock.Mock(side_effect=ValueError('feature mismatch'))
+        with mock.patch.object(ml_utils, '_load_model', return_value=broken), self.assertRaises(ml_utils.ScoringError):
+            ml_utils.predict_profiles_rf_batch([ml_utils._student_to_preprocessing_dict(s) for s in self.students[:5]])
+
+        real = ml_utils.preprocess_student_data_batch
+
+        def reject_first(raw_dicts):
+            features, errors = real(raw_dicts)
+            return features, [True] + list(errors[1:])
+
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch.object(ml_utils, 'preprocess_student_data_batch', side_effect=reject_first):
+            probabilities = ml_utils.predict_profiles_rf_batch(
+                [ml_utils._student_to_preprocessing_dict(s) for s in self.students[:5]])
+        self.assertIsNone(probabilities[0])
+        self.assertTrue(all(isinstance(p, float) for p in probabilities[1:]))
+
+    def test_single_row_failure_leaves_student_unscored(self):
+        student = self.students[0]
+        with mock.patch.object(ml_utils, '_load_model', return_value=None):
+            with self.assertRaises(ml_utils.ScoringError):
+                ml_utils.predict_student_rf(student)
+            self.assertIsNone(ml_utils.compute_and_save_enrollment_chance(student))
+        student.refresh_from_db()
+        self.assertEqual((student.enrollment_chance, student.model_version), (None, None))
+
+        unsaved = Student(**random_student_kwargs(random.Random(43)))
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch.object(ml_utils, 'preprocess_student_data', side_effect=ValueError('bad birth date')):
+            self.assertIsNone(ml_utils.score_student(unsaved))
+        self.assertEqual((unsaved.enrollment_chance, unsaved.model_version), (None, None))
+
+
+class FeatureStoreTests(TestCase):
+    def test_features_stored_and_refreshed_only_on_change(self):
+        from .models import StudentFeatures
+        from .preprocessing import preprocess_student_data
+
+        rng = random.Random(4)
+        students = [Student.objects.create(**random_student_kwargs(rng)) for _ in range(5)]
+        out = StringIO()
+        call_command('backfill_student_features', stdout=out)
+        self.assertIn('5 refreshed', out.getvalue())
+        row = StudentFeatures.objects.get(student=students[0])
+        self.assertEqual(row.features, preprocess_student_data(ml_utils._student_to_preprocessing_dict(students[0])))
+
+        students[0].gender = 'Female' if students[0].gender != 'Female' else 'Male'
+        students[0].save()
+        with self.assertNumQueries(2):  # one read, one upsert of the changed row
+            features, counts = ml_utils.student_features(students)
+        self.assertEqual(counts, {'fresh': 4, 'refreshed': 1, 'failed': 0})
+        self.assertEqual(features[0]['gender_binary'], int(students[0].gender == 'Female'))
+        with self.assertNumQueries(1):
+            self.assertEqual(ml_utils.student_features(students)[1]['refreshed'], 0)
+
+    def test_scoring_reads_stored_features(self):
+        student = Student.objects.create(**random_student_kwargs(random.Random(6)))
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=0):
+            expected = ml_utils.predict_student_rf(ml_utils._student_to_preprocessing_dict(student))['Probability']
+            self.assertEqual(ml_utils.predict_student_rf(student)['Probability'], expected)
+            with mock.patch.object(ml_utils, 'preprocess_student_data') as scalar, \
+                    mock.patch('admissions.feature_store.preprocess_student_data_batch') as batch:
+                self.assertEqual(ml_utils.predict_student_rf(student)['Probability'], expected)
+                self.assertEqual(ml_utils.predict_students_rf_batch([student])[student.pk], expected)
+        scalar.assert_not_called()
+        batch.assert_not_called()
+
+
+class RescoreCommandTests(TestCase):
+    def test_rescore_writes_percentages_and_respects_filters(self):
+        rng = random.Random(7)
+        students = [Student.objects.create(**random_student_kwargs(rng)) for _ in range(12)]
+        Student.objects.filter(pk=students[0].pk).update(school_year='1999')
+        out = StringIO()
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()):
+            expected = ml_utils.predict_students_rf_batch(Student.objects.filter(pk__gt=students[1].pk))
+            call_command('rescore_enrollment_chance', workers=1, chunk_size=5, since_id=students[1].pk, stdout=out)
+            call_command('rescore_enrollment_chance', workers=1, school_year='1999', dry_run=True, stdout=out)
+        chances = dict(Student.objects.values_list('pk', 'enrollment_chance'))
+        self.assertIsNone(chances[students[0].pk])
+        self.assertIsNone(chances[students[1].pk])
+        for pk, proba in expected.items():
+            self.assertAlmostEqual(chances[pk], proba * 100.0)
+        self.assertIn('rows/s', out.getvalue())
+
+    def test_model_failure_aborts_without_writing(self):
+        from django.core.management.base import CommandError
+
+        rng = random.Random(8)
+        for _ in range(6):
+            Student.objects.create(**random_student_kwargs(rng))
+        broken = copy.copy(synthetic_model())  # the synthetic model is shared between tests
+        broken.predict_proba = mock.Mock(side_effect=ValueError('feature mismatch'))
+        with mock.patch.object(ml_utils, '_load_model', return_value=broken), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=0), self.assertRaises(CommandError):
+            call_command('rescore_enrollment_chance', workers=1, stdout=StringIO())
+        self.assertEqual(set(Student.objects.values_list('enrollment_chance', 'model_version')), {(None, None)})
+
+    def test_chunks_stamped_with_the_version_that_scored_them(self):
+        rng = random.Random(9)
+        students = [Student.objects.create(**random_student_kwargs(rng)) for _ in range(6)]
+        first, second = copy.copy(synthetic_model()), copy.copy(synthetic_model())
+        # The scorer hot-reloads v2 after the first chunk
+        with mock.patch.dict(ml_utils._model_versions, {first: 'v1', second: 'v2'}), \
+                mock.patch.object(ml_utils, '_load_model', return_value=first), \
+                mock.patch.object(ml_utils, 'require_model', side_effect=[first, second]):
+            call_command('rescore_enrollment_chance', workers=1, chunk_size=3, stdout=StringIO())
+        versions = dict(Student.objects.values_list('pk', 'model_version'))
+        self.assertEqual([versions[s.pk] for s in students], ['v1'] * 3 + ['v2'] * 3)
+
+
+class ModelLoadingTests(TestCase):
+    def test_concurrent_cold_load_reads_artifact_once(self):
+        import joblib
+        import tempfile
+        import threading
+        from pathlib import Path
+        from django.test import override_settings
+
+        with tempfile.TemporaryDirectory() as tmp:
+            resources = Path(tmp) / 'admissions' / 'resources'
+            resources.mkdir(parents=True)
+            joblib.dump(synthetic_model(), resources / 'rf_ucModel.pkl')
+            real_load = joblib.load
+            calls = []
+
+            def counting_load(*args, **kwargs):
+                calls.append(kwargs.get('mmap_mode'))
+                return real_load(*args, **kwargs)
+
+            with override_settings(BASE_DIR=Path(tmp), ADMISSIONS_MODEL_MMAP=True), \
+                    mock.patch.object(ml_utils, '_model', None), \
+                    mock.patch.object(ml_utils, '_model_load_error', None), \
+                    mock.patch.object(ml_utils.joblib, 'load', side_effect=counting_load):
+                threads = [threading.Thread(target=ml_utils._load_model) for _ in range(8)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                self.assertIsNotNone(ml_utils._model)
+        self.assertEqual(calls, ['r'])
+
+
+class FlatForestTests(TestCase):
+    def test_matches_sklearn_predict_proba(self):
+        from .forest import compile_forest
+        from .preprocessing import preprocess_student_data
+
+        model = synthetic_model()
+        flat = compile_forest(model, ml_utils.NUMERIC_COLUMNS)
+        self.assertIsNotNone(flat)
+        rows = [preprocess_student_data(raw) for raw in random_raw_profiles(300, seed=5)]
+        # Unseen category and a column missing entirely must behave like the sklearn path
+        rows[0]['Program (First Choice)'] = 'BACHELOR OF UNSEEN STUDIES'
+        del rows[1]['religion_grouped']
+        rows[2]['School Year'] = 'N/A'
+        expected = model.predict_proba(ml_utils._align_to_model(ml_utils._build_feature_frame(rows), model))
+        actual = flat.predict_proba_records(rows)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertTrue(abs(actual - expected).max() < 1e-12)
+
+    def test_predict_student_rf_uses_flat_forest_and_agrees(self):
+        student = Student.objects.create(**random_student_kwargs(random.Random(3)))
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=0):
+            fast = ml_utils.predict_student_rf(student)['Probability']
+            with self.settings(ADMISSIONS_FLAT_FOREST=False):
+                slow = ml_utils.predict_student_rf(student)['Probability']
+        self.assertAlmostEqual(fast, slow, places=12)
+
+    def test_unsupported_model_returns_none(self):
+        from sklearn.linear_model import LogisticRegression
+        from .forest import compile_forest
+
+        model = LogisticRegression().fit([[0.0], [1.0]], [0, 1])
+        self.assertIsNone(compile_forest(model))
+
+
+class AlignmentPlanTests(TestCase):
+    def test_plan_frame_matches_reindexed_frame(self):
+        from .preprocessing import preprocess_student_data
+
+        model = synthetic_model()
+        plan = ml_utils._get_alignment_plan(model)
+        self.assertIs(ml_utils._get_alignment_plan(model), plan)
+        rows = [preprocess_student_data(raw) for raw in random_raw_profiles(200, seed=21)]
+        del rows[0]['religion_grouped']
+        rows[1]['School Year'] = 'N/A'
+        rows[2]['Age at Enrollment'] = 'not a number'
+        expected = ml_utils._align_to_model(ml_utils._build_feature_frame(rows), model)
+        actual = plan.frame(rows)
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        self.assertEqual(str(actual['Age at Enrollment'].dtype), 'float64')
+        self.assertEqual(actual['Program (Second Choice)'].dtype, object)
+        self.assertEqual(
+            model.predict_proba(actual).tolist(), model.predict_proba(expected).tolist()
+        )
+        with mock.patch.object(ml_utils, '_load_model', return_value=model):
+            described = ml_utils.get_alignment_plan()
+        self.assertEqual([c['name'] for c in described['columns']], plan.columns)
+        self.assertIn('Age at Enrollment', described['numeric'])
+
+
+class PredictionCacheTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ml_utils, '_prediction_cache', ml_utils.PredictionCache(maxsize=0))
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_feature_rows_hit_cache(self):
+        profiles = random_raw_profiles(40, seed=11)
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=1000):
+            first = ml_utils.predict_profiles_rf_batch(profiles)
+            misses = self.cache.misses
+            second = ml_utils.predict_profiles_rf_batch(profiles)
+            single = ml_utils.predict_student_rf(profiles[0])['Probability']
+        self.assertEqual(first, second)
+        self.assertEqual(single, first[0])
+        self.assertEqual(self.cache.misses, misses)
+        self.assertEqual(self.cache.hits, 41)
+
+    def test_lru_eviction_and_clear_on_model_change(self):
+        profiles = random_raw_profiles(30, seed=12)
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=5):
+            ml_utils.predict_profiles_rf_batch(profiles)
+        stats = ml_utils.prediction_cache_stats()
+        self.assertEqual(stats['size'], 5)
+        self.assertGreater(stats['evictions'], 0)
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model(n_estimators=5)), \
+                self.settings(ADMISSIONS_PREDICTION_CACHE_SIZE=5):
+            ml_utils.predict_student_rf(profiles[0])
+        self.assertEqual(ml_utils.prediction_cache_stats()['size'], 1)
+
+
+REGISTRATION_FORM = {
+    'schoolYear': '2025-2026', 'schoolTerm': '1st', 'campus': 'NU-LIPA', 'firstChoice': 'BSN',
+    'secondChoice': 'BSPSY', 'entryLevel': 'FRESHMAN', 'firstName': 'Ana', 'lastName': 'Cruz',
+    'middleName': 'Reyes', 'birthDate': '2007-06-12', 'gender': 'Female', 'civilStatus': 'Single',
+    'religion': 'Roman Catholic', 'birthCity': 'Lipa City', 'birthProvince': 'Batangas',
+    'presentProvince': 'Batangas', 'presentCity': 'Lipa City', 'emailAddress': 'ana@example.com',
+    'studentType': 'Full-time Student', 'schoolType': 'PUBLIC', 'truthfulInfo': 'on',
+}
+
+
+class ScoringQueueTests(TestCase):
+    def test_registration_enqueues_and_worker_scores(self):
+        from .models import ScoringJob
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/register/', REGISTRATION_FORM)
+        self.assertEqual(response.status_code, 200)
+        student = Student.objects.get()
+        self.assertIsNone(student.enrollment_chance)
+        self.assertEqual(ScoringJob.objects.get().status, ScoringJob.STATUS_PENDING)
+
+        from . import jobs
+        self.assertEqual(jobs.queue_stats()['depth'], 1)
+        out = StringIO()
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch('admissions.utils.write_feature_json') as export:
+            call_command('process_scoring_jobs', once=True, stdout=out)
+            expected = ml_utils.predict_student_rf(student)['Probability'] * 100.0
+        student.refresh_from_db()
+        self.assertAlmostEqual(student.enrollment_chance, expected)
+        export.assert_called_once()
+        self.assertEqual(ScoringJob.objects.get().status, ScoringJob.STATUS_DONE)
+        self.assertEqual(jobs.queue_stats()['depth'], 0)
+        self.assertIn('Queue drained; scored 1 jobs.', out.getvalue())
+
+    def test_claim_skips_jobs_taken_after_the_select(self):
+        from django.db import connection
+        from django.utils import timezone
+        from . import jobs
+        from .models import ScoringJob
+
+        rng = random.Random(11)
+        queued = ScoringJob.objects.bulk_create(
+            [ScoringJob(student=Student.objects.create(**random_student_kwargs(rng))) for _ in range(3)])
+        other_worker = []
+
+        def claim_first_job_before_update(execute, sql, params, many, context):
+            # Another worker claims queued[0] between this worker's SELECT and UPDATE
+            if sql.startswith('UPDATE') and not other_worker:
+                other_worker.append(queued[0].pk)
+                ScoringJob.objects.filter(pk=queued[0].pk).update(
+                    status=ScoringJob.STATUS_RUNNING, claimed_at=timezone.now())
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(claim_first_job_before_update):
+            claimed = jobs.claim_jobs(10)
+        self.assertEqual(other_worker, [queued[0].pk])
+        self.assertEqual([job.pk for job in claimed], [job.pk for job in queued[1:]])
+        self.assertEqual(ScoringJob.objects.get(pk=queued[0].pk).attempts, 0)
+
+    def test_failed_scoring_is_retried_not_written(self):
+        from . import jobs
+        from .models import ScoringJob
+
+        rng = random.Random(10)
+        students = [Student.objects.create(**random_student_kwargs(rng)) for _ in range(3)]
+        ScoringJob.objects.bulk_create([ScoringJob(student=student) for student in students])
+        with mock.patch.object(ml_utils, '_load_model', return_value=None):
+            self.assertEqual(jobs.process_jobs(jobs.claim_jobs(10)), 0)
+        self.assertEqual(set(ScoringJob.objects.values_list('status', 'attempts')), {(ScoringJob.STATUS_PENDING, 1)})
+
+        real = ml_utils.preprocess_student_data_batch
+
+        def reject_first(raw_dicts):
+            features, errors = real(raw_dicts)
+            return features, [True] + list(errors[1:])
+
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch('admissions.feature_store.preprocess_student_data_batch', side_effect=reject_first), \
+                mock.patch('admissions.utils.write_feature_json'):
+            call_command('process_scoring_jobs', once=True, stdout=StringIO())
+        statuses = dict(ScoringJob.objects.values_list('student_id', 'status'))
+        chances = dict(Student.objects.values_list('pk', 'enrollment_chance'))
+        self.assertEqual(statuses[students[0].pk], ScoringJob.STATUS_FAILED)
+        self.assertIsNone(chances[students[0].pk])
+        self.assertEqual({statuses[s.pk] for s in students[1:]}, {ScoringJob.STATUS_DONE})
+        self.assertNotIn(None, [chances[s.pk] for s in students[1:]])
+
+    def test_queue_status_endpoint_is_staff_only(self):
+        from django.contrib.auth.models import User
+
+        self.assertEqual(self.client.get('/adminDash/scoring-queue/').status_code, 302)
+        User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.login(username='staff', password='pw')
+        data = self.client.get('/adminDash/scoring-queue/').json()
+        self.assertEqual(data['depth'], 0)
+        self.assertIn('oldest_pending_age_seconds', data)
+
+
+class RegistrationWriteTests(TestCase):
+    def test_queued_registration_is_one_insert(self):
+        from .models import ScoringJob
+
+        # SAVEPOINT, INSERT student, rollup SELECT + INSERT, RELEASE; then on commit the
+        # data version bump (5 queries on the database cache) and the INSERT of the job
+        with self.assertNumQueries(11), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/register/', REGISTRATION_FORM)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ScoringJob.objects.get().student, Student.objects.get())
+
+    @override_settings(ADMISSIONS_SCORING_QUEUE=False)
+    def test_inline_registration_inserts_the_scored_row(self):
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch('admissions.views.write_feature_json') as export:
+            with self.assertNumQueries(5):
+                self.client.post('/register/', REGISTRATION_FORM)
+        student = Student.objects.get()
+        self.assertIsNotNone(student.enrollment_chance)
+        self.assertGreater(student.enrollment_chance, 1)
+        export.assert_called_once()
+
+    def test_probability_is_scaled_before_the_insert(self):
+        with self.assertNumQueries(3):  # INSERT student, rollup SELECT + INSERT
+            student = Student.objects.create(program_first_choice='BSCS', enrollment_chance=0.42)
+        self.assertAlmostEqual(student.enrollment_chance, 42.0)
+        self.assertAlmostEqual(Student.objects.get().enrollment_chance, 42.0)
+
+
+class BulkIngestTests(TestCase):
+    URL = '/api/applicants/bulk/'
+
+    def setUp(self):
+        from django.contrib.auth.models import Permission, User
+
+        self.user = User.objects.create_user('crm', password='pw')
+        self.user.user_permissions.add(Permission.objects.get(codename='add_student'))
+        token = self.client.post('/api/token/', {'username': 'crm', 'password': 'pw'}).json()['access']
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def post(self, records, **headers):
+        return self.client.post(self.URL, records, content_type='application/json', **headers)
+
+    def test_requires_token_and_add_permission(self):
+        from django.contrib.auth.models import User
+
+        self.assertEqual(self.post([REGISTRATION_FORM]).status_code, 401)
+        User.objects.create_user('viewer', password='pw')
+        token = self.client.post('/api/token/', {'username': 'viewer', 'password': 'pw'}).json()['access']
+        self.assertEqual(self.post([REGISTRATION_FORM], HTTP_AUTHORIZATION=f'Bearer {token}').status_code, 403)
+        self.assertEqual(self.post({'firstName': 'Ana'}, **self.auth).status_code, 400)
+        self.assertFalse(Student.objects.exists())
+
+    def test_per_record_results_and_batched_scoring(self):
+        from . import rollups
+
+        Student.objects.create(first_name='Old', email='old@example.com')
+        records = [
+            dict(REGISTRATION_FORM, emailAddress=f'applicant{i}@example.com', firstName=f'Applicant{i}')
+            for i in range(5)
+        ]
+        records[1] = dict(records[1], emailAddress='not-an-email')
+        records[2] = dict(records[2], emailAddress='old@example.com')
+        records.append(dict(records[3], firstName='Again'))
+        records.append({'lastName': 'NoFirstName'})
+
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                mock.patch.object(ml_utils, 'predict_profiles_rf_batch', wraps=ml_utils.predict_profiles_rf_batch) as batch, \
+                mock.patch.object(feature_log, 'append_records') as export, \
+                override_settings(ADMISSIONS_INGEST_CHUNK_SIZE=2):
+            response = self.post(records, **self.auth)
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['created'], data['duplicates'], data['invalid']), (3, 2, 2))
+        statuses = [result['status'] for result in data['results']]
+        self.assertEqual(statuses, ['created', 'invalid', 'duplicate', 'created', 'created', 'duplicate', 'invalid'])
+        self.assertEqual([result['index'] for result in data['results']], list(range(7)))
+        self.assertIn('emailAddress', data['results'][1]['errors'])
+        self.assertIn('firstName', data['results'][6]['errors'])
+        self.assertEqual(data['results'][2]['id'], Student.objects.get(email='old@example.com').pk)
+        self.assertEqual(data['results'][5]['id'], data['results'][3]['id'])
+
+        # Chunks of two valid records: one model call and one feature-log write per chunk
+        self.assertEqual(batch.call_count, 2)
+        self.assertEqual(export.call_count, 2)
+        created = Student.objects.get(pk=data['results'][0]['id'])
+        self.assertEqual(created.school_year, '2026')
+        self.assertEqual(created.full_name, 'CRUZ, APPLICANT0 REYES')
+        self.assertAlmostEqual(created.enrollment_chance, data['results'][0]['enrollment_chance'])
+        self.assertGreater(created.enrollment_chance, 1)
+        self.assertEqual(rollups.inconsistencies(), [])
+
+
+class StageTimingTests(TestCase):
+    def setUp(self):
+        from . import timing
+        timing.reset()
+        self.addCleanup(timing.reset)
+
+    def test_failed_feature_write_is_still_timed(self):
+        from . import timing
+
+        student = Student.objects.create(**random_student_kwargs(random.Random(12)))
+        with self.settings(ADMISSIONS_STAGE_TIMING=True), self.assertLogs('admissions.timing', 'INFO'), \
+                mock.patch.object(feature_log, 'append_record', side_effect=OSError('disk full')), \
+                self.assertRaises(OSError):
+            write_feature_json(student)
+        stages = timing.snapshot()['operations']['write_feature_json']
+        self.assertEqual(set(stages), {'build_record', 'total'})
+
+    def test_disabled_records_nothing(self):
+        from . import timing
+
+        self.assertIs(timing.clock('predict_student_rf'), timing.NULL_CLOCK)
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()):
+            ml_utils.predict_student_rf(random_raw_profiles(1)[0])
+        self.assertEqual(timing.snapshot()['operations'], {})
+
+    def test_stages_recorded_and_served_to_staff(self):
+        from django.contrib.auth.models import User
+
+        student = Student.objects.create(**random_student_kwargs(random.Random(8)))
+        with mock.patch.object(ml_utils, '_load_model', return_value=synthetic_model()), \
+                self.settings(ADMISSIONS_STAGE_TIMING=True, ADMISSIONS_PREDICTION_CACHE_SIZE=0), \
+                self.assertLogs('admissions.timing', 'INFO') as logs:
+            for _ in range(3):
+                ml_utils.compute_and_save_enrollment_chance(student)
+            User.objects.create_user('staff', password='pw', is_staff=True)
+            self.client.login(username='staff', password='pw')
+            data = self.client.get('/adminDash/inference-timing/').json()
+        predict = data['operations']['predict_student_rf']
+        self.assertEqual(set(predict), {'load_model', 'raw_dict', 'preprocess', 'flat_forest', 'total'})
+        self.assertEqual(predict['total']['count'], 3)
+        self.assertLessEqual(predict['total']['p50_ms'], predict['total']['p99_ms'])
+        self.assertIn('save', data['operations']['compute_and_save_enrollment_chance'])
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['operation'], 'predict_student_rf')
+        self.assertIn('preprocess', line['stages_ms'])
+
+
+class AdminDashboardTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        rng = random.Random(12)
+        for i in range(120):
+            kwargs = random_student_kwargs(rng)
+            kwargs.update(
+                school_year=rng.choice(['2021', '2022', '2023', '2024', '2025', None]),
+                school_term=rng.choice(['1st', '2nd']),
+                student_id=rng.choice([None, '', f'2025-{i:05d}']),
+                enrollment_chance=rng.choice([None, 12.5, 45.0, 75.0, 95.0]),
+            )
+            Student.objects.create(**kwargs)
+
+    def test_summary_statistics_in_bounded_queries(self):
+        from django.db.models import Q
+
+        # One EnrollmentRollup read and one keyset page, independent of the year
+        # span and of the number of students. The rest is the database cache, cold:
+        # version read, add (5) and re-read; summary read and store (5)
+        with self.assertNumQueries(15):
+            response = self.client.get('/adminDash/')
+        context = response.context
+        enrolled = Student.objects.exclude(student_id__isnull=True).exclude(student_id__exact='')
+        latest = enrolled.order_by('-school_year', '-school_term').first()
+        self.assertEqual((context['current_year'], context['current_term']), (latest.school_year, latest.school_term))
+        self.assertEqual(context['male_enrolled_count'], enrolled.filter(gender__iexact='Male').count())
+        self.assertEqual(context['female_enrolled_count'], enrolled.filter(gender__iexact='Female').count())
+        self.assertEqual(context['admission_data'], [
+            enrolled.count(), Student.objects.filter(Q(student_id__isnull=True) | Q(student_id__exact='')).count(),
+        ])
+        self.assertEqual(context['academic_year_data'], [
+            enrolled.filter(school_term=latest.school_term, school_year=str(y)).count() for y in range(2021, 2026)
+        ])
+        self.assertEqual(context['enrollment_chance_counts'], [
+            Student.objects.filter(enrollment_chance__lt=40).count(),
+            Student.objects.filter(enrollment_chance__gte=40, enrollment_chance__lt=70).count(),
+            Student.objects.filter(enrollment_chance__gte=70, enrollment_chance__lt=90).count(),
+            Student.objects.filter(enrollment_chance__gte=90).count(),
+        ])
+        self.assertEqual(sum(context['program_data']), enrolled.exclude(program_first_choice=None).count())
+        self.assertEqual(context['top_program_count'], max(context['program_data']))
+
+    def test_summary_cached_until_student_write(self):
+        self.client.get('/adminDash/')
+        # Version and summary cache reads, then the student page, while the data version holds
+        with self.assertNumQueries(3):
+            response = self.client.get('/adminDash/')
+        before = response.context['admission_data']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(**random_student_kwargs(random.Random(3)))
+        response = self.client.get('/adminDash/')
+        self.assertEqual(response.context['admission_data'], [before[0], before[1] + 1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.filter(student_id__isnull=True).first().delete()
+        response = self.client.get('/adminDash/')
+        self.assertEqual(response.context['admission_data'], before)
+
+    def test_bulk_paths_and_warm_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from . import dashboard
+
+        call_command('warm_dashboard_cache', stdout=StringIO())
+        with self.assertNumQueries(3):
+            self.client.get('/adminDash/')
+
+        version = dashboard.data_version()
+        Student.objects.filter(enrollment_chance=12.5).update(enrollment_chance=0.5)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('scale_enrollment_chance', stdout=StringIO())
+        self.assertNotEqual(dashboard.data_version(), version)
+        response = self.client.get('/adminDash/')
+        self.assertEqual(response.context['enrollment_chance_counts'][0],
+                         Student.objects.filter(enrollment_chance__lt=40).count())
+
+
+class SharedDataVersionTests(TestCase):
+    def test_default_cache_is_shared_between_processes(self):
+        from django.core.cache import caches
+        from django.core.cache.backends.locmem import LocMemCache
+        from . import dashboard
+
+        # process_scoring_jobs and the import/rescore commands bump the version the web workers read
+        self.assertNotIsInstance(caches['default'], LocMemCache)
+        before = dashboard.data_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            dashboard.bump_data_version()
+            # Readers keep the old version (and summary) until the write commits
+            self.assertEqual(dashboard.data_version(), before)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(dashboard.data_version(), before)
+
+    def test_bump_is_stored_without_expiry(self):
+        from django.db import connection
+        from . import dashboard
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dashboard.bump_data_version()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT expires FROM admissions_cache WHERE cache_key LIKE %s", [f'%{dashboard.DATA_VERSION_KEY}'])
+            (expires,), = cursor.fetchall()
+        self.assertEqual(str(expires)[:4], '9999')
+
+    def test_cache_failure_does_not_fail_the_write(self):
+        from django.core.cache import cache
+        from django.db import DatabaseError
+
+        with mock.patch.object(cache, 'set', side_effect=DatabaseError('no such table: admissions_cache')), \
+                self.assertLogs('django', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            student = Student.objects.create(**random_student_kwargs(random.Random(5)))
+        self.assertTrue(Student.objects.filter(pk=student.pk).exists())
+
+
+class DashboardChartTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(self.staff)
+        rng = random.Random(17)
+        for i in range(30):
+            Student.objects.create(**random_student_kwargs(rng), student_id=rng.choice([None, f'2025-{i:05d}']))
+
+    def test_chart_endpoints_match_summary(self):
+        from . import dashboard
+        summary = dashboard.summary_context()
+        for name, (labels_key, data_key) in dashboard.CHARTS.items():
+            payload = self.client.get(f'/adminDash/charts/{name}/').json()
+            self.assertEqual(payload['data'], summary[data_key])
+            if labels_key:
+                self.assertEqual(payload['labels'], summary[labels_key])
+        self.assertEqual(self.client.get('/adminDash/charts/nope/').status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get('/adminDash/charts/programs/').status_code, 302)
+        self.client.force_login(self.staff)
+        # The page itself no longer inlines chart data
+        self.assertNotContains(self.client.get('/adminDash/'), 'id="program-data"')
+
+    def test_conditional_get_until_data_changes(self):
+        response = self.client.get('/adminDash/charts/programs/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        # Session and user for the staff check, version and summary cache reads; no student query
+        with self.assertNumQueries(4):
+            cached = self.client.get('/adminDash/charts/programs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(**random_student_kwargs(random.Random(1)), student_id='2025-77777')
+        fresh = self.client.get('/adminDash/charts/programs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+
+    def test_etag_follows_served_data_without_version_bump(self):
+        from django.core.cache import cache
+        from . import dashboard
+
+        etag = self.client.get('/adminDash/charts/programs/')['ETag']
+        # A write whose version bump this process never sees, then the summary times out
+        with mock.patch('admissions.signals.bump_data_version'):
+            Student.objects.create(**dict(random_student_kwargs(random.Random(3)), program_first_choice='BSN'),
+                                   student_id='2025-88888')
+        cache.delete(dashboard.SUMMARY_KEY.format(version=dashboard.data_version()))
+        response = self.client.get('/adminDash/charts/programs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_gzip(self):
+        import gzip
+        import json
+        rng = random.Random(2)
+        for i in range(20):
+            kwargs = random_student_kwargs(rng)
+            kwargs.update(program_first_choice=f'BACHELOR OF SCIENCE IN TEST PROGRAM {i}', student_id=f'2025-9{i:04d}')
+            Student.objects.create(**kwargs)
+        response = self.client.get('/adminDash/charts/programs/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['labels']), len(set(
+            Student.objects.filter(is_enrolled=True).values_list('program_first_choice', flat=True)
+        )))
+        # Compressed responses carry a weak validator, which If-None-Match still matches
+        revalidated = self.client.get('/adminDash/charts/programs/', HTTP_ACCEPT_ENCODING='gzip',
+                                      HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+
+class EnrollmentFlagTests(TestCase):
+    def test_is_enrolled_follows_student_id(self):
+        student = Student.objects.create(**random_student_kwargs(random.Random(8)), student_id=None)
+        self.assertFalse(Student.objects.get(pk=student.pk).is_enrolled)
+
+        student.student_id = '2025-00001'
+        student.save(update_fields=['student_id'])
+        self.assertTrue(Student.objects.get(pk=student.pk).is_enrolled)
+
+        student.student_id = ''
+        student.save()
+        self.assertFalse(Student.objects.get(pk=student.pk).is_enrolled)
+
+    def test_status_filter_uses_flag(self):
+        rng = random.Random(9)
+        for i in range(12):
+            Student.objects.create(**random_student_kwargs(rng), student_id=rng.choice([None, '', f'2025-{i:05d}']))
+        enrolled = set(Student.objects.exclude(student_id__isnull=True).exclude(student_id__exact='').values_list('pk', flat=True))
+        for status, expected in [('Enrolled', enrolled), ('Not Enrolled', set(Student.objects.values_list('pk', flat=True)) - enrolled)]:
+            context = self.client.get('/adminDash/', {'status': status}).context
+            self.assertEqual({s.pk for s in context['students']}, expected)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        rng = random.Random(5)
+        for i in range(70):
+            kwargs = random_student_kwargs(rng)
+            kwargs.update(student_id=rng.choice([None, f'2025-{i:05d}']), program_first_choice=rng.choice(['BSN', 'BSIT']))
+            Student.objects.create(**kwargs)
+
+    def _walk(self, params, direction='after'):
+        pages, query = [], params
+        while True:
+            with self.assertNumQueries(3):  # version and summary cache reads, then the page
+                context = self.client.get('/adminDash/', query).context
+            pages.append([s.pk for s in context['students']])
+            link = context['students'].next_cursor if direction == 'after' else context['students'].previous_cursor
+            if link is None:
+                return pages, context
+            query = {**params, direction: link}
+
+    def test_walks_filtered_list_without_counting(self):
+        from . import dashboard
+        dashboard.summary_context()  # summary cached; pages then cost one query each
+        params = {'program': 'BSN', 'status': 'Enrolled'}
+        expected = list(
+            Student.objects.filter(program_first_choice='BSN').exclude(student_id__isnull=True)
+            .order_by('-id').values_list('pk', flat=True)
+        )
+        pages, last = self._walk(params)
+        self.assertGreater(len(pages), 1)
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertTrue(all(len(page) == 10 for page in pages[:-1]))
+        self.assertIsNone(last['student_total'])
+        self.assertNotIn('after=', last['filter_query'])
+
+        # And back again from the last page
+        back, _ = self._walk({**params, 'after': pages[-2][-1]}, direction='before')
+        self.assertEqual(back, pages[::-1])
+
+    def test_offset_mode_still_available(self):
+        with self.settings(ADMISSIONS_KEYSET_PAGINATION=False):
+            context = self.client.get('/adminDash/', {'page': 2}).context
+        self.assertEqual(context['students'].number, 2)
+        self.assertEqual(context['students'].paginator.count, 70)
+
+
+class EnrollmentRollupTests(TestCase):
+    def setUp(self):
+        rng = random.Random(21)
+        for i in range(40):
+            kwargs = random_student_kwargs(rng)
+            kwargs.update(
+                school_year=rng.choice(['2024', '2025', None]),
+                school_term=rng.choice(['1st', '2nd']),
+                student_id=rng.choice([None, '', f'2025-{i:05d}']),
+                enrollment_chance=rng.choice([None, 0.3, 45.0, 95.0]),
+            )
+            Student.objects.create(**kwargs)
+
+    def assertConsistent(self):
+        from . import rollups
+        self.assertEqual(rollups.inconsistencies(), [])
+
+    def test_incremental_updates_match_recount(self):
+        from . import rollups
+        self.assertConsistent()
+
+        student = Student.objects.filter(student_id__isnull=True).first()
+        student.student_id = '2025-99999'
+        student.gender = 'Female'
+        student.save()
+        Student.objects.filter(enrollment_chance=45.0).first().delete()
+        only_some = Student.objects.only('pk', 'full_name').first()
+        only_some.full_name = 'RENAMED'
+        only_some.save(update_fields=['full_name'])
+        self.assertConsistent()
+
+        pks = list(Student.objects.values_list('pk', flat=True)[:10])
+        with rollups.track(pks):
+            Student.objects.filter(pk__in=pks).update(enrollment_chance=71.0, school_term='3rd')
+        self.assertConsistent()
+
+    def test_rebuild_command_repairs_drift(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from .models import EnrollmentRollup
+
+        Student.objects.filter(enrollment_chance=95.0).update(enrollment_chance=10.0)  # bypasses signals
+        EnrollmentRollup.objects.filter(enrolled=True).update(count=0)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', '--check', stdout=StringIO())
+
+        call_command('rebuild_rollups', stdout=StringIO())
+        call_command('rebuild_rollups', '--check', stdout=StringIO())
+        self.assertConsistent()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.juan = Student.objects.create(
+            first_name='Juan', middle_name='Santos', last_name='Dela Cruz', full_name='DELA CRUZ, JUAN SANTOS',
+            student_id='2025-00117', email='juan.delacruz@example.com', mobile_number='09171234567',
+        )
+        self.maria = Student.objects.create(
+            first_name='María', last_name='Santos', full_name='SANTOS, MARÍA', student_id='2025-00042',
+            email='maria.santos@example.com', mobile_number='09989876543',
+        )
+
+    def _search(self, text, **kwargs):
+        from . import search
+        return [s.pk for s in search.ranked(Student.objects.all(), text, **kwargs)]
+
+    def test_prefix_matching_across_fields(self):
+        self.assertEqual(self._search('dela cru'), [self.juan.pk])
+        self.assertEqual(self._search('Juan.DelaC'), [self.juan.pk])
+        self.assertEqual(self._search('0917 123'), [self.juan.pk])
+        self.assertEqual(self._search('2025-0004'), [self.maria.pk])
+        self.assertEqual(self._search('maria'), [self.maria.pk])  # diacritics folded
+        self.assertEqual(self._search('juan maria'), [])
+        self.assertEqual(sorted(self._search('2025')), sorted([self.juan.pk, self.maria.pk]))
+
+    def test_ranks_name_match_above_middle_name(self):
+        self.assertEqual(self._search('santos'), [self.maria.pk, self.juan.pk])
+
+    def test_student_id_filter_matches_any_part_of_the_id(self):
+        from .views import _filtered_students
+
+        other = Student.objects.create(first_name='Ana', student_id='202500118')
+        for text, expected in [('00117', [self.juan.pk]), ('0011', [other.pk, self.juan.pk]),
+                               ('117', [self.juan.pk]), ('2500118', [other.pk]), ('2025-', [self.maria.pk, self.juan.pk])]:
+            self.assertEqual([s.pk for s in _filtered_students({'student_id': text})], expected, text)
+
+    def test_index_follows_writes(self):
+        self.juan.last_name = 'Bautista'
+        self.juan.save()
+        self.assertEqual(self._search('bautista'), [self.juan.pk])
+        Student.objects.filter(pk=self.maria.pk).update(mobile_number='09223334444')
+        self.assertEqual(self._search('0922'), [self.maria.pk])
+        self.assertEqual(self._search('0998'), [])
+        self.juan.delete()
+        self.assertEqual(self._search('bautista'), [])
+        Student.objects.bulk_create([Student(first_name='Pedro', email='pedro@example.com')])
+        self.assertEqual(len(self._search('pedro')), 1)
+
+    def test_admin_dashboard_search(self):
+        context = self.client.get('/adminDash/', {'q': 'santos'}).context
+        self.assertEqual([s.pk for s in context['students']], [self.maria.pk, self.juan.pk])
+        self.assertEqual(context['search_query'], 'santos')
+        self.assertFalse(context['students'].has_other_pages())
+        context = self.client.get('/adminDash/', {'student_id': '2025-001'}).context
+        self.assertEqual([s.pk for s in context['students']], [self.juan.pk])
+        with self.settings(ADMISSIONS_KEYSET_PAGINATION=False):
+            context = self.client.get('/adminDash/', {'q': 'juan', 'program': 'BSN'}).context
+        self.assertEqual(list(context['students']), [])
+
+    def test_index_restored_after_table_rebuild(self):
+        from django.db import connection
+        from . import search
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER admissions_student_search_au')
+        self.assertTrue(search.ensure_search_index())
+        self.assertFalse(search.ensure_search_index())
+        self.maria.first_name = 'Marites'
+        self.maria.save()
+        self.assertEqual(self._search('marites'), [self.maria.pk])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        rng = random.Random(9)
+        for i in range(30):
+            kwargs = random_student_kwargs(rng)
+            kwargs.update(student_id=rng.choice([None, f'2025-{i:05d}']), program_first_choice=rng.choice(['BSN', 'BSIT']),
+                          first_name=f'Name{i}', birth_city='Biñan')
+            Student.objects.create(**kwargs)
+        User.objects.create_user('staff', password='pw', is_staff=True)
+
+    def _expected(self):
+        return list(
+            Student.objects.filter(program_first_choice='BSN').exclude(student_id__isnull=True)
+            .order_by('-id').values_list('pk', flat=True)
+        )
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get('/adminDash/export/csv/').status_code, 302)
+        self.client.login(username='staff', password='pw')
+        self.assertEqual(self.client.get('/adminDash/export/pdf/').status_code, 404)
+
+    def test_csv_streams_filtered_rows(self):
+        import csv
+        from . import exports
+
+        self.client.login(username='staff', password='pw')
+        response = self.client.get('/adminDash/export/csv/', {'program': 'BSN', 'status': 'Enrolled'})
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        text = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(text.startswith('\ufeff'))
+        rows = list(csv.reader(text[1:].splitlines()))
+        headers = [header for _, header in exports.export_columns()]
+        self.assertEqual(rows[0], headers)
+        self.assertIn('Student ID', headers)
+        self.assertEqual([int(row[headers.index('ID')]) for row in rows[1:]], self._expected())
+        self.assertEqual({row[headers.index('Birth City')] for row in rows[1:]}, {'Biñan'})
+
+        # Header first, then chunk_size rows per piece
+        chunks = list(exports.csv_chunks(Student.objects.order_by('pk'), chunk_size=8))
+        self.assertEqual(len(chunks), 1 + 4)
+        self.assertEqual(len(chunks[0].splitlines()), 1)
+        self.assertEqual(len(chunks[1].splitlines()), 8)
+
+    def test_xlsx_export(self):
+        import io
+        from openpyxl import load_workbook
+
+        self.client.login(username='staff', password='pw')
+        response = self.client.get('/adminDash/export/xlsx/', {'program': 'BSN', 'status': 'Enrolled', 'q': 'name1'})
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)['Students']
+        rows = list(sheet.iter_rows(values_only=True))
+        ids = [row[rows[0].index('ID')] for row in rows[1:]]
+        expected = Student.objects.filter(pk__in=self._expected(), first_name__startswith='Name1')
+        self.assertEqual(ids, list(expected.order_by('-id').values_list('pk', flat=True)))
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.known = Student.objects.create(first_name='Known', email='known@example.com', enrollment_chance=40.0)
+        self.enrolled = Student.objects.create(first_name='Enrolled', email='old@example.com', student_id='2025-00001')
+
+    def _dataset(self, rows):
+        import tablib
+        return tablib.Dataset(*rows, headers=['Student ID', 'Email', 'Gender', 'Birth Date', 'Enrollment Chance'])
+
+    def test_updates_known_students_and_skips_repeats(self):
+        from . import rollups
+        from .resources import StudentBulkResource
+
+        resource = StudentBulkResource()
+        result = resource.import_data(self._dataset([
+            ['2025-00002', 'known@example.com', 'Female', '03/14/2006', '0.5'],   # by email
+            ['2025-00001', 'new@example.com', 'Male', '03/15/2006', '70%'],       # by Student ID
+            [None, 'fresh@example.com', 'Male', '2006-03-16', ''],
+            [None, 'fresh@example.com', 'Female', '2006-03-16', ''],              # repeat in the file
+        ]))
+        self.assertFalse(result.has_errors() or result.has_validation_errors())
+        self.assertEqual((result.totals['new'], result.totals['update'], result.totals['skip']), (1, 2, 1))
+        self.assertGreater(resource.rows_per_second, 0)
+
+        self.known.refresh_from_db()
+        self.assertEqual((self.known.first_name, self.known.student_id, self.known.gender), ('Known', '2025-00002', 'Female'))
+        self.assertEqual((str(self.known.birth_date), self.known.enrollment_chance, self.known.is_enrolled),
+                         ('2006-03-14', 50.0, True))
+        self.enrolled.refresh_from_db()
+        self.assertEqual((self.enrolled.email, self.enrolled.enrollment_chance), ('new@example.com', 70.0))
+        fresh = Student.objects.get(email='fresh@example.com')
+        self.assertEqual((fresh.gender, str(fresh.birth_date), fresh.is_enrolled), ('Male', '2006-03-16', False))
+        self.assertEqual(Student.objects.count(), 3)
+        self.assertEqual(rollups.inconsistencies(), [])
+        # The format that parsed is tried first for the rest of the file
+        self.assertEqual(resource._birth_date_formats[0], '%Y-%m-%d')
+
+    def test_queries_per_batch_not_per_row(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .resources import StudentBulkResource
+
+        rows = [[None, f'row{i}@example.com', 'Male', '2006-01-02', '10'] for i in range(100)]
+        rows += [['2025-00001', 'moved@example.com', 'Female', '', ''], [None, 'known@example.com', 'Male', '', '']]
+        with CaptureQueriesContext(connection) as captured:
+            result = StudentBulkResource().import_data(self._dataset(rows))
+        self.assertEqual((result.totals['new'], result.totals['update']), (100, 2))
+        # Key preload, INSERTs of at most 999 parameters, one UPDATE, rollups; the admin default needs ~5 per row
+        self.assertLess(len(captured), 30)
+
+    def test_command_reports_rows_per_second(self):
+        from django.core.management.base import CommandError
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'students.csv'
+            path.write_text('Student ID,Email,Gender\n2025-00009,known@example.com,Male\n,other@example.com,Female\n',
+                            encoding='utf-8-sig')
+            out = StringIO()
+            call_command('import_students', str(path), '--dry-run', stdout=out)
+            self.assertIn('1 new, 1 updated', out.getvalue())
+            self.assertIn('rows/s', out.getvalue())
+            self.assertFalse(Student.objects.filter(email='other@example.com').exists())
+
+            call_command('import_students', str(path), stdout=StringIO())
+            self.assertEqual(Student.objects.get(pk=self.known.pk).student_id, '2025-00009')
+            with self.assertRaises(CommandError):
+                call_command('import_students', str(Path(tmp) / 'students.txt'), stdout=StringIO())
+
+
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        for name, value in [('_model', None), ('_model_load_error', None), ('_model_version', None),
+                            ('_model_stamp', None), ('_next_check_at', 0.0), ('_next_retry_at', 0.0),
+                            ('_retry_delay', 0.0)]:
+            patcher = mock.patch.object(ml_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        settings_override = self.settings(ADMISSIONS_MODEL_DIR=self.dir, ADMISSIONS_MODEL_RELOAD_INTERVAL=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _dump(self, name, model):
+        import joblib
+        joblib.dump(model, self.dir / name)
+        return self.dir / name
+
+    def test_hot_swap_and_version_stamp(self):
+        first = self._dump('a.pkl', synthetic_model())
+        second = self._dump('b.pkl', synthetic_model(n_estimators=5))
+        call_command('register_model', str(first), model_version='v1', stdout=StringIO())
+        student = Student.objects.create(**random_student_kwargs(random.Random(9)))
+        ml_utils.compute_and_save_enrollment_chance(student)
+        self.assertEqual(Student.objects.get().model_version, 'v1')
+
+        call_command('register_model', str(second), model_version='v2', stdout=StringIO())
+        self.assertEqual(ml_utils.current_model_version(), 'v2')
+        self.assertEqual(len(ml_utils._load_model().named_steps['rf'].estimators_), 5)
+
+        call_command('register_model', activate='v1', stdout=StringIO())
+        self.assertEqual(ml_utils.current_model_version(), 'v1')
+
+    def test_version_stamped_is_the_scoring_models(self):
+        call_command('register_model', str(self._dump('a.pkl', synthetic_model())), model_version='v1', stdout=StringIO())
+        scoring = ml_utils._load_model()
+        call_command('register_model', str(self._dump('b.pkl', synthetic_model(n_estimators=5))),
+                     model_version='v2', stdout=StringIO())
+        students = [Student(**random_student_kwargs(random.Random(seed))) for seed in (10, 11)]
+        # v2 is swapped in after v1 was handed to the scorer
+        with mock.patch.object(ml_utils, 'require_model', return_value=scoring):
+            ml_utils.score_student(students[0])
+            ml_utils.score_students(students[1:])
+        self.assertEqual(ml_utils.current_model_version(), 'v2')
+        self.assertEqual([s.model_version for s in students], ['v1', 'v1'])
+
+    def test_failed_load_is_retried_with_backoff(self):
+        self.assertIsNone(ml_utils._load_model())
+        first_delay = ml_utils._retry_delay
+        self.assertGreater(first_delay, 0)
+        # Inside the backoff window no new attempt is made even though the file now exists
+        self._dump('rf_ucModel.pkl', synthetic_model())
+        self.assertIsNone(ml_utils._load_model())
+        with mock.patch.object(ml_utils, '_next_retry_at', 0.0):
+            self.assertIsNotNone(ml_utils._load_model())
+        self.assertIsNone(ml_utils._model_load_error)
+
+    def test_checksum_mismatch_keeps_serving_previous_model(self):
+        path = self._dump('a.pkl', synthetic_model())
+        call_command('register_model', str(path), model_version='v1', stdout=StringIO())
+        model = ml_utils._load_model()
+        tampered = self.dir / 'models' / 'rf_ucModel-v1.pkl'
+        tampered.write_bytes(tampered.read_bytes() + b'x')
+        self.assertIs(ml_utils._load_model(), model)
+        self.assertIsInstance(ml_utils._model_load_error, ValueError)
@@ -0,0 +1,121 @@
+"""
+Per-stage latency instrumentation for the scoring path.
+
+Enabled with ADMISSIONS_STAGE_TIMING. An operation takes a clock and marks each
+stage as it finishes:
+
+    clock = timing.clock('predict_student_rf')
+    raw = build_raw_dict(...)
+    clock.lap('raw_dict')
+    ...
+    clock.finish()
+
+Durations are kept per (operation, stage) in rolling windows of the last
+ADMISSIONS_STAGE_TIMING_WINDOW samples; snapshot() reports count and p50/p95/p99
+(served to staff at /adminDash/inference-timing/). finish() also logs one JSON
+line per operation on the 'admissions.timing' logger. When timing is off, clock()
+returns a shared no-op clock, so the hot path pays one settings lookup per call.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 1024
+
+_lock = threading.Lock()
+_windows = {}  # (operation, stage) -> deque of milliseconds
+_counts = {}  # (operation, stage) -> samples observed since start/reset
+
+
+def timing_enabled() -> bool:
+    return getattr(settings, 'ADMISSIONS_STAGE_TIMING', False)
+
+
+def record(operation: str, stage: str, ms: float) -> None:
+    key = (operation, stage)
+    with _lock:
+        window = _windows.get(key)
+        if window is None:
+            window = _windows[key] = deque(maxlen=getattr(settings, 'ADMISSIONS_STAGE_TIMING_WINDOW', DEFAULT_WINDOW))
+        window.append(ms)
+        _counts[key] = _counts.get(key, 0) + 1
+
+
+class Clock:
+    """Measures consecutive stages of one operation."""
+
+    __slots__ = ('operation', 'started', 'last', 'stages')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started = self.last = time.perf_counter()
+        self.stages = {}
+
+    def lap(self, stage: str) -> None:
+        """Close `stage`: the time since the previous lap (or the start) is charged to it."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self.last) * 1000.0
+        self.last = now
+
+    def finish(self) -> None:
+        total = (time.perf_counter() - self.started) * 1000.0
+        for stage, ms in self.stages.items():
+            record(self.operation, stage, ms)
+        record(self.operation, 'total', total)
+        logger.info(json.dumps({
+            'event': 'stage_timing',
+            'operation': self.operation,
+            'total_ms': round(total, 3),
+            'stages_ms': {stage: round(ms, 3) for stage, ms in self.stages.items()},
+        }))
+
+
+class _NullClock:
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+NULL_CLOCK = _NullClock()
+
+
+def clock(operation: str):
+    return Clock(operation) if timing_enabled() else NULL_CLOCK
+
+
+def _percentile(ordered, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def snapshot() -> dict:
+    """{operation: {stage: {count, window, p50_ms, p95_ms, p99_ms, max_ms}}}"""
+    with _lock:
+        items = [(key, sorted(window), _counts[key]) for key, window in _windows.items()]
+    result = {}
+    for (operation, stage), ordered, count in items:
+        result.setdefault(operation, {})[stage] = {
+            'count': count,
+            'window': len(ordered),
+            'p50_ms': round(_percentile(ordered, 0.50), 3),
+            'p95_ms': round(_percentile(ordered, 0.95), 3),
+            'p99_ms': round(_percentile(ordered, 0.99), 3),
+            'max_ms': round(ordered[-1], 3),
+        }
+    return {'enabled': timing_enabled(), 'operations': result}
+
+
+def reset() -> None:
+    with _lock:
+        _windows.clear()
+        _counts.clear()
@@ -1,9 +1,10 @@
-import json
 from pathlib import Path
 from datetime import datetime, date
 from .models import Student
+from . import feature_log, timing
 
-FEATURE_FILE_BASENAME = 'latest_registration_features.json'
+# Compacted latest-per-student snapshot of the feature log
+FEATURE_FILE_BASENAME = feature_log.SNAPSHOT_BASENAME
 
 
 def calculate_age_at_enrollment(birth_date):
@@ -120,24 +121,15 @@ def build_flat_record(student: Student):
 
 
 def write_feature_json(student: Student, directory: str | Path | None = None) -> Path:
-    """Save or update a flattened student record inside a JSON file."""
-    if directory is None:
-        directory = Path(__file__).resolve().parent / 'data'
-    directory = Path(directory)
-    directory.mkdir(parents=True, exist_ok=True)
-    path = directory / FEATURE_FILE_BASENAME
-
-    data = {}
-    if path.exists():
-        try:
-            data = json.loads(path.read_text(encoding='utf-8'))
-        except Exception:
-            data = {}
-
-    record_key = f"dummy_Student{student.pk}"
-    data[record_key] = build_flat_record(student)
+    """Append the flattened student record to the feature log (see feature_log); returns the log path."""
+    clock = timing.clock('write_feature_json')
+    try:
+        record = build_flat_record(student)
+        clock.lap('build_record')
 
-    with path.open('w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        path = feature_log.append_record(feature_log.record_key(student.pk), record, directory)
+        clock.lap('write')
+    finally:
+        clock.finish()
 
     return path